@@ -0,0 +1,186 @@
+"""
+Load test: concurrency per process, threaded WSGI vs the async ASGI entry point.
+
+Both servers run as single processes against the same seeded on-disk
+database, with the task cache disabled so every request reaches SQLite. An
+asyncio client runs N concurrent connections, each issuing a mix of
+GET /tasks/<id> and paginated GET /tasks requests, at stepped concurrency
+levels. The highest level whose p99 latency stays within the budget is
+reported for each server. werkzeug closes every connection, so WSGI
+latencies include a reconnect; uvicorn keeps connections alive.
+
+    python -m simple_task_manager.benchmarks.bench_asgi --levels 8,32,128,256 --p99-budget-ms 250
+
+Requires uvicorn, aiosqlite and greenlet.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from .common import percentile, seed_tasks
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve_wsgi(port):
+    """Serves the Flask app with werkzeug's threaded server (one thread per connection)."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from simple_task_manager.src.app import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    make_server('127.0.0.1', port, create_app(), threaded=True, request_handler=QuietHandler).serve_forever()
+
+
+def start_server(kind, port, env):
+    if kind == 'asgi':
+        command = [sys.executable, '-m', 'uvicorn', '--factory', 'simple_task_manager.src.asgi:create_asgi_app',
+                   '--port', str(port), '--log-level', 'warning', '--no-access-log']
+    else:
+        command = [sys.executable, '-m', __spec__.name, '--serve-wsgi', str(port)]
+    process = subprocess.Popen(command, env=env)
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+async def _request(reader, writer, path):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode())
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    keep_alive = True
+    for line in head.split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        name = name.strip().lower()
+        if name == b'content-length':
+            length = int(value)
+        elif name == b'connection' and value.strip().lower() == b'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def drive(port, concurrency, duration, size, seed):
+    """Runs ``concurrency`` concurrent clients for ``duration`` seconds."""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(n):
+        nonlocal errors
+        rng = random.Random(seed + n)
+        connection = None
+        try:
+            while time.perf_counter() < deadline:
+                if rng.random() < 0.8:
+                    path = f'/api/v1/tasks/{rng.randint(1, size)}'
+                else:
+                    path = '/api/v1/tasks?status=pending&limit=100'
+                started = time.perf_counter()
+                if connection is None:
+                    connection = await asyncio.open_connection('127.0.0.1', port)
+                status, keep_alive = await _request(*connection, path)
+                latencies.append(time.perf_counter() - started)
+                if status != 200:
+                    errors += 1
+                if not keep_alive:
+                    connection[1].close()
+                    connection = None
+        finally:
+            if connection is not None:
+                connection[1].close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=100000, help='tasks seeded before the run')
+    parser.add_argument('--levels', default='8,32,128,256', help='comma-separated client concurrency levels')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per level')
+    parser.add_argument('--p99-budget-ms', type=float, default=250.0)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help='write the results as JSON')
+    parser.add_argument('--serve-wsgi', type=int, metavar='PORT', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve_wsgi:
+        serve_wsgi(args.serve_wsgi)
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix='bench_asgi_')
+    env = dict(os.environ, FLASK_ENV='prod', DATABASE_URL='sqlite:///' + os.path.join(workdir, 'bench.db'),
+               AUDIT_LOG_PATH=os.path.join(workdir, 'audit.jsonl'), TASK_CACHE_BACKEND='none',
+               METRICS_SLOW_REQUEST_MS='0', LOG_LEVEL='WARNING')
+    os.environ.update(env)
+
+    from simple_task_manager.src.app import create_app
+    from simple_task_manager.src.models import db, Task
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        seed_tasks(db, Task, args.size)
+        db.engine.dispose()
+
+    levels = [int(level) for level in args.levels.split(',')]
+    results = {}
+    for kind in ('wsgi', 'asgi'):
+        port = free_port()
+        process = start_server(kind, port, env)
+        try:
+            results[kind] = [asyncio.run(drive(port, level, args.duration, args.size, args.seed))
+                             for level in levels]
+        finally:
+            process.terminate()
+            process.wait()
+
+    print(f"{args.size} tasks, {args.duration}s per level, p99 budget {args.p99_budget_ms} ms")
+    print(f"{'server':>6} {'conc':>6} {'p50 ms':>9} {'p99 ms':>9} {'rps':>9} {'errors':>7}")
+    for kind, rows in results.items():
+        for row in rows:
+            print(f"{kind:>6} {row['concurrency']:>6} {row['p50_ms']:>9} {row['p99_ms']:>9} "
+                  f"{row['throughput_rps']:>9} {row['errors']:>7}")
+    for kind, rows in results.items():
+        within = [row['concurrency'] for row in rows if row['p99_ms'] <= args.p99_budget_ms and not row['errors']]
+        print(f"{kind}: highest concurrency within budget: {max(within) if within else 'none'}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Compares the old and new serialization paths of the task list view.
+
+    old: Task.query.all() -> Task.to_dict(detailed=False) -> stdlib json (sorted keys)
+    new: (id, title, status) tuples -> list_item -> serializers.json_dumps
+
+Run from the directory containing the project checkout:
+
+    python -m simple_task_manager.benchmarks.bench_serialization --sizes 1000,100000,1000000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,100000,1000000', help='comma-separated row counts')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='bench_serialization_')
+    os.environ['TEST_DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+
+    from simple_task_manager.benchmarks.common import seed_tasks
+    from simple_task_manager.src.app import create_app
+    from simple_task_manager.src.models import db, Task
+    from simple_task_manager.src.serializers import JSON_BACKEND, LIST_COLUMNS, json_dumps, list_item
+
+    def old_path():
+        tasks = Task.query.all()
+        return json.dumps([task.to_dict(detailed=False) for task in tasks], sort_keys=True).encode('utf-8')
+
+    def new_path():
+        rows = db.session.query(*LIST_COLUMNS).order_by(Task.id).all()
+        return json_dumps([list_item(row) for row in rows])
+
+    app = create_app('test')
+    print(f"JSON backend: {JSON_BACKEND}")
+    print(f"{'rows':>10} {'old (s)':>10} {'new (s)':>10} {'speedup':>8}")
+    with app.app_context():
+        db.create_all()
+        seeded = 0
+        for size in (int(value) for value in args.sizes.split(',')):
+            seed_tasks(db, Task, size - seeded, start=seeded)
+            seeded = size
+            assert json.loads(old_path()) == json.loads(new_path())
+            old = best_of(lambda: (old_path(), db.session.expunge_all()), args.repeat)
+            new = best_of(new_path, args.repeat)
+            print(f"{size:>10} {old:>10.3f} {new:>10.3f} {old / new:>7.1f}x")
+        db.drop_all()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
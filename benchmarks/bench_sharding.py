@@ -0,0 +1,93 @@
+"""
+Load test: concurrent-write throughput as the number of task shards grows.
+
+Writer processes (standing in for gunicorn workers) insert tasks through
+``TaskShards.create`` for a fixed time; each shard count gets fresh database
+files with the tuned SQLite pragmas. With one shard every writer queues on
+the same write lock; with N shards a writer only waits for the writers that
+landed on its shard. Scaling needs at least as many free cores as writers,
+so on a small machine the numbers flatten early.
+
+    python -m simple_task_manager.benchmarks.bench_sharding --shards 1,2,4,8 --writers 8 --duration 5
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+
+def open_shards(uris, pragmas):
+    """Opens the shards with ``pragmas`` applied to every new SQLite connection."""
+    from sqlalchemy import event
+    from simple_task_manager.src.engine import apply_sqlite_pragmas
+    from simple_task_manager.src.sharding import TaskShards
+
+    shards = TaskShards(uris)
+    for engine in shards.engines:
+        event.listen(engine, 'connect',
+                     lambda dbapi_connection, record: apply_sqlite_pragmas(dbapi_connection, pragmas))
+    return shards
+
+
+def writer(uris, pragmas, start_at, duration):
+    """Inserts tasks until the deadline; returns ``(writes, errors)``."""
+    from sqlalchemy.exc import OperationalError
+
+    shards = open_shards(uris, pragmas)
+    done = errors = 0
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = start_at + duration
+    while time.time() < deadline:
+        try:
+            shards.create({'title': f'Task {done}', 'description': 'Written by the sharding benchmark'})
+            done += 1
+        except OperationalError:  # "database is locked" after busy_timeout
+            errors += 1
+    shards.dispose()
+    return done, errors
+
+
+def run(shard_count, writers, duration, workdir):
+    """Runs one shard count and returns ``(writes_per_sec, errors)``."""
+    from simple_task_manager.src.config import Config
+
+    directory = tempfile.mkdtemp(prefix=f'{shard_count}_shards_', dir=workdir)
+    uris = ['sqlite:///' + os.path.join(directory, f'shard{i}.db') for i in range(shard_count)]
+    shards = open_shards(uris, Config.SQLITE_PRAGMAS)
+    shards.create_all()
+    shards.dispose()
+
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(writers) as pool:
+        start_at = time.time() + 2.0  # let every process finish importing
+        results = pool.starmap(writer, [(uris, Config.SQLITE_PRAGMAS, start_at, duration)] * writers)
+    return sum(done for done, _ in results) / duration, sum(errors for _, errors in results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--shards', default='1,2,4,8', help='comma-separated shard counts')
+    parser.add_argument('--writers', type=int, default=8, help='writer processes')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per shard count')
+    args = parser.parse_args(argv)
+
+    counts = [int(count) for count in args.shards.split(',')]
+    workdir = tempfile.mkdtemp(prefix='bench_sharding_')
+    cores = os.cpu_count() or 1
+    print(f"{args.writers} writer processes, {args.duration:.0f}s per shard count, {cores} cores")
+    if cores < args.writers:
+        print(f"note: fewer cores than writers; throughput is CPU-bound past {cores} busy writers")
+
+    print(f"{'shards':>6} {'writes/s':>10} {'speed-up':>9} {'errors':>7}")
+    baseline = None
+    for count in counts:
+        writes_per_sec, errors = run(count, args.writers, args.duration, workdir)
+        baseline = baseline or writes_per_sec
+        print(f"{count:>6} {writes_per_sec:>10.1f} {writes_per_sec / baseline:>8.2f}x {errors:>7}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
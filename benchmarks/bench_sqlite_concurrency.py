@@ -0,0 +1,115 @@
+"""
+Load test: write throughput with concurrent readers, SQLite defaults vs the tuned profile.
+
+Writer and reader threads play the role of gunicorn worker threads and drive
+the API through the Flask test client against an on-disk database. Each
+profile runs in its own process and database file, because journal_mode=WAL
+persists in the file.
+
+    python -m simple_task_manager.benchmarks.bench_sqlite_concurrency --writers 4 --readers 8 --duration 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROFILES = ('default', 'tuned')
+
+
+def run_profile(profile, writers, readers, duration):
+    """Runs the workload in this process and returns its counters."""
+    from simple_task_manager.src.app import create_app
+    from simple_task_manager.src.models import db
+
+    app = create_app('dev')
+    if profile == 'default':
+        app.config['SQLITE_PRAGMAS'] = None
+    with app.app_context():
+        db.create_all()
+    # Seed a few rows so readers have something to page through.
+    app.test_client().open('/api/v1/tasks:batch', method='POST',
+                           json=[{'title': f'Seed {i}'} for i in range(1000)])
+
+    counts = {'writes': 0, 'write_errors': 0, 'reads': 0, 'read_errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def writer(n):
+        client = app.test_client()
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            res = client.post('/api/v1/tasks', json={'title': f'Writer {n} task {done}'})
+            if res.status_code < 300:
+                done += 1
+            else:
+                errors += 1
+        with lock:
+            counts['writes'] += done
+            counts['write_errors'] += errors
+
+    def reader(n):
+        client = app.test_client()
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            res = client.get('/api/v1/tasks?limit=200&status=pending')
+            if res.status_code == 200:
+                done += 1
+            else:
+                errors += 1
+        with lock:
+            counts['reads'] += done
+            counts['read_errors'] += errors
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    counts['writes_per_sec'] = counts['writes'] / duration
+    counts['reads_per_sec'] = counts['reads'] / duration
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        result = run_profile(args.profile, args.writers, args.readers, args.duration)
+        with open(args.output, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    workdir = tempfile.mkdtemp(prefix='bench_sqlite_')
+    results = {}
+    for profile in PROFILES:
+        output = os.path.join(workdir, f'{profile}.json')
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(workdir, f'{profile}.db'),
+                   AUDIT_LOG_PATH=os.path.join(workdir, f'{profile}-audit.jsonl'), LOG_LEVEL='WARNING')
+        subprocess.run([sys.executable, '-m', __spec__.name, '--profile', profile, '--output', output,
+                        '--writers', str(args.writers), '--readers', str(args.readers),
+                        '--duration', str(args.duration)], env=env, check=True)
+        with open(output) as f:
+            results[profile] = json.load(f)
+
+    print(f"{args.writers} writer / {args.readers} reader threads, {args.duration:.0f}s per profile")
+    print(f"{'profile':>8} {'writes/s':>10} {'reads/s':>10} {'write errors':>13} {'read errors':>12}")
+    for profile, result in results.items():
+        print(f"{profile:>8} {result['writes_per_sec']:>10.1f} {result['reads_per_sec']:>10.1f} "
+              f"{result['write_errors']:>13} {result['read_errors']:>12}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Measures worker start-up: importing the app and creating it, with ``-X importtime``.
+
+Each measurement runs in a fresh interpreter so nothing is already imported.
+The reported time is the wall time of the entry point's statement (every
+import it triggers plus ``create_app``); ``-X importtime`` attributes it to
+modules and shows what was imported.
+
+    serving: import simple_task_manager.src.wsgi (serving mode, what workers load)
+    full:    create_app() as the flask CLI does, with the migration tooling
+
+Run from the directory containing the project checkout:
+
+    python -m simple_task_manager.benchmarks.bench_startup --repeat 5 --budget-ms 1000
+
+Exits non-zero if the serving start-up is over the budget or imports a
+module that serving mode is supposed to defer.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Start-up budget for a serving worker, in milliseconds. tests/test_startup.py
+# enforces it; STARTUP_BUDGET_MS overrides it on slow machines.
+DEFAULT_BUDGET_MS = 1000
+
+# Modules only the CLI (or a disabled subsystem) needs; a serving worker must
+# not import them or anything under them.
+DEFERRED_MODULES = (
+    'alembic', 'flask_migrate',
+    'simple_task_manager.src.cli', 'simple_task_manager.src.transfer', 'simple_task_manager.src.reminders',
+)
+
+
+def is_deferred(module):
+    """Tells whether ``module`` is, or belongs to, one of :data:`DEFERRED_MODULES`."""
+    return any(module == name or module.startswith(name + '.') for name in DEFERRED_MODULES)
+
+
+ENTRY_POINTS = {
+    'serving': 'import simple_task_manager.src.wsgi',
+    'full': 'from simple_task_manager.src.app import create_app; create_app()',
+}
+
+# Prints the statement's wall time in microseconds on stdout.
+TIMER = "import time; _start = time.perf_counter(); {code}; print(int((time.perf_counter() - _start) * 1e6))"
+
+
+def _package_parent():
+    import simple_task_manager
+    return os.path.dirname(os.path.abspath(list(simple_task_manager.__path__)[0]))
+
+
+def parse_importtime(stderr):
+    """
+    Parses ``-X importtime`` output.
+
+    Args:
+        stderr (str): The interpreter's stderr.
+
+    Returns:
+        list: ``(module, self_us, cumulative_us, depth)`` in the order reported.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        head, cumulative_us, name = line.split('|', 2)
+        self_us = int(head.rsplit(':', 1)[1])
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        entries.append((name.strip(), self_us, int(cumulative_us), depth))
+    return entries
+
+
+def measure(code, env=None):
+    """
+    Runs ``code`` in a fresh interpreter under ``-X importtime``.
+
+    Args:
+        code (str): The statement to run.
+        env (dict, optional): Extra environment variables.
+
+    Returns:
+        dict: ``total_ms`` (wall time of ``code``) and ``modules`` (every
+        imported module mapped to its self import time in ms).
+
+    Raises:
+        RuntimeError: If the interpreter fails.
+    """
+    run_env = dict(os.environ, **(env or {}))
+    run_env['PYTHONPATH'] = os.pathsep.join(filter(None, [_package_parent(), run_env.get('PYTHONPATH')]))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', TIMER.format(code=code)],
+                          env=run_env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'start-up failed')
+    return {
+        'total_ms': int(proc.stdout.split()[-1]) / 1000,
+        'modules': {name: self_us / 1000 for name, self_us, _, _ in parse_importtime(proc.stderr)},
+    }
+
+
+def best_of(code, repeat, env=None):
+    """Returns the fastest of ``repeat`` measurements of ``code``."""
+    return min((measure(code, env) for _ in range(repeat)), key=lambda result: result['total_ms'])
+
+
+def serving_env(workdir):
+    """Environment for a production-like worker that touches nothing outside ``workdir``."""
+    return {
+        'FLASK_ENV': 'prod',
+        'DATABASE_URL': 'sqlite:///' + os.path.join(workdir, 'startup.db'),
+        'AUDIT_LOG_PATH': os.path.join(workdir, 'audit.jsonl'),
+        'LOG_LEVEL': 'WARNING',
+    }
+
+
+def main(argv=None):
+    import tempfile
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float,
+                        default=float(os.environ.get('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS)))
+    parser.add_argument('--top', type=int, default=10, help='slowest modules to list')
+    args = parser.parse_args(argv)
+
+    env = serving_env(tempfile.mkdtemp(prefix='bench_startup_'))
+    results = {name: best_of(code, args.repeat, env) for name, code in ENTRY_POINTS.items()}
+
+    print(f"{'entry point':<10} {'start-up (ms)':>14} {'modules':>8}")
+    for name, result in results.items():
+        print(f"{name:<10} {result['total_ms']:>14.1f} {len(result['modules']):>8}")
+
+    serving = results['serving']
+    print("\nslowest modules (self time) in serving mode:")
+    for module, self_ms in sorted(serving['modules'].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_ms:>7.1f} ms  {module}")
+
+    failed = False
+    leaked = [module for module in serving['modules'] if is_deferred(module)]
+    if leaked:
+        print(f"\nserving mode imported deferred modules: {', '.join(sorted(leaked))}")
+        failed = True
+    if serving['total_ms'] > args.budget_ms:
+        print(f"\nserving start-up {serving['total_ms']:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
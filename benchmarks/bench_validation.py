@@ -0,0 +1,124 @@
+"""
+Compares the per-item cost of the old and new payload validation.
+
+    old: the batch helpers as they were before schemas.py, kept here since
+         nothing else uses them -- validate_data_payload (rebuilding its field
+         sets per call), is_task_title_valid and parse_due_date ('Z' rewritten
+         to '+00:00'), then the status check
+    new: the compiled validators in schemas.py, which also type-check every
+         field and collect all errors
+
+Run from the directory containing the project checkout:
+
+    python -m simple_task_manager.benchmarks.bench_validation --number 200000
+"""
+import argparse
+import sys
+import timeit
+from datetime import datetime, timezone
+
+PAYLOADS = {
+    'create': {'title': 'Write the quarterly report', 'description': 'Numbers from finance',
+               'due_date': '2030-01-02T09:30:00Z'},
+    'create (invalid)': {'title': 'Write the quarterly report', 'due_date': 'tomorrow'},
+    'update': {'id': 42, 'title': 'Renamed', 'status': 'in progress', 'due_date': '2030-01-02T09:30:00Z'},
+}
+
+
+def validate_data_payload(data, required_fields, optional_fields=None):
+    if not isinstance(data, dict):
+        return False, "Payload must be a JSON object."
+    errors = {}
+    for field in required_fields:
+        if field not in data or not data[field]:
+            errors[field] = f"{field} is required and cannot be empty."
+    allowed_fields = set(required_fields)
+    if optional_fields:
+        allowed_fields.update(optional_fields)
+    for key in data.keys():
+        if key not in allowed_fields:
+            errors[key] = f"Field '{key}' is not allowed."
+    if errors:
+        return False, errors
+    return True, None
+
+
+def is_task_title_valid(title):
+    return bool(title) and len(title) <= 120
+
+
+def parse_due_date(value):
+    if not isinstance(value, str):
+        raise ValueError("due_date must be a string.")
+    due_date = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if due_date.tzinfo is None:
+        due_date = due_date.replace(tzinfo=timezone.utc)
+    return due_date
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=200000, help='validations per measurement')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from simple_task_manager.src.models import Task
+    from simple_task_manager.src.schemas import validate_batch_update, validate_task_create
+
+    def old_create(item):
+        is_valid, errors = validate_data_payload(item, required_fields=['title'],
+                                                 optional_fields=['description', 'due_date'])
+        if not is_valid:
+            return None, errors
+        if not is_task_title_valid(item['title']):
+            return None, "Title is invalid"
+        values = {'title': item['title'], 'description': item.get('description'), 'due_date': None}
+        if item.get('due_date'):
+            try:
+                values['due_date'] = parse_due_date(item['due_date'])
+            except ValueError:
+                return None, "Invalid due_date format. Use ISO 8601."
+        return values, None
+
+    def old_update(item):
+        is_valid, errors = validate_data_payload(item, required_fields=['id'],
+                                                 optional_fields=['title', 'description', 'due_date', 'status'])
+        if not is_valid:
+            return None, errors
+        values = {'id': item['id']}
+        if 'title' in item:
+            if not is_task_title_valid(item['title']):
+                return None, "Title is invalid"
+            values['title'] = item['title']
+        if 'description' in item:
+            values['description'] = item['description']
+        if 'due_date' in item:
+            if item['due_date'] is None:
+                values['due_date'] = None
+            else:
+                try:
+                    values['due_date'] = parse_due_date(item['due_date'])
+                except ValueError:
+                    return None, "Invalid due_date format. Use ISO 8601."
+        if 'status' in item:
+            if item['status'] not in Task.ALLOWED_STATUSES:
+                return None, "Invalid status"
+            values['status'] = item['status']
+        return values, None
+
+    cases = (
+        ('create', old_create, validate_task_create),
+        ('create (invalid)', old_create, validate_task_create),
+        ('update', old_update, validate_batch_update),
+    )
+    print(f"{'payload':<18} {'old (us)':>9} {'new (us)':>9} {'speedup':>8}")
+    for name, old, new in cases:
+        payload = PAYLOADS[name]
+        old_cost = min(timeit.repeat(lambda: old(payload), number=args.number, repeat=args.repeat)) / args.number
+        new_cost = min(timeit.repeat(lambda: new(payload), number=args.number, repeat=args.repeat)) / args.number
+        print(f"{name:<18} {old_cost * 1e6:>9.2f} {new_cost * 1e6:>9.2f} {old_cost / new_cost:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
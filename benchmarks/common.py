@@ -0,0 +1,46 @@
+"""Helpers shared by the benchmark scripts."""
+import resource
+import sys
+from datetime import datetime, timedelta, timezone
+
+STATUSES = ('pending', 'in progress', 'completed')
+
+
+def seed_tasks(db, Task, count, start=0, batch_size=50000):
+    """
+    Bulk-inserts ``count`` synthetic tasks with mixed statuses and due dates.
+
+    Args:
+        db: The Flask-SQLAlchemy extension.
+        Task: The Task model.
+        count (int): Number of tasks to insert.
+        start (int, optional): Offset used to number the generated titles.
+        batch_size (int, optional): Rows per executemany call.
+    """
+    from sqlalchemy import insert
+
+    now = datetime.now(timezone.utc)
+    for offset in range(start, start + count, batch_size):
+        rows = [{'title': f'Task {i}',
+                 'description': f'Synthetic benchmark task number {i}',
+                 'status': STATUSES[i % 3],
+                 'due_date': now + timedelta(hours=i % 5000) if i % 4 else None,
+                 'created_at': now, 'updated_at': now}
+                for i in range(offset, min(offset + batch_size, start + count))]
+        db.session.execute(insert(Task), rows)
+        db.session.commit()
+
+
+def peak_rss_mb():
+    """Returns the peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(sorted_values, fraction):
+    """Returns the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
@@ -0,0 +1,275 @@
+"""
+Reproducible benchmark suite for the task API.
+
+For every database size the suite seeds an on-disk SQLite database, then
+drives create_task, get_tasks (unfiltered and filtered), get_task and
+update_task twice:
+
+    client: sequentially through the Flask test client (no network, no server)
+    server: through a real threaded WSGI server with concurrent HTTP clients
+
+It reports p50/p95/p99 latency, throughput and peak RSS to a JSON file and,
+given a baseline, fails when any scenario regresses beyond the tolerance.
+With ``--repeat N`` both drivers run N times on the seeded database and each
+scenario keeps its round with the lowest p95, which keeps one slow round on a
+busy machine from reading as a regression.
+
+    python -m simple_task_manager.benchmarks.run --sizes 10000,100000,1000000 \\
+        --output results.json --baseline simple_task_manager/benchmarks/baseline.json
+
+Each size runs in its own process so RSS and database files don't leak
+between sizes. `make bench` wraps the common invocation.
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from .common import peak_rss_mb, percentile, seed_tasks
+
+# name -> (method, path template, JSON body or None); {id} is a random existing task ID.
+SCENARIOS = {
+    'create_task': ('POST', '/api/v1/tasks', {'title': 'Benchmark task', 'description': 'created by the suite'}),
+    'get_tasks': ('GET', '/api/v1/tasks?limit=100', None),
+    'get_tasks_filtered': ('GET', '/api/v1/tasks?status=pending&limit=100', None),
+    'get_task': ('GET', '/api/v1/tasks/{id}', None),
+    'update_task': ('PUT', '/api/v1/tasks/{id}', {'status': 'in progress'}),
+}
+
+
+def summarize(latencies, elapsed):
+    """Turns raw per-request latencies (seconds) into the reported statistics."""
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def run_client(app, size, requests, rng):
+    """Runs every scenario sequentially through the Flask test client."""
+    client = app.test_client()
+    results = {}
+    for name, (method, path, body) in SCENARIOS.items():
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(requests):
+            url = path.format(id=rng.randint(1, size))
+            t0 = time.perf_counter()
+            res = client.open(url, method=method, json=body)
+            latencies.append(time.perf_counter() - t0)
+            if res.status_code >= 400:
+                raise RuntimeError(f"{name}: {method} {url} returned {res.status_code}")
+        results[name] = summarize(latencies, time.perf_counter() - started)
+    return results
+
+
+def run_server(app, size, requests, concurrency, seed):
+    """Runs every scenario through a threaded WSGI server with concurrent clients."""
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_port
+    results = {}
+    try:
+        for name, (method, path, body) in SCENARIOS.items():
+            per_client = max(1, requests // concurrency)
+            latencies = []
+            errors = []
+            lock = threading.Lock()
+            payload = json.dumps(body).encode() if body is not None else None
+            headers = {'Content-Type': 'application/json'} if payload else {}
+
+            def worker(n):
+                rng = random.Random(seed + n)
+                conn = http.client.HTTPConnection('127.0.0.1', port)
+                mine = []
+                for _ in range(per_client):
+                    url = path.format(id=rng.randint(1, size))
+                    t0 = time.perf_counter()
+                    conn.request(method, url, body=payload, headers=headers)
+                    res = conn.getresponse()
+                    res.read()
+                    mine.append(time.perf_counter() - t0)
+                    if res.status >= 400:
+                        errors.append(f"{method} {url} returned {res.status}")
+                        break
+                conn.close()
+                with lock:
+                    latencies.extend(mine)
+
+            workers = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+            started = time.perf_counter()
+            for worker_thread in workers:
+                worker_thread.start()
+            for worker_thread in workers:
+                worker_thread.join()
+            if errors:
+                raise RuntimeError(f"{name}: {errors[0]}")
+            results[name] = summarize(latencies, time.perf_counter() - started)
+            results[name]['concurrency'] = concurrency
+    finally:
+        server.shutdown()
+    return results
+
+
+def best_rounds(rounds):
+    """Keeps, for every scenario, the round with the lowest p95 latency."""
+    return {name: min((results[name] for results in rounds), key=lambda stats: stats['p95_ms'])
+            for name in rounds[0]}
+
+
+def run_size(size, requests, concurrency, seed, workdir, repeat=1):
+    """Seeds a database of ``size`` tasks and runs both drivers against it ``repeat`` times (in this process)."""
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, f'bench_{size}.db')
+    os.environ['AUDIT_LOG_PATH'] = os.path.join(workdir, f'audit_{size}.jsonl')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    os.environ.setdefault('METRICS_SLOW_REQUEST_MS', '0')
+
+    from simple_task_manager.src.app import create_app
+    from simple_task_manager.src.models import db, Task
+
+    app = create_app('prod')
+    started = time.perf_counter()
+    with app.app_context():
+        db.create_all()
+        seed_tasks(db, Task, size)
+    seed_seconds = time.perf_counter() - started
+
+    rng = random.Random(seed)
+    client_rounds, server_rounds = [], []
+    for _ in range(repeat):
+        client_rounds.append(run_client(app, size, requests, rng))
+        server_rounds.append(run_server(app, size, requests, concurrency, seed))
+    result = {
+        'seed_seconds': round(seed_seconds, 2),
+        'client': best_rounds(client_rounds),
+        'server': best_rounds(server_rounds),
+    }
+    result['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results with a baseline.
+
+    A scenario regresses when its p95 latency grows, or its throughput drops,
+    by more than ``tolerance`` (a fraction). A measured size or scenario the
+    baseline does not cover, or a baseline scenario missing from the results
+    of a measured size, also fails, so a stale baseline cannot pass silently.
+    Baseline sizes that were not run are ignored.
+
+    Returns:
+        list: Human-readable regression descriptions.
+    """
+    regressions = []
+    recorded = baseline.get('results', {})
+    for size, current in results.items():
+        by_driver = recorded.get(size)
+        if by_driver is None:
+            regressions.append(f"{size}: not in the baseline (re-record it with make bench-baseline)")
+            continue
+        for driver in ('client', 'server'):
+            expected_by_name = by_driver.get(driver, {})
+            actual_by_name = current.get(driver, {})
+            for name in actual_by_name.keys() - expected_by_name.keys():
+                regressions.append(f"{size}/{driver}/{name}: not in the baseline")
+            for name, expected in expected_by_name.items():
+                actual = actual_by_name.get(name)
+                if actual is None:
+                    regressions.append(f"{size}/{driver}/{name}: in the baseline but not measured")
+                    continue
+                if actual['p95_ms'] > expected['p95_ms'] * (1 + tolerance):
+                    regressions.append(f"{size}/{driver}/{name}: p95 {actual['p95_ms']}ms "
+                                       f"> baseline {expected['p95_ms']}ms")
+                if actual['throughput_rps'] < expected['throughput_rps'] * (1 - tolerance):
+                    regressions.append(f"{size}/{driver}/{name}: throughput {actual['throughput_rps']} rps "
+                                       f"< baseline {expected['throughput_rps']} rps")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10000', help='comma-separated task counts, e.g. 10000,100000,1000000')
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario and driver')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent HTTP clients in server mode')
+    parser.add_argument('--repeat', type=int, default=1, help='rounds per size; each scenario keeps its best round')
+    parser.add_argument('--seed', type=int, default=1234, help='random seed for task ID selection')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed regression as a fraction')
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.size:
+        result = run_size(args.size, args.requests, args.concurrency, args.seed, args.workdir, args.repeat)
+        with open(args.output, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    results = {}
+    # The seeded databases reach hundreds of MiB at 1M tasks; don't leave them behind.
+    with tempfile.TemporaryDirectory(prefix='task_bench_') as workdir:
+        for size in args.sizes.split(','):
+            output = os.path.join(workdir, f'result_{size}.json')
+            subprocess.run([sys.executable, '-m', __spec__.name, '--size', size, '--workdir', workdir,
+                            '--requests', str(args.requests), '--concurrency', str(args.concurrency),
+                            '--repeat', str(args.repeat),
+                            '--seed', str(args.seed), '--output', output], check=True)
+            with open(output) as f:
+                results[size] = json.load(f)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'repeat': args.repeat,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for size, result in results.items():
+        print(f"\n{size} tasks (seeded in {result['seed_seconds']}s, peak RSS {result['peak_rss_mb']} MiB)")
+        print(f"{'driver':>7} {'scenario':>20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>9}")
+        for driver in ('client', 'server'):
+            for name, stats in result[driver].items():
+                print(f"{driver:>7} {name:>20} {stats['p50_ms']:>9} {stats['p95_ms']:>9} "
+                      f"{stats['p99_ms']:>9} {stats['throughput_rps']:>9}")
+    print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
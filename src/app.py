@@ -1,24 +1,103 @@
+import os
 from flask import Flask
-from flask_migrate import Migrate
 from .models import db
+from .audit import init_audit
+from .cache import init_task_cache
+from .changes import init_change_feed
+from .engine import init_engine_tuning
+from .search import include_schema_name
+from .serializers import FastJSONProvider
+from .sharding import init_task_shards
 from .routes import api_bp
 from .config import get_config 
 import logging
 
-def create_app(config_name=None):
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
 
+_logging_configured = False
+
+
+def init_migrations(app):
+    """
+    Sets up Flask-Migrate, which backs the ``flask db`` commands.
+
+    Flask-Migrate pulls in Alembic, the largest import in the app, so it is
+    imported here rather than at module level and skipped by serving apps.
+
+    Args:
+        app (Flask): The application.
+    """
+    from flask_migrate import Migrate
+    Migrate(app, db, directory=MIGRATIONS_DIR, include_name=include_schema_name)
+
+
+def init_cli(app):
+    """
+    Registers the ``flask tasks`` commands.
+
+    The commands pull in the export/import code, which no request uses, so
+    serving apps skip them.
+
+    Args:
+        app (Flask): The application.
+    """
+    from .cli import tasks_cli
+    app.cli.add_command(tasks_cli)
+
+
+def init_optional_subsystems(app):
+    """
+    Loads metrics and reminders only when their settings enable them.
+
+    Args:
+        app (Flask): The application.
+    """
+    if app.config.get('METRICS_ENABLED', True):
+        from .metrics import init_metrics
+        init_metrics(app)
+    if app.config.get('REMINDERS_ENABLED'):
+        from .reminders import init_reminders
+        init_reminders(app)
+
+
+def configure_logging(level):
+    """Configures the root logger once per process; later apps reuse it."""
+    global _logging_configured
+    if _logging_configured:
+        return
+    logging.basicConfig(level=level,
+                        format='%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]')
+    _logging_configured = True
+
+
+def create_app(config_name=None, serving=False):
+    """
+    Builds the application.
+
+    Args:
+        config_name (str, optional): ``dev``, ``test`` or ``prod``; defaults to ``FLASK_ENV``.
+        serving (bool): Build an app that only serves requests, as the WSGI and
+            ASGI entry points do: the migration tooling and the ``flask tasks``
+            commands are not loaded. The CLI needs an app created without it.
+
+    Returns:
+        Flask: The configured application.
+    """
     app = Flask(__name__)
-    if config_name is None:
-        app_config = get_config()
-    else:
-        from .config import config_by_name
-        app_config = config_by_name.get(config_name, config_by_name['default'])
-    
-    app.config.from_object(app_config)
+    app.json = FastJSONProvider(app)
+    app.config.from_object(get_config(config_name))
 
     db.init_app(app)
-    Migrate(app, db)
+    init_engine_tuning(app)
+    init_task_shards(app)
+    if not serving:
+        init_migrations(app)
+        init_cli(app)
 
+    init_task_cache(app)
+    init_change_feed(app)
+    init_audit(app)
+    init_optional_subsystems(app)
     app.register_blueprint(api_bp)
 
 # SAARTHI-20250603142700: MEDIUM | COMPLIANCE
@@ -30,8 +109,7 @@ def create_app(config_name=None):
     # POLICY: OrgPolicy_compliance.md: Policy 1.5 - Do not log PII or sensitive data in plaintext.
     # FIX: Review all logging statements and ensure no sensitive data is logged.
     # EFFORT: [1h]
-    logging.basicConfig(level=app.config.get('LOG_LEVEL', 'INFO'),
-                        format='%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]')
+    configure_logging(app.config.get('LOG_LEVEL', 'INFO'))
 
     app.logger.info(f"Task Manager App created with env: {config_name or 'default'}")
 
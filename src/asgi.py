@@ -0,0 +1,493 @@
+"""
+ASGI serving mode.
+
+The task CRUD and list endpoints are served by async handlers on SQLAlchemy's
+async engine (``sqlite+aiosqlite`` locally), so a request waiting on the
+database doesn't hold a worker thread. Everything else under the same URL
+space (search, batch, stats, metrics, health) is passed to the Flask app in a
+worker thread, so both entry points serve the same contract.
+
+The Flask app built by :func:`create_app` is still the registry for config,
+the task cache and the audit pipeline; async handlers run inside its app
+context so the shared helpers in ``utils`` and ``cache`` work unchanged.
+Passed-through responses are relayed chunk by chunk, so the SSE change feed
+streams; its long-polls and streams run on their own bounded thread pool.
+
+Run it with any ASGI server, e.g.::
+
+    uvicorn --factory simple_task_manager.src.asgi:create_asgi_app
+
+Requires the optional ``aiosqlite`` (or another async driver) and ``greenlet``
+packages.
+"""
+import asyncio
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import parse_qsl, unquote
+
+from sqlalchemy import event, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from .app import create_app
+from .cache import get_task_cache, invalidate_tasks
+from .engine import apply_sqlite_pragmas
+from .models import Task
+from .pagination import InvalidCursor, parse_limit
+from .query_planner import build_task_select, cursor_for, decode_plan_cursor, plan_task_list
+from .changes import CHANGES_TABLE, HEAD_SEQUENCE_SQL, encode_token
+from .routes import CHANGE_TOKEN_HEADER, VALID_STATUSES, STREAM_FORMATS
+from .schemas import error_summary, validate_task_create, validate_task_update
+from .serializers import (
+    DETAIL_COLUMNS, LIST_COLUMNS, detail_columns, detail_item, json_dumps, json_loads, list_columns, list_item,
+)
+from .utils import log_sensitive_action
+from .versioning import format_etag, parse_if_match, versioned_update
+
+# Sync driver -> async driver used for the same database.
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+TASKS_PATH = '/api/v1/tasks'
+TASK_PATH = re.compile(r'^/api/v1/tasks/(\d+)$')
+
+# Passed through to Flask on the stream pool: long-polls and SSE hold a thread.
+CHANGES_PATH = '/api/v1/tasks/changes'
+
+# Chunks of a passed-through response buffered ahead of the client.
+PASSTHROUGH_BUFFER = 8
+
+# Marks the end of a passed-through response.
+_END = object()
+
+
+def to_async_url(database_uri):
+    """
+    Rewrites a sync database URI to use the matching async driver.
+
+    Args:
+        database_uri (str): The ``SQLALCHEMY_DATABASE_URI``.
+
+    Returns:
+        URL: The URL for ``create_async_engine``.
+    """
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+    if url.drivername in ASYNC_DRIVERS.values() or backend not in ASYNC_DRIVERS:
+        return url
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+class HTTPError(Exception):
+    """Ends a request early with a JSON error body."""
+
+    def __init__(self, status, body):
+        super().__init__(status)
+        self.status = status
+        self.body = body
+
+
+class AsyncTaskAPI:
+    """
+    ASGI application serving ``/api/v1/tasks`` with async handlers.
+
+    Args:
+        flask_app (Flask): The app whose config, cache and audit pipeline are shared.
+
+    Raises:
+        ValueError: If tasks are sharded; the async handlers use a single database.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        config = flask_app.config
+        if config.get('TASK_SHARDS'):
+            raise ValueError("The ASGI mode does not support sharded task storage (TASK_SHARDS)")
+        self.engine = create_async_engine(to_async_url(config['SQLALCHEMY_DATABASE_URI']),
+                                          **config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine.sync_engine, 'connect', self._apply_pragmas)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.passthrough_pool = ThreadPoolExecutor(max_workers=config.get('ASGI_PASSTHROUGH_WORKERS', 16),
+                                                   thread_name_prefix='asgi-flask')
+        self.stream_pool = ThreadPoolExecutor(max_workers=config.get('ASGI_STREAM_WORKERS', 16),
+                                              thread_name_prefix='asgi-stream')
+        self.routes = {
+            ('POST', None): self.create_task,
+            ('GET', None): self.get_tasks,
+            ('GET', TASK_PATH): self.get_task,
+            ('PUT', TASK_PATH): self.update_task,
+            ('DELETE', TASK_PATH): self.delete_task,
+        }
+
+    def _apply_pragmas(self, dbapi_connection, connection_record):
+        pragmas = self.flask_app.config.get('SQLITE_PRAGMAS')
+        if pragmas:
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        handler, args = self._route(scope['method'], scope['path'])
+        body = await _read_body(receive)
+        if handler is None:
+            await self._call_flask(scope, body, send)
+            return
+
+        query = {}
+        for name, value in parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True):
+            query.setdefault(name, value)
+        headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        with self.flask_app.app_context():
+            try:
+                result = await handler(*args, query=query, body=body, headers=headers)
+            except HTTPError as e:
+                result = (e.status, json_dumps(e.body))
+        if callable(result):
+            await result(send)
+            return
+        status, payload = result[0], result[1]
+        extra_headers = result[2] if len(result) > 2 else ()
+        await _send_response(send, status, payload, extra_headers)
+
+    def _route(self, method, path):
+        if path == TASKS_PATH:
+            return self.routes.get((method, None)), ()
+        match = TASK_PATH.match(path)
+        if match is not None:
+            return self.routes.get((method, TASK_PATH)), (int(match.group(1)),)
+        return None, ()
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                reminders = self.flask_app.extensions.get('reminders')
+                if reminders is not None:
+                    reminders.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                self.passthrough_pool.shutdown(wait=False, cancel_futures=True)
+                self.stream_pool.shutdown(wait=False, cancel_futures=True)
+                reminders = self.flask_app.extensions.get('reminders')
+                if reminders is not None:
+                    await asyncio.to_thread(reminders.stop)
+                audit = self.flask_app.extensions.get('audit')
+                if audit is not None:
+                    audit.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _call_flask(self, scope, body, send):
+        """
+        Runs a request through the Flask app and relays its response as it is produced.
+
+        The WSGI call and the iteration of its body stay on one pool thread,
+        as ``stream_with_context`` requires; chunks reach the event loop
+        through a small bounded queue and are sent with ``more_body``. If the
+        client goes away, the thread stops after its next chunk and closes
+        the response.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self.stream_pool if scope['path'] == CHANGES_PATH else self.passthrough_pool
+        environ = _wsgi_environ(scope, body)
+        chunks = asyncio.Queue(PASSTHROUGH_BUFFER)
+        disconnected = threading.Event()
+        started = {}
+
+        def put(item):
+            asyncio.run_coroutine_threadsafe(chunks.put(item), loop).result()
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = headers
+
+        def run():
+            try:
+                iterable = self.flask_app.wsgi_app(environ, start_response)
+                try:
+                    for chunk in iterable:
+                        if disconnected.is_set():
+                            break
+                        if chunk:
+                            put(chunk)
+                finally:
+                    if hasattr(iterable, 'close'):
+                        iterable.close()
+            finally:
+                put(_END)
+
+        done = loop.run_in_executor(pool, run)
+        item = await chunks.get()
+        try:
+            headers = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                       for name, value in started['headers']]
+            await send({'type': 'http.response.start', 'status': started['status'], 'headers': headers})
+            while item is not _END:
+                await send({'type': 'http.response.body', 'body': item, 'more_body': True})
+                item = await chunks.get()
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if item is not _END:
+                disconnected.set()
+                while await chunks.get() is not _END:
+                    pass
+            await done
+
+    async def create_task(self, query, body, headers):
+        data = _json_body(body)
+        if not data:
+            raise HTTPError(400, {"error": "No input data provided"})
+
+        values = _validated(validate_task_create, data)
+
+        log_sensitive_action("Attempting to create task", user_data=data)
+        task = Task(**values)
+        async with self.sessions() as session:
+            try:
+                session.add(task)
+                await session.commit()
+                # Read back the stored values, as the WSGI handler does after its commit.
+                await session.refresh(task)
+            except Exception:
+                await session.rollback()
+                self.flask_app.logger.exception("Error creating task")
+                raise HTTPError(500, {"error": "Could not create task"})
+        invalidate_tasks([task.id])
+        return 200, json_dumps(task.to_dict(detailed=True))
+
+    async def get_tasks(self, query, body, headers):
+        try:
+            plan = plan_task_list(query, VALID_STATUSES)
+        except ValueError as e:
+            raise HTTPError(400, {"error": str(e)})
+
+        stream_format = query.get('stream')
+        if stream_format:
+            if stream_format not in STREAM_FORMATS:
+                raise HTTPError(400, {"error": f"Invalid stream format. Allowed: {', '.join(STREAM_FORMATS)}"})
+            return self._stream_tasks(build_task_select(plan, columns=LIST_COLUMNS), stream_format)
+
+        if 'limit' not in query and 'after' not in query:
+            async with self.sessions() as session:
+                headers = await self._change_token_headers(session)
+                rows = (await session.execute(build_task_select(plan, columns=LIST_COLUMNS))).all()
+            return 200, json_dumps([list_item(row) for row in rows]), headers
+
+        config = self.flask_app.config
+        try:
+            limit = parse_limit(query.get('limit'), config['TASKS_PAGE_DEFAULT_LIMIT'],
+                                config['TASKS_PAGE_MAX_LIMIT'])
+        except ValueError as e:
+            raise HTTPError(400, {"error": f"Invalid limit: {e}"})
+        try:
+            statement = build_task_select(plan, after=decode_plan_cursor(query.get('after')),
+                                          columns=list_columns(plan.sort_key))
+        except InvalidCursor:
+            raise HTTPError(400, {"error": "Invalid cursor"})
+
+        async with self.sessions() as session:
+            headers = await self._change_token_headers(session)
+            rows = (await session.execute(statement.limit(limit + 1))).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = cursor_for(plan, rows[-1])
+        return 200, json_dumps({"tasks": [list_item(row) for row in rows], "next_cursor": next_cursor}), headers
+
+    async def _change_token_headers(self, session):
+        """The ``X-Change-Token`` header of a task list, read in the list's transaction."""
+        if self.engine.dialect.name != 'sqlite':
+            return ()
+        connection = await session.connection()
+        row = (await connection.exec_driver_sql(HEAD_SEQUENCE_SQL, (CHANGES_TABLE,))).first()
+        return ((CHANGE_TOKEN_HEADER.lower(), encode_token(row[0] if row is not None else 0)),)
+
+    def _stream_tasks(self, statement, stream_format):
+        """Returns a responder that streams every row of ``statement`` in batches."""
+        mimetype = STREAM_FORMATS[stream_format][1]
+        batch_size = self.flask_app.config['TASKS_STREAM_BATCH_SIZE']
+
+        async def respond(send):
+            async with self.sessions() as session:
+                headers = [(b'content-type', mimetype.encode('latin-1'))]
+                headers += [(name.encode('latin-1'), value.encode('latin-1'))
+                            for name, value in await self._change_token_headers(session)]
+                await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+                first = True
+                if stream_format == 'json':
+                    await send({'type': 'http.response.body', 'body': b'[', 'more_body': True})
+                result = await session.stream(statement.execution_options(yield_per=batch_size))
+                async for rows in result.partitions():
+                    items = [list_item(row) for row in rows]
+                    if stream_format == 'json':
+                        chunk = (b'' if first else b',') + json_dumps(items)[1:-1]
+                    else:
+                        chunk = b'\n'.join(json_dumps(item) for item in items) + b'\n'
+                    first = False
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b']' if stream_format == 'json' else b''})
+
+        return respond
+
+    async def get_task(self, task_id, query, body, headers):
+        cache = get_task_cache()
+        entry = cache.get(task_id) if cache is not None else None
+        cache_status = 'HIT'
+        if entry is None:
+            cache_status = 'MISS'
+            generation = cache.generation(task_id) if cache is not None else None
+            async with self.sessions() as session:
+                if self.engine.dialect.name == 'sqlite':
+                    row = (await session.execute(select(*DETAIL_COLUMNS).where(Task.id == task_id))).first()
+                    task = detail_item(row) if row is not None else None
+                else:
+                    task = await session.get(Task, task_id)
+                    task = task.to_dict(detailed=True) if task is not None else None
+            if task is None:
+                raise HTTPError(404, {"error": "Task not found"})
+            entry = (format_etag(task['version']), json_dumps(task))
+            if cache is not None:
+                cache.set(task_id, entry, generation)
+
+        etag, payload = entry
+        response_headers = (('etag', etag), ('x-cache', cache_status))
+        if etag in [value.strip() for value in headers.get('if-none-match', '').split(',')]:
+            return 304, b'', response_headers
+        return 200, payload, response_headers
+
+    async def update_task(self, task_id, query, body, headers):
+        data = _json_body(body)
+        if not data:
+            raise HTTPError(400, {"error": "No input data provided"})
+        values = _validated(validate_task_update, data)
+        versions = parse_if_match(headers.get('if-match'))
+
+        async with self.sessions() as session:
+            try:
+                row = (await session.execute(versioned_update(task_id, values, versions,
+                                                              detail_columns(self.engine.dialect.name)))).first()
+                version = row.version if row is not None else await session.scalar(
+                    select(Task.version).where(Task.id == task_id))
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                self.flask_app.logger.error(f"Error updating task {task_id}: {e.__class__.__name__}")
+                raise HTTPError(500, {"error": "Could not update task"})
+        if version is None:
+            raise HTTPError(404, {"error": "Task not found"})
+        if row is None:
+            return 412, json_dumps({"error": "Task was modified by another request"}), (('etag', format_etag(version)),)
+        invalidate_tasks([task_id])
+        log_sensitive_action(f"Task {task_id} updated", user_data={'id': task_id, 'changes': data})
+        return 200, json_dumps(detail_item(row)), (('etag', format_etag(version)),)
+
+    async def delete_task(self, task_id, query, body, headers):
+        async with self.sessions() as session:
+            task = await session.get(Task, task_id)
+            if task is None:
+                raise HTTPError(404, {"error": "Task not found"})
+            try:
+                await session.delete(task)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                self.flask_app.logger.error(f"Error deleting task {task_id}: {e.__class__.__name__}")
+                raise HTTPError(500, {"error": "Could not delete task"})
+        invalidate_tasks([task_id])
+        log_sensitive_action(f"Task {task_id} deleted")
+        return 204, b''
+
+
+def _json_body(body):
+    if not body:
+        return None
+    try:
+        return json_loads(body)
+    except ValueError:
+        raise HTTPError(400, {"error": "Request body is not valid JSON"})
+
+
+def _validated(validate, data):
+    values, errors = validate(data)
+    if errors:
+        raise HTTPError(400, {"error": error_summary(errors), "details": errors})
+    return values
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+async def _send_response(send, status, payload, extra_headers=()):
+    headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in extra_headers]
+    if status != 204 and status != 304:
+        headers.append((b'content-type', b'application/json'))
+        headers.append((b'content-length', str(len(payload)).encode('latin-1')))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': payload})
+
+
+def _wsgi_environ(scope, body):
+    """Builds a WSGI environ for an ASGI HTTP scope with an already-read body."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': unquote(scope['path'], encoding='latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def create_asgi_app(config_name=None):
+    """
+    Creates the ASGI application.
+
+    Args:
+        config_name (str, optional): ``dev``, ``test`` or ``prod``; defaults to ``FLASK_ENV``.
+
+    Returns:
+        AsyncTaskAPI: The ASGI callable.
+    """
+    return AsyncTaskAPI(create_app(config_name, serving=True))
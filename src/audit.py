@@ -0,0 +1,316 @@
+import atexit
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+from flask import current_app, has_app_context
+
+REDACTED = '[REDACTED]'
+BACKPRESSURE_POLICIES = {'drop', 'block', 'sample'}
+
+# Sentinel placed on the queue to ask the writer thread to flush and exit.
+_STOP = object()
+
+# Log path meaning standard error.
+STDERR_PATH = '-'
+
+# Serializes starting a writer in a new process; re-created in forked children
+# in case the fork happened while a parent thread held it.
+_start_lock = threading.Lock()
+
+
+def _reset_start_lock():
+    global _start_lock
+    _start_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_start_lock)
+
+
+def redact(value, fields):
+    """
+    Returns a copy of ``value`` with every key in ``fields`` masked, at any depth.
+
+    Args:
+        value: The event payload (dicts and lists are walked recursively).
+        fields (frozenset): Keys whose values must not be written.
+
+    Returns:
+        The redacted copy.
+    """
+    if isinstance(value, dict):
+        return {key: REDACTED if key in fields else redact(item, fields) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(item, fields) for item in value]
+    return value
+
+
+def format_event(timestamp, action, user_data, fields):
+    """
+    Builds the JSON line for one audit event.
+
+    Args:
+        timestamp (float): Epoch seconds captured when the event was submitted.
+        action (str): What happened.
+        user_data: Optional payload, redacted before it is encoded.
+        fields (frozenset): Keys to redact.
+
+    Returns:
+        str: The JSON-encoded event, without a trailing newline.
+    """
+    event = {'ts': datetime.fromtimestamp(timestamp, timezone.utc).isoformat(), 'action': action}
+    if user_data:
+        event['data'] = redact(user_data, fields)
+    return json.dumps(event, default=str, separators=(',', ':'))
+
+
+class AuditPipeline:
+    """
+    Writes audit events to rotating JSON-lines files (or standard error) from a
+    background thread.
+
+    The request thread only timestamps the event and puts it on a bounded
+    queue; redaction, encoding and file I/O happen on the writer thread in
+    batches. When the queue is full the backpressure policy decides what
+    happens to the event:
+
+    - ``drop``: discard it immediately.
+    - ``block``: wait up to ``block_timeout`` seconds for room, then discard it.
+    - ``sample``: once the queue is half full, keep only ``sample_rate`` of the
+      events; discard when it is completely full.
+
+    Args:
+        path (str): The active log file; rotated files get ``.1``, ``.2``, ... suffixes.
+            ``-`` writes to standard error, without rotation.
+        max_queue (int): Queue capacity in events.
+        policy (str): One of ``drop``, ``block`` or ``sample``.
+        redact_fields (iterable): Payload keys that are masked before writing.
+        batch_size (int): Events written per file write.
+        flush_interval (float): Seconds the writer waits before flushing a partial batch.
+        max_bytes (int): Size at which the file is rotated; 0 disables rotation.
+        backup_count (int): Rotated files kept.
+        block_timeout (float): Wait for the ``block`` policy.
+        sample_rate (float): Fraction of events kept under pressure by the ``sample`` policy.
+        autostart (bool): Start the writer on the first event rather than on :meth:`start`,
+            and again in a forked child, so a preloaded parent never runs the thread.
+    """
+
+    def __init__(self, path, max_queue=10000, policy='drop', redact_fields=('description',),
+                 batch_size=256, flush_interval=1.0, max_bytes=10 * 1024 * 1024, backup_count=5,
+                 block_timeout=0.05, sample_rate=0.1, autostart=False):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown audit backpressure policy: {policy}")
+        self.path = path
+        self.policy = policy
+        self.redact_fields = frozenset(redact_fields)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.block_timeout = block_timeout
+        self.sample_rate = sample_rate
+        self.autostart = autostart
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._high_water = max_queue // 2
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._file = None
+        self.submitted = 0
+        self.dropped = 0
+        self.sampled_out = 0
+        self.written = 0
+        self.rotations = 0
+
+    def start(self):
+        """Starts the writer thread and registers a flush at interpreter exit."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, action, user_data=None):
+        """
+        Queues an event without blocking the caller (except under the ``block`` policy).
+
+        Args:
+            action (str): What happened.
+            user_data (optional): Payload to record; it is redacted off the request thread.
+
+        Returns:
+            bool: True if the event was queued, False if it was dropped or sampled out.
+        """
+        if self.autostart and self._pid != os.getpid():
+            self._start_in_this_process()
+        event = (time.time(), action, user_data)
+        if self.policy == 'sample' and self._queue.qsize() >= self._high_water \
+                and random.random() >= self.sample_rate:
+            with self._lock:
+                self.sampled_out += 1
+            return False
+        try:
+            if self.policy == 'block':
+                self._queue.put(event, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def close(self, timeout=5.0):
+        """
+        Flushes every queued event and stops the writer thread.
+
+        Args:
+            timeout (float): Seconds to wait for the writer to finish.
+        """
+        self.autostart = False
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        self._thread = None
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _start_in_this_process(self):
+        # Concurrent first events in a new worker must start a single writer;
+        # a second start would replace the queue the first one drains.
+        with _start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                self._forget_parent()
+            self.start()
+
+    def _forget_parent(self):
+        # In a forked child the parent's writer thread does not exist, and
+        # its queued events and open file are the parent's to write.
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._file = None
+
+    def stats(self):
+        """Returns the pipeline counters and the current queue depth."""
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'queue_capacity': self._queue.maxsize,
+                'policy': self.policy,
+                'submitted': self.submitted,
+                'dropped': self.dropped,
+                'sampled_out': self.sampled_out,
+                'written': self.written,
+                'rotations': self.rotations,
+            }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+        if self._file is not None and self._file is not sys.stderr:
+            self._file.close()
+        self._file = None
+
+    def _write(self, batch):
+        lines = ''.join(format_event(ts, action, data, self.redact_fields) + '\n' for ts, action, data in batch)
+        if self._file is None:
+            self._file = self._open()
+        self._file.write(lines)
+        self._file.flush()
+        with self._lock:
+            self.written += len(batch)
+        if self.max_bytes and self._file is not sys.stderr and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _open(self):
+        if self.path == STDERR_PATH:
+            return sys.stderr
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return open(self.path, 'a', encoding='utf-8')
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        with self._lock:
+            self.rotations += 1
+
+
+def init_audit(app):
+    """
+    Creates the audit pipeline configured by ``AUDIT_LOG_PATH`` and friends.
+
+    Events go to ``AUDIT_LOG_PATH`` (standard error for ``-``, the default).
+    The writer thread starts with the first event, so creating the app (or
+    preloading it before forking workers) does not spawn it.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        AuditPipeline or None: The pipeline, or None when ``AUDIT_LOG_PATH`` is empty.
+    """
+    path = app.config.get('AUDIT_LOG_PATH', STDERR_PATH)
+    if not path:
+        app.extensions['audit'] = None
+        return None
+    pipeline = AuditPipeline(
+        path,
+        max_queue=app.config.get('AUDIT_QUEUE_SIZE', 10000),
+        policy=app.config.get('AUDIT_BACKPRESSURE', 'drop'),
+        redact_fields=app.config.get('AUDIT_REDACT_FIELDS', ('description',)),
+        max_bytes=app.config.get('AUDIT_MAX_BYTES', 10 * 1024 * 1024),
+        backup_count=app.config.get('AUDIT_BACKUP_COUNT', 5),
+        sample_rate=app.config.get('AUDIT_SAMPLE_RATE', 0.1),
+        autostart=True,
+    )
+    app.extensions['audit'] = pipeline
+    return pipeline
+
+
+def get_audit_pipeline():
+    """Returns the current app's audit pipeline, or None outside an app or when disabled."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('audit')
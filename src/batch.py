@@ -0,0 +1,168 @@
+from flask import current_app
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from .models import db, Task
+from .schemas import error_summary, validate_batch_update, validate_task_create
+from .utils import chunked, get_current_utc_time
+
+
+def _failure(index, status, error, details=None):
+    result = {"index": index, "status": status, "error": error}
+    if details:
+        result["details"] = details
+    return result
+
+
+def _is_task_id(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _item_values(item, validate):
+    values, errors = validate(item)
+    if errors:
+        return None, (error_summary(errors), errors)
+    return values, None
+
+
+def _existing_ids(ids):
+    return set(db.session.scalars(select(Task.id).where(Task.id.in_(ids))))
+
+
+def _write_chunks(valid, commit_size, results, write, failure_message):
+    """
+    Runs ``write`` over ``valid`` in sub-batches, committing after each one.
+
+    A failed sub-batch is rolled back and each of its items is reported as a
+    500; earlier sub-batches stay committed. With ``commit_size`` unset the
+    whole batch is written in a single transaction.
+    """
+    size = commit_size or len(valid) or 1
+    for chunk in chunked(valid, size):
+        try:
+            outcomes = write(chunk)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            current_app.logger.error(f"{failure_message}: {e.__class__.__name__}")
+            for index, _ in chunk:
+                results[index] = _failure(index, 500, failure_message)
+            continue
+        for (index, _), outcome in zip(chunk, outcomes):
+            results[index] = outcome
+
+
+def create_tasks(items, commit_size=None):
+    """
+    Validates and inserts many tasks with executemany.
+
+    SQLAlchemy sends the rows as multi-row ``INSERT ... RETURNING`` statements
+    of up to ``insertmanyvalues_page_size`` rows. Asking it for the IDs in
+    parameter order would make SQLite fall back to one statement per row;
+    instead the IDs are sorted, since the database hands out ascending IDs in
+    VALUES order and each later statement of the transaction gets higher ones.
+
+    Args:
+        items (list): Task payloads, each shaped like a POST /tasks body.
+        commit_size (int, optional): Items per transaction; 0 or None for one transaction.
+
+    Returns:
+        list: One result dict per item, in input order.
+    """
+    results = [None] * len(items)
+    valid = []
+    now = get_current_utc_time()
+    for index, item in enumerate(items):
+        values, error = _item_values(item, validate_task_create)
+        if error:
+            results[index] = _failure(index, 400, *error)
+            continue
+        values.setdefault('description', None)
+        values.setdefault('due_date', None)
+        values.update(status='pending', created_at=now, updated_at=now)
+        valid.append((index, values))
+
+    def write(chunk):
+        ids = sorted(db.session.execute(insert(Task).returning(Task.id), [values for _, values in chunk]).scalars())
+        return [{"index": index, "status": 201, "id": task_id} for (index, _), task_id in zip(chunk, ids)]
+
+    _write_chunks(valid, commit_size, results, write, "Could not create task")
+    return results
+
+
+def update_tasks(items, commit_size=None):
+    """
+    Validates and applies partial updates to many tasks by primary key.
+
+    Args:
+        items (list): Update payloads, each with an ``id`` and the fields to change.
+        commit_size (int, optional): Items per transaction; 0 or None for one transaction.
+
+    Returns:
+        list: One result dict per item, in input order.
+    """
+    results = [None] * len(items)
+    valid = []
+    now = get_current_utc_time()
+    for index, item in enumerate(items):
+        values, error = _item_values(item, validate_batch_update)
+        if not error and len(values) == 1:
+            error = ("No fields to update", None)
+        if error:
+            results[index] = _failure(index, 400, *error)
+            continue
+        values['updated_at'] = now
+        valid.append((index, values))
+
+    def write(chunk):
+        existing = _existing_ids({values['id'] for _, values in chunk})
+        found = [values for _, values in chunk if values['id'] in existing]
+        # One executemany per set of changed fields; every row's version is
+        # bumped in the same UPDATE, which the ORM bulk update can't express.
+        groups = {}
+        for values in found:
+            groups.setdefault(frozenset(values), []).append(
+                {f'{key}_value': value for key, value in values.items()})
+        for keys, rows in groups.items():
+            stmt = (update(Task.__table__).where(Task.id == bindparam('id_value'))
+                    .values({**{key: bindparam(f'{key}_value') for key in keys if key != 'id'},
+                             'version': Task.version + 1}))
+            db.session.execute(stmt, rows)
+        return [{"index": index, "status": 200, "id": values['id']} if values['id'] in existing
+                else _failure(index, 404, "Task not found")
+                for index, values in chunk]
+
+    _write_chunks(valid, commit_size, results, write, "Could not update task")
+    return results
+
+
+def delete_tasks(ids, commit_size=None):
+    """
+    Deletes many tasks by primary key.
+
+    Args:
+        ids (list): The IDs of the tasks to delete.
+        commit_size (int, optional): Items per transaction; 0 or None for one transaction.
+
+    Returns:
+        list: One result dict per ID, in input order.
+    """
+    results = [None] * len(ids)
+    valid = []
+    for index, task_id in enumerate(ids):
+        if not _is_task_id(task_id):
+            results[index] = _failure(index, 400, "id must be a positive integer")
+            continue
+        valid.append((index, task_id))
+
+    def write(chunk):
+        existing = _existing_ids({task_id for _, task_id in chunk})
+        if existing:
+            stmt = delete(Task).where(Task.id.in_(existing)).execution_options(synchronize_session=False)
+            db.session.execute(stmt)
+        return [{"index": index, "status": 204, "id": task_id} if task_id in existing
+                else _failure(index, 404, "Task not found")
+                for index, task_id in chunk]
+
+    _write_chunks(valid, commit_size, results, write, "Could not delete task")
+    return results
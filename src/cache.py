@@ -0,0 +1,307 @@
+import fnmatch
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from flask import current_app
+
+
+class CacheBackend(ABC):
+    """
+    Interface for the serialized-task cache.
+
+    Keys are task IDs and values are ``(etag, body)`` pairs: the ETag header
+    and the JSON bytes returned by GET /tasks/<id>, so a hit is served without
+    decoding the body. Backends count hits, misses and evictions so the cache
+    can be sized.
+
+    A reader takes ``generation(key)`` before loading a task and passes it to
+    ``set``; ``delete`` moves the key to a new generation, so a body loaded
+    before a concurrent write is never served after that write.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """Returns the cached value, or None."""
+
+    @abstractmethod
+    def generation(self, key):
+        """Returns the key's current generation, to pass to :meth:`set`."""
+
+    @abstractmethod
+    def set(self, key, value, generation=None):
+        """Stores a value loaded under ``generation``; a stale one is dropped."""
+
+    @abstractmethod
+    def delete(self, key):
+        """Drops the key and starts a new generation for it."""
+
+    @abstractmethod
+    def clear(self):
+        """Drops every entry."""
+
+    @abstractmethod
+    def stats(self):
+        """Returns the cache counters as a dict."""
+
+
+class LRUCache(CacheBackend):
+    """
+    In-process LRU cache with a per-entry TTL and a bounded number of entries.
+
+    Generations are kept per stripe of keys rather than per key, so they take
+    constant memory; a write only blocks fills of keys on its own stripe.
+
+    Args:
+        max_entries (int): Entries kept before the least recently used is evicted.
+        ttl (float): Seconds an entry stays valid; 0 disables expiry.
+        clock (callable, optional): Monotonic clock, replaceable in tests.
+    """
+
+    GENERATION_STRIPES = 1024
+
+    def __init__(self, max_entries, ttl, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._generations = [0] * self.GENERATION_STRIPES
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.stale_fills = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self, key):
+        return self._generations[hash(key) % self.GENERATION_STRIPES]
+
+    def set(self, key, value, generation=None):
+        expires_at = self._clock() + self.ttl if self.ttl else None
+        with self._lock:
+            if generation is not None and generation != self.generation(key):
+                self.stale_fills += 1
+                return
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._generations[hash(key) % self.GENERATION_STRIPES] += 1
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generations = [generation + 1 for generation in self._generations]
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'lru',
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'stale_fills': self.stale_fills,
+            }
+
+
+class LocalKeyValueStore:
+    """
+    In-process stand-in for an external key/value server.
+
+    Implements the small subset of a Redis-style client used by
+    :class:`KeyValueCache` (``get``, ``mget``, ``set`` with ``ex``,
+    ``delete``, ``scan_iter``), so the remote backend can be exercised without
+    a server.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                return None
+            return value
+
+    def mget(self, *keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._data[key] = (self._clock() + ex if ex else None, value)
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def scan_iter(self, match='*', count=None):
+        with self._lock:
+            keys = [key for key in self._data if fnmatch.fnmatchcase(key, match)]
+        yield from keys
+
+
+class KeyValueCache(CacheBackend):
+    """
+    Cache backend on top of a Redis-style key/value client.
+
+    Expiry and eviction are left to the store; hits and misses are counted
+    locally by this process. Each task has a generation key holding a random
+    token that ``delete`` replaces; entries are stored as
+    ``token:etag:body`` with the token they were loaded under and read
+    together with the current one (one ``mget``), so a stale fill from any
+    process reads as a miss.
+
+    Args:
+        client: An object with ``get``, ``mget``, ``set(key, value, ex=)``,
+            ``delete`` and ``scan_iter(match=, count=)``.
+        ttl (int): Seconds an entry stays valid; 0 disables expiry.
+        prefix (str, optional): Namespace for the keys written by this cache.
+    """
+
+    CLEAR_BATCH = 500
+
+    def __init__(self, client, ttl, prefix='task:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _generation_key(self, key):
+        return f'{self.prefix}gen:{key}'
+
+    def get(self, key):
+        entry, current = self.client.mget(f'{self.prefix}{key}', self._generation_key(key))
+        value = None
+        if entry is not None:
+            generation, _, rest = entry.partition(b':')
+            if generation == _token(current):
+                etag, _, body = rest.partition(b':')
+                value = (etag.decode('ascii'), body)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def generation(self, key):
+        return _token(self.client.get(self._generation_key(key)))
+
+    def set(self, key, value, generation=None):
+        if generation is None:
+            generation = self.generation(key)
+        etag, body = value
+        self.client.set(f'{self.prefix}{key}', b':'.join((_token(generation), etag.encode('ascii'), body)),
+                        ex=self.ttl or None)
+
+    def delete(self, key):
+        # Outlives any entry tagged with the previous token.
+        self.client.set(self._generation_key(key), uuid.uuid4().hex.encode('ascii'),
+                        ex=2 * self.ttl if self.ttl else None)
+        self.client.delete(f'{self.prefix}{key}')
+
+    def clear(self):
+        # The store may be shared, so only this cache's entries are dropped
+        # (SCAN + DEL, never FLUSHDB). Generation keys stay: a fill started
+        # before a write must still read as stale afterwards.
+        generations = self._generation_key('')
+        batch = []
+        for key in self.client.scan_iter(match=f'{self.prefix}*', count=self.CLEAR_BATCH):
+            name = key.decode('utf-8') if isinstance(key, bytes) else key
+            if not name.startswith(generations):
+                batch.append(key)
+            if len(batch) == self.CLEAR_BATCH:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'kv', 'hits': self.hits, 'misses': self.misses, 'evictions': 0}
+
+
+def _token(generation):
+    if generation is None:
+        return b''
+    return generation if isinstance(generation, bytes) else str(generation).encode('ascii')
+
+
+def init_task_cache(app, client=None):
+    """
+    Creates the task cache configured by ``TASK_CACHE_BACKEND`` and registers it on the app.
+
+    Args:
+        app (Flask): The application.
+        client (optional): Key/value client for the ``kv`` backend; defaults to a
+            :class:`LocalKeyValueStore`.
+
+    Returns:
+        CacheBackend or None: The cache, or None when caching is disabled.
+    """
+    backend = app.config.get('TASK_CACHE_BACKEND', 'lru')
+    ttl = app.config.get('TASK_CACHE_TTL', 30)
+    if backend == 'lru':
+        cache = LRUCache(app.config.get('TASK_CACHE_MAX_ENTRIES', 10000), ttl)
+    elif backend == 'kv':
+        cache = KeyValueCache(client or LocalKeyValueStore(), ttl)
+    elif backend in (None, '', 'none'):
+        cache = None
+    else:
+        raise ValueError(f"Unknown TASK_CACHE_BACKEND: {backend}")
+    app.extensions['task_cache'] = cache
+    return cache
+
+
+def get_task_cache():
+    """Returns the current app's task cache, or None when caching is disabled."""
+    return current_app.extensions.get('task_cache')
+
+
+def invalidate_tasks(task_ids):
+    """
+    Drops cached responses for tasks that were written.
+
+    Args:
+        task_ids (iterable): IDs of the created, updated or deleted tasks.
+    """
+    cache = get_task_cache()
+    if cache is None:
+        return
+    for task_id in task_ids:
+        cache.delete(task_id)
@@ -0,0 +1,278 @@
+import threading
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import DDL, event, select
+from sqlalchemy.orm import Session
+
+from .models import db, Task, TaskChange
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+from .serializers import DETAIL_COLUMNS, detail_item
+
+CHANGES_TABLE = TaskChange.__tablename__
+
+_NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+# Every write to `tasks` appends to `task_changes` from inside the same
+# transaction, so the sequence follows commit order (SQLite has one writer)
+# and bulk statements that bypass the ORM are recorded as well.
+CHANGE_FEED_CREATE_STATEMENTS = (
+    f"CREATE TRIGGER IF NOT EXISTS {CHANGES_TABLE}_ai AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO {CHANGES_TABLE}(task_id, op, changed_at) VALUES (new.id, 'insert', {_NOW}); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {CHANGES_TABLE}_au AFTER UPDATE ON tasks BEGIN "
+    f"INSERT INTO {CHANGES_TABLE}(task_id, op, changed_at) VALUES (new.id, 'update', {_NOW}); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {CHANGES_TABLE}_ad AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO {CHANGES_TABLE}(task_id, op, changed_at) VALUES (old.id, 'delete', {_NOW}); "
+    "END",
+)
+
+CHANGE_FEED_DROP_STATEMENTS = (
+    f"DROP TRIGGER IF EXISTS {CHANGES_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {CHANGES_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {CHANGES_TABLE}_ai",
+)
+
+# The triggers reference both tables, so they are created once the whole
+# schema exists rather than with either table. DDL() applies %-formatting,
+# hence the escaping of strftime's format string.
+for _statement in CHANGE_FEED_CREATE_STATEMENTS:
+    event.listen(db.metadata, 'after_create', DDL(_statement.replace('%', '%%')).execute_if(dialect='sqlite'))
+for _statement in CHANGE_FEED_DROP_STATEMENTS:
+    event.listen(db.metadata, 'before_drop', DDL(_statement).execute_if(dialect='sqlite'))
+
+
+class ExpiredToken(Exception):
+    """Raised when the changes after a token have been pruned; the client must resync."""
+
+
+class ChangeNotifier:
+    """
+    Wakes long-poll and SSE waiters when this process commits a write.
+
+    Writes from other processes are not signalled; waiters also re-check the
+    database every poll interval to pick those up.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._generation = 0
+
+    def notify(self):
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def wait(self, generation, timeout):
+        """
+        Blocks until a commit newer than ``generation`` or until ``timeout`` elapses.
+
+        Returns:
+            bool: True if a commit was signalled.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._generation != generation, timeout)
+
+
+def is_change_feed_available():
+    """Returns True when the bound database records changes (the triggers are SQLite-only)."""
+    return db.engine.dialect.name == 'sqlite'
+
+
+def encode_token(seq):
+    """Wraps a change sequence number in an opaque token."""
+    return encode_cursor([seq])
+
+
+def decode_token(token):
+    """
+    Decodes a ``since`` token.
+
+    Args:
+        token (str or None): The raw token; empty means "from the beginning".
+
+    Returns:
+        int: The last sequence number the client has seen.
+
+    Raises:
+        InvalidCursor: If the token is malformed.
+    """
+    if not token:
+        return 0
+    values = decode_cursor(token)
+    if len(values) != 1 or not isinstance(values[0], int) or values[0] < 0:
+        raise InvalidCursor("Malformed change token.")
+    return values[0]
+
+
+# AUTOINCREMENT keeps the highest seq ever used here, pruned rows included.
+HEAD_SEQUENCE_SQL = "SELECT seq FROM sqlite_sequence WHERE name = ?"
+
+
+def latest_change_sequence():
+    """Returns the sequence number of the newest change ever recorded (0 if none)."""
+    row = db.session.connection().exec_driver_sql(HEAD_SEQUENCE_SQL, (CHANGES_TABLE,)).first()
+    return row[0] if row is not None else 0
+
+
+def current_change_token():
+    """
+    Returns the token of the newest change, for a client about to read the full task list.
+
+    Read in the same transaction as the list, it marks where the list's
+    snapshot ends: following the feed from it misses no later write, even
+    after old changes have been pruned.
+
+    Returns:
+        str or None: The token, or None when the change feed is unavailable.
+    """
+    if not is_change_feed_available():
+        return None
+    return encode_token(latest_change_sequence())
+
+
+def fetch_changes(since, limit):
+    """
+    Returns the net effect of the changes after ``since``, up to ``limit`` change rows.
+
+    Several changes to one task collapse into its current state, or into a
+    tombstone if it no longer exists.
+
+    Args:
+        since (int): The last sequence number the client has seen.
+        limit (int): Maximum number of change rows consumed.
+
+    Returns:
+        dict: ``tasks`` (detail dicts), ``deleted`` (task IDs), ``next_token`` and ``has_more``.
+
+    Raises:
+        ExpiredToken: If changes after ``since`` have been pruned, or the token
+            is ahead of this database.
+    """
+    rows = db.session.execute(
+        select(TaskChange.seq, TaskChange.task_id)
+        .where(TaskChange.seq > since).order_by(TaskChange.seq).limit(limit + 1)
+    ).all()
+    # AUTOINCREMENT sequences have no gaps except where rows were pruned, so
+    # the token is only worth checking when the next change isn't since + 1.
+    if not rows or rows[0].seq != since + 1:
+        head = latest_change_sequence()
+        oldest = db.session.execute(select(db.func.min(TaskChange.seq))).scalar()
+        pruned_through = oldest - 1 if oldest is not None else head
+        if since < pruned_through or since > head:
+            raise ExpiredToken()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    task_ids = list(dict.fromkeys(row.task_id for row in rows))
+    tasks = {}
+    if task_ids:
+        for row in db.session.execute(select(*DETAIL_COLUMNS).where(Task.id.in_(task_ids))):
+            tasks[row[0]] = detail_item(row)
+    return {
+        'tasks': [tasks[task_id] for task_id in task_ids if task_id in tasks],
+        'deleted': [task_id for task_id in task_ids if task_id not in tasks],
+        'next_token': encode_token(rows[-1].seq if rows else since),
+        'has_more': has_more,
+    }
+
+
+def wait_for_changes(since, limit, timeout, poll_interval):
+    """
+    Long-polls for changes after ``since``.
+
+    Returns as soon as there is at least one change, or with an empty result
+    once ``timeout`` seconds have passed. The session is rolled back between
+    checks so each one sees the latest committed data.
+
+    Args:
+        since (int): The last sequence number the client has seen.
+        limit (int): Maximum number of change rows consumed.
+        timeout (float): Seconds to wait for a change.
+        poll_interval (float): Seconds between database checks when no commit is signalled.
+
+    Returns:
+        dict: The same shape as :func:`fetch_changes`.
+    """
+    notifier = get_change_notifier()
+    deadline = time.monotonic() + timeout
+    while True:
+        generation = notifier.generation if notifier is not None else None
+        result = fetch_changes(since, limit)
+        db.session.rollback()
+        remaining = deadline - time.monotonic()
+        if result['tasks'] or result['deleted'] or remaining <= 0:
+            return result
+        if notifier is not None:
+            notifier.wait(generation, min(poll_interval, remaining))
+        else:
+            time.sleep(min(poll_interval, remaining))
+
+
+def prune_changes(before):
+    """
+    Deletes change rows recorded before ``before``.
+
+    Clients holding a token older than the pruned range get 410 Gone and
+    must resync from a full listing.
+
+    Args:
+        before (datetime): Naive UTC cutoff.
+
+    Returns:
+        int: The number of rows deleted.
+    """
+    result = db.session.execute(db.delete(TaskChange).where(TaskChange.changed_at < before))
+    db.session.commit()
+    return result.rowcount
+
+
+def init_change_feed(app):
+    """
+    Creates the process-local notifier used to wake change-feed waiters on commit.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        ChangeNotifier: The notifier registered as ``app.extensions['task_changes']``.
+    """
+    notifier = ChangeNotifier()
+    app.extensions['task_changes'] = notifier
+    return notifier
+
+
+def get_change_notifier():
+    """Returns the current app's change notifier, or None outside an app."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('task_changes')
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_written(session, flush_context):
+    session.info['task_changes_pending'] = True
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _mark_bulk_written(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['task_changes_pending'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _notify_waiters(session):
+    if session.info.pop('task_changes_pending', False):
+        notifier = get_change_notifier()
+        if notifier is not None:
+            notifier.notify()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_writes(session):
+    session.info.pop('task_changes_pending', None)
@@ -0,0 +1,120 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import click
+from flask.cli import AppGroup
+
+from .changes import prune_changes
+from .search import is_search_available, rebuild_search_index
+from .sharding import get_task_shards
+from .stats import check_task_stats, is_stats_table_maintained, rebuild_task_stats
+from .transfer import FORMATS, TransferError, export_tasks, import_tasks
+
+tasks_cli = AppGroup('tasks', help="Task maintenance commands.")
+
+
+@tasks_cli.command('reindex')
+def reindex_command():
+    """Create the full-text search index if needed and rebuild it from the tasks table."""
+    if not is_search_available():
+        raise click.ClickException("Full-text search requires SQLite with FTS5.")
+    count = rebuild_search_index()
+    click.echo(f"Indexed {count} tasks.")
+
+
+@tasks_cli.command('prune-changes')
+@click.option('--days', default=30, show_default=True, type=click.IntRange(min=0),
+              help="Keep change-feed entries from the last N days.")
+def prune_changes_command(days):
+    """Delete old change-feed entries; clients with older tokens must resync."""
+    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    count = prune_changes(cutoff)
+    click.echo(f"Pruned {count} change entries.")
+
+
+@tasks_cli.command('reconcile-stats')
+@click.option('--check', 'check_only', is_flag=True, help="Only report drift; exit 1 if there is any.")
+def reconcile_stats_command(check_only):
+    """Rebuild the status/due-day counters from the tasks table and verify them."""
+    if not is_stats_table_maintained():
+        raise click.ClickException("Stored counters are only maintained on SQLite.")
+    drift = check_task_stats()
+    for status, day, stored, actual in drift:
+        click.echo(f"{status!r} {day or '(no due date)'}: stored {stored}, actual {actual}")
+    if check_only:
+        if drift:
+            raise SystemExit(1)
+        click.echo("Counters match.")
+        return
+    rows = rebuild_task_stats()
+    remaining = check_task_stats()
+    if remaining:
+        raise click.ClickException(f"{len(remaining)} counters still differ after the rebuild.")
+    click.echo(f"Rebuilt {rows} counters ({len(drift)} had drifted); counters match.")
+
+
+def _require_single_database():
+    if get_task_shards() is not None:
+        raise click.ClickException("Not available with sharded task storage (TASK_SHARDS).")
+
+
+def _progress_printer(every=5.0):
+    """Returns a progress callback that prints the rate to stderr at most every ``every`` seconds."""
+    last = 0.0
+
+    def report(rows, elapsed):
+        nonlocal last
+        if elapsed - last >= every:
+            last = elapsed
+            click.echo(f"  {rows} rows ({rows / elapsed:,.0f} rows/s)", err=True)
+
+    return report
+
+
+def _rate(rows, elapsed):
+    return f"{elapsed:.1f}s ({rows / elapsed if elapsed > 0 else 0:,.0f} rows/s)"
+
+
+@tasks_cli.command('export')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+@click.option('--format', 'format', type=click.Choice(FORMATS),
+              help="Default: csv for *.csv[.gz], ndjson otherwise.")
+@click.option('--batch-size', default=5000, show_default=True, type=click.IntRange(min=1),
+              help="Rows fetched from the cursor at a time.")
+def export_command(path, format, batch_size):
+    """Stream every task to an NDJSON or CSV file; a .gz suffix compresses it."""
+    _require_single_database()
+    started = time.perf_counter()
+    count = export_tasks(path, format, batch_size=batch_size, progress=_progress_printer())
+    click.echo(f"Exported {count} tasks to {path} in {_rate(count, time.perf_counter() - started)}.")
+
+
+@tasks_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'format', type=click.Choice(FORMATS),
+              help="Default: csv for *.csv[.gz], ndjson otherwise.")
+@click.option('--batch-size', default=1000, show_default=True, type=click.IntRange(min=1),
+              help="Records inserted and committed at a time.")
+@click.option('--checkpoint', type=click.Path(dir_okay=False),
+              help="Resume point file. Default: PATH.checkpoint")
+@click.option('--resume', is_flag=True, help="Continue an interrupted import from its checkpoint.")
+def import_command(path, format, batch_size, checkpoint, resume):
+    """Insert the tasks of an export file in committed batches, keeping their ids."""
+    _require_single_database()
+    started = time.perf_counter()
+    try:
+        count = import_tasks(path, format, batch_size=batch_size, checkpoint=checkpoint or path + '.checkpoint',
+                             resume=resume, progress=_progress_printer())
+    except TransferError as e:
+        raise click.ClickException(f"{e} Committed batches were kept; fix the file and rerun with --resume.")
+    click.echo(f"Imported {count} tasks from {path} in {_rate(count, time.perf_counter() - started)}.")
+
+
+@tasks_cli.command('init-shards')
+def init_shards_command():
+    """Create the task schema on every database listed in TASK_SHARDS."""
+    shards = get_task_shards()
+    if shards is None:
+        raise click.ClickException("TASK_SHARDS is not set.")
+    shards.create_all()
+    click.echo(f"Created the task schema on {len(shards)} shards.")
@@ -1,12 +1,38 @@
 import os
-from dotenv import load_dotenv
 
-project_folder = os.path.expanduser('~/simple_task_manager/src')  # HARDCODED PATH - INTENTIONAL ISSUE FOR SAARTHI
-# SAARTHI-202506031221: CRITICAL | COMPLIANCE
-# ISSUE: Hardcoded path to the project folder.
-# POLICY: OrgPolicy_compliance.md: Policy 3.4 - Avoid hardcoding configuration values.
-# FIX: Use a relative path or environment variable for the project folder.
-load_dotenv(os.path.join(project_folder, '.env'))
+# The .env file next to this module (see readme), or the one named by
+# DOTENV_PATH. python-dotenv is only imported when there is a file to read.
+DOTENV_PATH = os.environ.get('DOTENV_PATH') or os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+if os.path.exists(DOTENV_PATH):
+    from dotenv import load_dotenv
+    load_dotenv(DOTENV_PATH)
+
+def build_engine_options(database_uri, pool_size, max_overflow, pool_recycle, pool_pre_ping=True):
+    """
+    Builds SQLALCHEMY_ENGINE_OPTIONS for a database URI.
+
+    In-memory SQLite uses a single shared connection, so pool sizing only applies
+    to file and server databases.
+
+    Args:
+        database_uri (str or None): The SQLAlchemy database URI.
+        pool_size (int): Connections kept open in the pool.
+        max_overflow (int): Extra connections allowed under burst load.
+        pool_recycle (int): Seconds after which a pooled connection is replaced.
+        pool_pre_ping (bool): Whether to test connections before handing them out.
+
+    Returns:
+        dict: Keyword arguments for ``create_engine``.
+    """
+    if not database_uri or (database_uri.startswith('sqlite') and ':memory:' in database_uri):
+        return {}
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': pool_pre_ping,
+    }
+
 
 class Config:
     """Base configuration."""
@@ -19,6 +45,84 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
 
+    # Keyset pagination and streaming for GET /api/v1/tasks
+    TASKS_PAGE_DEFAULT_LIMIT = int(os.environ.get('TASKS_PAGE_DEFAULT_LIMIT', 100))
+    TASKS_PAGE_MAX_LIMIT = int(os.environ.get('TASKS_PAGE_MAX_LIMIT', 1000))
+    TASKS_STREAM_BATCH_SIZE = int(os.environ.get('TASKS_STREAM_BATCH_SIZE', 1000))
+
+    # Bulk endpoints (/api/v1/tasks:batch). BATCH_COMMIT_SIZE of 0 writes each
+    # batch in a single transaction.
+    BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 10000))
+    BATCH_COMMIT_SIZE = int(os.environ.get('BATCH_COMMIT_SIZE', 0))
+
+    # Read-through cache for GET /api/v1/tasks/<id>: 'lru', 'kv' or 'none'
+    TASK_CACHE_BACKEND = os.environ.get('TASK_CACHE_BACKEND', 'lru')
+    TASK_CACHE_MAX_ENTRIES = int(os.environ.get('TASK_CACHE_MAX_ENTRIES', 10000))
+    TASK_CACHE_TTL = int(os.environ.get('TASK_CACHE_TTL', 30))
+
+    # Asynchronous audit log (see audit.py), written off the request thread to
+    # AUDIT_LOG_PATH; '-' is standard error. AUDIT_BACKPRESSURE is 'drop',
+    # 'block' or 'sample'.
+    AUDIT_LOG_PATH = os.environ.get('AUDIT_LOG_PATH') or '-'
+    AUDIT_QUEUE_SIZE = int(os.environ.get('AUDIT_QUEUE_SIZE', 10000))
+    AUDIT_BACKPRESSURE = os.environ.get('AUDIT_BACKPRESSURE', 'drop')
+    AUDIT_SAMPLE_RATE = float(os.environ.get('AUDIT_SAMPLE_RATE', 0.1))
+    AUDIT_MAX_BYTES = int(os.environ.get('AUDIT_MAX_BYTES', 10 * 1024 * 1024))
+    AUDIT_BACKUP_COUNT = int(os.environ.get('AUDIT_BACKUP_COUNT', 5))
+    AUDIT_REDACT_FIELDS = ('description',)
+
+    # Change feed (GET /api/v1/tasks/changes): the longest long-poll a client
+    # may ask for, how often waiters re-check the database for writes made by
+    # other processes, and the SSE keep-alive interval and stream lifetime.
+    CHANGES_MAX_WAIT = float(os.environ.get('CHANGES_MAX_WAIT', 30))
+    CHANGES_POLL_INTERVAL = float(os.environ.get('CHANGES_POLL_INTERVAL', 1.0))
+    CHANGES_SSE_KEEPALIVE = float(os.environ.get('CHANGES_SSE_KEEPALIVE', 15))
+    CHANGES_SSE_MAX_SECONDS = float(os.environ.get('CHANGES_SSE_MAX_SECONDS', 300))
+
+    # ASGI mode (see asgi.py): threads running the routes passed through to
+    # Flask, and a separate pool for the change feed's long-polls and SSE
+    # streams, so waiting clients cannot hold up the other routes.
+    ASGI_PASSTHROUGH_WORKERS = int(os.environ.get('ASGI_PASSTHROUGH_WORKERS', 16))
+    ASGI_STREAM_WORKERS = int(os.environ.get('ASGI_STREAM_WORKERS', 16))
+
+    # Due-date reminders (see reminders.py). Off by default: every process
+    # that enables it fires its own reminders. REMINDER_HANDLERS is a
+    # comma-separated list of 'log' and 'webhook'.
+    REMINDERS_ENABLED = os.environ.get('REMINDERS_ENABLED', '0') == '1'
+    REMINDER_HANDLERS = os.environ.get('REMINDER_HANDLERS', 'log')
+    REMINDER_WEBHOOK_URL = os.environ.get('REMINDER_WEBHOOK_URL')
+    REMINDER_WEBHOOK_TIMEOUT = float(os.environ.get('REMINDER_WEBHOOK_TIMEOUT', 2.0))
+    REMINDER_MAX_PENDING = int(os.environ.get('REMINDER_MAX_PENDING', 10000))
+    REMINDER_POLL_INTERVAL = float(os.environ.get('REMINDER_POLL_INTERVAL', 30))
+
+    # Sharded task storage (see sharding.py): a comma-separated list of
+    # database URIs. When set, tasks live in these databases, spread by id,
+    # instead of SQLALCHEMY_DATABASE_URI; the shard count is fixed once they
+    # hold data. Search, stats, the change feed and the bulk endpoints need a
+    # single database and answer 501 in this mode.
+    TASK_SHARDS = [uri.strip() for uri in os.environ.get('TASK_SHARDS', '').split(',') if uri.strip()]
+
+    # Request/SQL instrumentation and the /metrics endpoint (see metrics.py).
+    # Requests slower than METRICS_SLOW_REQUEST_MS are logged with their SQL
+    # (distinct statements with counts, truncated);
+    # METRICS_PROFILE_SAMPLE_RATE of requests are profiled with cProfile.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    METRICS_SLOW_REQUEST_MS = int(os.environ.get('METRICS_SLOW_REQUEST_MS', 500))
+    METRICS_PROFILE_SAMPLE_RATE = float(os.environ.get('METRICS_PROFILE_SAMPLE_RATE', 0.0))
+    METRICS_PROFILE_DIR = os.environ.get('METRICS_PROFILE_DIR')
+
+    # PRAGMAs applied to every new SQLite connection (see engine.py). WAL lets
+    # readers run alongside the single writer, and busy_timeout makes writers
+    # wait for the lock instead of failing with "database is locked".
+    # Set to None to keep SQLite's defaults.
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', -64000)),  # negative = KiB
+    }
+
     # SAARTHI-202506031555: HIGH | COMPLIANCE
     # ISSUE: Insecure default SECRET_KEY.
     # POLICY: OrgPolicy_compliance.md: Policy 1.4 - Sensitive data (like passwords, if any) must be hashed using strong, modern algorithms.
@@ -29,6 +133,10 @@ class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(os.path.abspath(os.path.dirname(__file__)), 'tasks_dev.db')
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(SQLALCHEMY_DATABASE_URI,
+                                                     pool_size=5, max_overflow=5, pool_recycle=1800)
+    AUDIT_LOG_PATH = os.environ.get('AUDIT_LOG_PATH') or \
+        os.path.join(os.path.abspath(os.path.dirname(__file__)), 'logs', 'audit.jsonl')
 
 
 class TestingConfig(Config):
@@ -51,6 +159,12 @@ class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(
+        SQLALCHEMY_DATABASE_URI,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    )
  
 config_by_name = dict(
     dev=DevelopmentConfig,
@@ -59,9 +173,22 @@ config_by_name = dict(
     default=DevelopmentConfig
 )
 
-def get_config():
-    env = os.getenv('FLASK_ENV', 'default')
-    return config_by_name.get(env, DevelopmentConfig)
+def get_config(config_name=None):
+    """
+    Returns the configuration class for a name, or for ``FLASK_ENV`` when none is given.
+
+    The classes read the environment once, when this module is imported, so
+    every app created in the process shares the parsed values.
+
+    Args:
+        config_name (str, optional): ``dev``, ``test``, ``prod`` or ``default``.
+
+    Returns:
+        type: The configuration class; unknown names fall back to development.
+    """
+    if config_name is None:
+        config_name = os.getenv('FLASK_ENV', 'default')
+    return config_by_name.get(config_name, DevelopmentConfig)
 
 def some_unused_utility_function():
     # SAARTHI-202506031221: MEDIUM | Code Quality
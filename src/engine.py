@@ -0,0 +1,54 @@
+from sqlalchemy import event
+
+from .models import db
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """
+    Runs ``PRAGMA name = value`` for each configured pragma on a raw connection.
+
+    Args:
+        dbapi_connection: A sqlite3 connection.
+        pragmas (dict): Pragma names mapped to their values.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def tune_engine(app, engine):
+    """
+    Registers a connect hook that applies ``SQLITE_PRAGMAS`` to every new connection of ``engine``.
+
+    The pragmas are read from the app config when each connection opens, so
+    they can still be changed after the app is created. Other databases are
+    left untouched.
+
+    Args:
+        app (Flask): The application whose config holds the pragmas.
+        engine (Engine): The engine to tune.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        pragmas = app.config.get('SQLITE_PRAGMAS')
+        if pragmas:
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+
+def init_engine_tuning(app):
+    """
+    Tunes the app's engine with :func:`tune_engine`; shard engines are tuned
+    when the shards are set up.
+
+    Args:
+        app (Flask): The application whose engine should be tuned.
+    """
+    with app.app_context():
+        engine = db.engine
+    tune_engine(app, engine)
@@ -0,0 +1,284 @@
+import cProfile
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, current_app, g, has_app_context, request
+from sqlalchemy import event
+
+from .models import db
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """
+    Thread-safe histogram with fixed upper bounds, exported in Prometheus format.
+
+    Args:
+        buckets (tuple): Sorted upper bounds; an implicit ``+Inf`` bucket is added.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        """Returns the cumulative bucket counts, the sum and the count."""
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative = []
+        running = 0
+        for value in counts:
+            running += value
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+
+class MetricsRegistry:
+    """Per-route request latency, DB time and SQL statement count histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.request_duration = {}
+        self.db_duration = {}
+        self.db_statements = {}
+        self.slow_requests = 0
+        self.profiles_written = 0
+
+    def _histogram(self, family, labels, buckets):
+        histogram = family.get(labels)
+        if histogram is None:
+            with self._lock:
+                histogram = family.setdefault(labels, Histogram(buckets))
+        return histogram
+
+    def record_request(self, method, route, status, duration, db_time, statements):
+        """
+        Records one finished request.
+
+        Args:
+            method (str): The HTTP method.
+            route (str): The URL rule that matched, e.g. ``/api/v1/tasks/<int:task_id>``.
+            status (int): The response status code.
+            duration (float): Wall-clock seconds spent handling the request.
+            db_time (float): Seconds spent executing SQL.
+            statements (int): Number of SQL statements executed.
+        """
+        route_labels = (('method', method), ('route', route))
+        self._histogram(self.request_duration, route_labels + (('status', str(status)),),
+                        LATENCY_BUCKETS).observe(duration)
+        self._histogram(self.db_duration, route_labels, LATENCY_BUCKETS).observe(db_time)
+        self._histogram(self.db_statements, route_labels, STATEMENT_BUCKETS).observe(statements)
+
+    def increment(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def render(self, extra_gauges=()):
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Args:
+            extra_gauges (iterable): ``(name, help, type, value)`` tuples appended as-is.
+
+        Returns:
+            str: The exposition document.
+        """
+        lines = []
+        families = (
+            ('http_request_duration_seconds', 'Request latency by route.', self.request_duration),
+            ('http_request_db_seconds', 'Time spent in SQL per request.', self.db_duration),
+            ('http_request_db_statements', 'SQL statements executed per request.', self.db_statements),
+        )
+        for name, help_text, family in families:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            with self._lock:
+                items = list(family.items())
+            for labels, histogram in items:
+                cumulative, total, count = histogram.snapshot()
+                base = _labels(labels)
+                for bound, value in zip(histogram.buckets + ('+Inf',), cumulative):
+                    lines.append(f'{name}_bucket{{{base},le="{bound}"}} {value}')
+                lines.append(f'{name}_sum{{{base}}} {total}')
+                lines.append(f'{name}_count{{{base}}} {count}')
+        gauges = (
+            ('http_slow_requests_total', 'Requests slower than METRICS_SLOW_REQUEST_MS.', 'counter',
+             self.slow_requests),
+            ('http_profiles_written_total', 'Sampled cProfile dumps written.', 'counter', self.profiles_written),
+        ) + tuple(extra_gauges)
+        for name, help_text, metric_type, value in gauges:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _component_gauges(app):
+    gauges = []
+    cache = app.extensions.get('task_cache')
+    if cache is not None:
+        stats = cache.stats()
+        for key in ('hits', 'misses', 'evictions'):
+            gauges.append((f'task_cache_{key}_total', f'Task cache {key}.', 'counter', stats.get(key, 0)))
+        if 'entries' in stats:
+            gauges.append(('task_cache_entries', 'Entries in the task cache.', 'gauge', stats['entries']))
+    audit = app.extensions.get('audit')
+    if audit is not None:
+        stats = audit.stats()
+        gauges.append(('audit_queue_depth', 'Audit events waiting to be written.', 'gauge', stats['queue_depth']))
+        gauges.append(('audit_dropped_total', 'Audit events dropped by backpressure.', 'counter', stats['dropped']))
+        gauges.append(('audit_sampled_out_total', 'Audit events shed by sampling.', 'counter',
+                       stats['sampled_out']))
+    return gauges
+
+
+# Bounds on the SQL logged with a slow request: distinct statements listed and
+# characters kept of each (multi-row INSERTs run to tens of kilobytes).
+SLOW_LOG_MAX_STATEMENTS = 20
+SLOW_LOG_MAX_STATEMENT_CHARS = 500
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['metrics_query_start'].pop()
+    state = g.get('_metrics') if has_app_context() else None
+    if state is None:
+        return
+    state['db_time'] += time.perf_counter() - started
+    state['statements'] += 1
+    if state['sql'] is not None:
+        state['sql'][statement] = state['sql'].get(statement, 0) + 1
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    connection = context.connection
+    if connection is not None and connection.info.get('metrics_query_start'):
+        connection.info['metrics_query_start'].pop()
+
+
+def _format_slow_sql(counts):
+    """Lists the distinct statements of a slow request, most frequent first, within the log bounds."""
+    lines = []
+    ranked = sorted(counts.items(), key=lambda item: -item[1])
+    for statement, count in ranked[:SLOW_LOG_MAX_STATEMENTS]:
+        if len(statement) > SLOW_LOG_MAX_STATEMENT_CHARS:
+            statement = statement[:SLOW_LOG_MAX_STATEMENT_CHARS] + '...'
+        lines.append(f"{count}x {statement}")
+    if len(ranked) > SLOW_LOG_MAX_STATEMENTS:
+        lines.append(f"... and {len(ranked) - SLOW_LOG_MAX_STATEMENTS} more distinct statements")
+    return '\n'.join(lines)
+
+
+def init_metrics(app):
+    """
+    Installs request timing, SQL instrumentation and the ``/metrics`` endpoint.
+
+    SQL is timed on the app's engine and on every shard engine.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        MetricsRegistry or None: The registry, or None when ``METRICS_ENABLED`` is off.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return None
+    registry = MetricsRegistry()
+    app.extensions['metrics'] = registry
+
+    with app.app_context():
+        engines = [db.engine]
+    shards = app.extensions.get('task_shards')
+    if shards is not None:
+        engines.extend(shards.engines)
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
+
+    @app.before_request
+    def _start_request_metrics():
+        slow_ms = current_app.config.get('METRICS_SLOW_REQUEST_MS')
+        g._metrics = {
+            'start': time.perf_counter(),
+            'db_time': 0.0,
+            'statements': 0,
+            'sql': {} if slow_ms else None,
+            'profiler': None,
+        }
+        sample_rate = current_app.config.get('METRICS_PROFILE_SAMPLE_RATE', 0.0)
+        if sample_rate and random.random() < sample_rate:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            g._metrics['profiler'] = profiler
+
+    @app.after_request
+    def _record_request_metrics(response):
+        state = g.pop('_metrics', None)
+        if state is None:
+            return response
+        duration = time.perf_counter() - state['start']
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        registry.record_request(request.method, route, response.status_code,
+                                duration, state['db_time'], state['statements'])
+
+        profiler = state['profiler']
+        if profiler is not None:
+            profiler.disable()
+            _dump_profile(profiler, route)
+            registry.increment('profiles_written')
+
+        slow_ms = current_app.config.get('METRICS_SLOW_REQUEST_MS')
+        if slow_ms and duration * 1000 >= slow_ms:
+            registry.increment('slow_requests')
+            # Statements only: bound parameters may carry task contents.
+            current_app.logger.warning(
+                "Slow request %s %s: %.1f ms, %d statements, %.1f ms in SQL\n%s",
+                request.method, route, duration * 1000, state['statements'], state['db_time'] * 1000,
+                _format_slow_sql(state['sql'] or {}))
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        """
+        Prometheus metrics endpoint.
+        """
+        body = registry.render(_component_gauges(current_app))
+        return Response(body, mimetype='text/plain; version=0.0.4')
+
+    return registry
+
+
+def _dump_profile(profiler, route):
+    directory = current_app.config.get('METRICS_PROFILE_DIR') or os.path.join(current_app.instance_path, 'profiles')
+    os.makedirs(directory, exist_ok=True)
+    slug = route.strip('/').replace('/', '_').replace('<', '').replace('>', '').replace(':', '-') or 'root'
+    filename = f"{time.time_ns()}-{request.method}-{slug}.prof"
+    profiler.dump_stats(os.path.join(directory, filename))
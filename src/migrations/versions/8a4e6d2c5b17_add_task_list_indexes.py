@@ -0,0 +1,38 @@
+"""add task list indexes
+
+Revision ID: 8a4e6d2c5b17
+Revises: 3f1c2a7b9d01
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6d2c5b17'
+down_revision = '3f1c2a7b9d01'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.create_index('ix_tasks_status_id', ['status', 'id'], unique=False)
+        batch_op.create_index('ix_tasks_status_due_date', ['status', 'due_date', 'id'], unique=False)
+        batch_op.create_index('ix_tasks_status_created_at', ['status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_tasks_status_updated_at', ['status', 'updated_at', 'id'], unique=False)
+        batch_op.create_index('ix_tasks_due_date', ['due_date', 'id'], unique=False)
+        batch_op.create_index('ix_tasks_created_at', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_tasks_updated_at', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_updated_at')
+        batch_op.drop_index('ix_tasks_created_at')
+        batch_op.drop_index('ix_tasks_due_date')
+        batch_op.drop_index('ix_tasks_status_updated_at')
+        batch_op.drop_index('ix_tasks_status_created_at')
+        batch_op.drop_index('ix_tasks_status_due_date')
+        batch_op.drop_index('ix_tasks_status_id')
@@ -0,0 +1,26 @@
+"""add task version
+
+Revision ID: a7d3e9b1c4f6
+Revises: f1a3c5e7b9d2
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9b1c4f6'
+down_revision = 'f1a3c5e7b9d2'
+branch_labels = None
+depends_on = None
+
+
+# Plain ALTER TABLE rather than batch mode: on SQLite a batch rebuild of
+# tasks would drop the search, change-feed and stats triggers.
+def upgrade():
+    op.add_column('tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('tasks', 'version')
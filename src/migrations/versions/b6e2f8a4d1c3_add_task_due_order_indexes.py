@@ -0,0 +1,33 @@
+"""add task due order indexes
+
+Revision ID: b6e2f8a4d1c3
+Revises: a7d3e9b1c4f6
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2f8a4d1c3'
+down_revision = 'a7d3e9b1c4f6'
+branch_labels = None
+depends_on = None
+
+# Must match models.due_date_order exactly, or SQLite will not use the indexes.
+DUE_DATE_ORDER = "coalesce(due_date, '9999-12-31 23:59:59.999999')"
+
+
+# Plain CREATE/DROP INDEX rather than batch mode: on SQLite a batch rebuild of
+# tasks would drop the search, change-feed and stats triggers.
+def upgrade():
+    op.create_index('ix_tasks_status_due_order', 'tasks', ['status', sa.text(DUE_DATE_ORDER), 'id'], unique=False)
+    op.create_index('ix_tasks_due_order', 'tasks', [sa.text(DUE_DATE_ORDER), 'id'], unique=False)
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
+
+
+def downgrade():
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date', 'id'], unique=False)
+    op.drop_index('ix_tasks_due_order', table_name='tasks')
+    op.drop_index('ix_tasks_status_due_order', table_name='tasks')
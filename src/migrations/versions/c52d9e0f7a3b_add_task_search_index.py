@@ -0,0 +1,55 @@
+"""add task full-text search index
+
+Revision ID: c52d9e0f7a3b
+Revises: 8a4e6d2c5b17
+Create Date: 2026-10-18 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52d9e0f7a3b'
+down_revision = '8a4e6d2c5b17'
+branch_labels = None
+depends_on = None
+
+FTS_TABLE = 'tasks_fts'
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON tasks BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON tasks BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF title, description ON tasks BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au")
+    op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad")
+    op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai")
+    op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
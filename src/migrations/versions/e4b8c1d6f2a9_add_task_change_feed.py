@@ -0,0 +1,60 @@
+"""add task change feed
+
+Revision ID: e4b8c1d6f2a9
+Revises: c52d9e0f7a3b
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8c1d6f2a9'
+down_revision = 'c52d9e0f7a3b'
+branch_labels = None
+depends_on = None
+
+NOW = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+def upgrade():
+    op.create_table('task_changes',
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=10), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('seq'),
+    sqlite_autoincrement=True
+    )
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE TRIGGER task_changes_ai AFTER INSERT ON tasks BEGIN "
+        f"INSERT INTO task_changes(task_id, op, changed_at) VALUES (new.id, 'insert', {NOW}); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_changes_au AFTER UPDATE ON tasks BEGIN "
+        f"INSERT INTO task_changes(task_id, op, changed_at) VALUES (new.id, 'update', {NOW}); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER task_changes_ad AFTER DELETE ON tasks BEGIN "
+        f"INSERT INTO task_changes(task_id, op, changed_at) VALUES (old.id, 'delete', {NOW}); "
+        "END"
+    )
+    # Existing tasks enter the feed as inserts, so a client syncing from an
+    # empty token receives every task.
+    op.execute(
+        "INSERT INTO task_changes(task_id, op, changed_at) "
+        f"SELECT id, 'insert', {NOW} FROM tasks ORDER BY id"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS task_changes_ad")
+        op.execute("DROP TRIGGER IF EXISTS task_changes_au")
+        op.execute("DROP TRIGGER IF EXISTS task_changes_ai")
+    op.drop_table('task_changes')
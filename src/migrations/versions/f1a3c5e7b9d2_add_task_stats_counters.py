@@ -0,0 +1,60 @@
+"""add task stats counters
+
+Revision ID: f1a3c5e7b9d2
+Revises: e4b8c1d6f2a9
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a3c5e7b9d2'
+down_revision = 'e4b8c1d6f2a9'
+branch_labels = None
+depends_on = None
+
+NEW_DAY = "COALESCE(date(new.due_date), '')"
+OLD_DAY = "COALESCE(date(old.due_date), '')"
+
+
+def increment(status, day):
+    return (f"INSERT INTO task_stats(status, due_day, count) VALUES ({status}, {day}, 1) "
+            "ON CONFLICT(status, due_day) DO UPDATE SET count = count + 1; ")
+
+
+def decrement(status, day):
+    return (f"UPDATE task_stats SET count = count - 1 WHERE status = {status} AND due_day = {day}; "
+            f"DELETE FROM task_stats WHERE status = {status} AND due_day = {day} AND count <= 0; ")
+
+
+def upgrade():
+    op.create_table('task_stats',
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('due_day', sa.String(length=10), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('status', 'due_day')
+    )
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("CREATE TRIGGER task_stats_ai AFTER INSERT ON tasks BEGIN "
+               + increment('new.status', NEW_DAY) + "END")
+    op.execute("CREATE TRIGGER task_stats_ad AFTER DELETE ON tasks BEGIN "
+               + decrement('old.status', OLD_DAY) + "END")
+    op.execute("CREATE TRIGGER task_stats_au AFTER UPDATE OF status, due_date ON tasks "
+               f"WHEN old.status IS NOT new.status OR {OLD_DAY} IS NOT {NEW_DAY} BEGIN "
+               + decrement('old.status', OLD_DAY) + increment('new.status', NEW_DAY) + "END")
+    op.execute(
+        "INSERT INTO task_stats(status, due_day, count) "
+        "SELECT status, COALESCE(date(due_date), ''), COUNT(*) FROM tasks "
+        "GROUP BY status, COALESCE(date(due_date), '')"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS task_stats_au")
+        op.execute("DROP TRIGGER IF EXISTS task_stats_ad")
+        op.execute("DROP TRIGGER IF EXISTS task_stats_ai")
+    op.drop_table('task_stats')
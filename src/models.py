@@ -18,9 +18,23 @@ class Task(db.Model):
     status = db.Column(db.String(20), nullable=False, default='pending')
     created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Bumped by every UPDATE (``version = version + 1``) and served as the
+    # task's ETag, so a PUT with If-Match is a single conditional UPDATE.
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     ALLOWED_STATUSES = {"pending", "in progress", "completed"}
 
+    # Composite indexes backing the list filters and sort orders planned in
+    # query_planner.py. The trailing id keeps keyset pagination index-ordered.
+    __table_args__ = (
+        db.Index('ix_tasks_status_id', 'status', 'id'),
+        db.Index('ix_tasks_status_due_date', 'status', 'due_date', 'id'),
+        db.Index('ix_tasks_status_created_at', 'status', 'created_at', 'id'),
+        db.Index('ix_tasks_status_updated_at', 'status', 'updated_at', 'id'),
+        db.Index('ix_tasks_created_at', 'created_at', 'id'),
+        db.Index('ix_tasks_updated_at', 'updated_at', 'id'),
+    )
+
     def __repr__(self):
         return f'<Task {self.id}: {self.title}>'
 
@@ -42,7 +56,8 @@ class Task(db.Model):
                 'due_date': self.due_date.isoformat() if self.due_date else None,
                 'status': self.status,
                 'created_at': self.created_at.isoformat(),
-                'updated_at': self.updated_at.isoformat()
+                'updated_at': self.updated_at.isoformat(),
+                'version': self.version
             }
         else: # For list view as per PRD FR-002
             data = {
@@ -72,3 +87,49 @@ class Task(db.Model):
     # FIX: Implement encryption for task descriptions at rest if they are deemed sensitive.
 
 
+# Where a task falls in a due-date ordering: tasks without a due date come
+# after every dated one. SQLite only serves a query from the expression
+# indexes below when the query repeats this exact expression, so the list
+# ORDER BY, ranges and cursors are all built from ``due_date_order``.
+NO_DUE_DATE = datetime.max
+due_date_order = db.func.coalesce(Task.__table__.c.due_date,
+                                  db.literal_column(f"'{NO_DUE_DATE.isoformat(' ')}'"))
+db.Index('ix_tasks_status_due_order', Task.__table__.c.status, due_date_order, Task.__table__.c.id)
+db.Index('ix_tasks_due_order', due_date_order, Task.__table__.c.id)
+
+
+class TaskChange(db.Model):
+    """
+    One row per write to ``tasks``, in commit order, for the change feed.
+
+    Rows are inserted by triggers on ``tasks`` (see changes.py), so bulk
+    statements are recorded too. ``seq`` uses AUTOINCREMENT so sequence numbers
+    are never reused, even after old changes are pruned.
+    """
+    __tablename__ = 'task_changes'
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    seq = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)  # 'insert', 'update' or 'delete'
+    changed_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<TaskChange {self.seq}: {self.op} {self.task_id}>'
+
+
+class TaskStat(db.Model):
+    """
+    Number of tasks per status and due day, kept current by triggers (see stats.py).
+
+    ``due_day`` is the UTC date of ``due_date`` as ``YYYY-MM-DD``, or an empty
+    string for tasks without a due date so it can be part of the primary key.
+    """
+    __tablename__ = 'task_stats'
+
+    status = db.Column(db.String(20), primary_key=True)
+    due_day = db.Column(db.String(10), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<TaskStat {self.status} {self.due_day or "-"}: {self.count}>'
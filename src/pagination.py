@@ -0,0 +1,155 @@
+import base64
+import binascii
+import json
+
+from .serializers import json_dumps
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(values):
+    """
+    Encodes the keyset values of the last row of a page into an opaque cursor.
+
+    Args:
+        values (list): JSON-serializable key values, e.g. ``[task_id]``.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor (str): The opaque cursor sent by the client.
+
+    Returns:
+        list: The keyset values stored in the cursor.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise InvalidCursor("Malformed cursor.")
+    if not isinstance(values, list) or not values:
+        raise InvalidCursor("Malformed cursor.")
+    return values
+
+
+def parse_limit(raw_limit, default, maximum):
+    """
+    Parses the ``limit`` query parameter.
+
+    Args:
+        raw_limit (str or None): The raw query parameter value.
+        default (int): The limit used when the parameter is missing.
+        maximum (int): The largest page size a client may request.
+
+    Returns:
+        int: The page size to use.
+
+    Raises:
+        ValueError: If the value is not an integer between 1 and ``maximum``.
+    """
+    if raw_limit is None:
+        return default
+    limit = int(raw_limit)
+    if limit < 1 or limit > maximum:
+        raise ValueError(f"limit must be between 1 and {maximum}.")
+    return limit
+
+
+def keyset_page(query, limit, make_cursor):
+    """
+    Fetches one page of an ordered query whose keyset filter is already applied.
+
+    One extra row is fetched to find out whether another page exists, so no
+    COUNT query or OFFSET scan is ever needed.
+
+    Args:
+        query: An ordered SQLAlchemy query starting just after the client's cursor.
+        limit (int): The page size.
+        make_cursor (callable): Builds the cursor pointing past a given row.
+
+    Returns:
+        tuple: The rows of the page and the cursor of the next page (or None).
+    """
+    return split_page(query.limit(limit + 1).all(), limit, make_cursor)
+
+
+def split_page(rows, limit, make_cursor):
+    """
+    Cuts up to ``limit + 1`` ordered rows into a page and the next page's cursor.
+
+    Args:
+        rows (list): The rows after the client's cursor, at most ``limit + 1``.
+        limit (int): The page size.
+        make_cursor (callable): Builds the cursor pointing past a given row.
+
+    Returns:
+        tuple: The rows of the page and the cursor of the next page (or None).
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, make_cursor(rows[-1])
+
+
+def iter_json_array(rows, serialize, chunk_size):
+    """
+    Yields a JSON array chunk by chunk.
+
+    Args:
+        rows (iterable): The rows to encode.
+        serialize (callable): Turns one row into a JSON-serializable object.
+        chunk_size (int): Number of rows encoded into each yielded chunk.
+
+    Yields:
+        bytes: Successive pieces of the JSON document.
+    """
+    yield b'['
+    buffer = []
+    first = True
+    for row in rows:
+        buffer.append(serialize(row))
+        if len(buffer) >= chunk_size:
+            # Encoding the whole chunk as one array and dropping its brackets
+            # costs one encoder call per chunk instead of one per row.
+            yield (b'' if first else b',') + json_dumps(buffer)[1:-1]
+            first = False
+            buffer = []
+    if buffer:
+        yield (b'' if first else b',') + json_dumps(buffer)[1:-1]
+    yield b']'
+
+
+def iter_ndjson(rows, serialize, chunk_size):
+    """
+    Yields newline-delimited JSON chunk by chunk.
+
+    Args:
+        rows (iterable): The rows to encode.
+        serialize (callable): Turns one row into a JSON-serializable object.
+        chunk_size (int): Number of rows encoded into each yielded chunk.
+
+    Yields:
+        bytes: Successive groups of JSON lines.
+    """
+    buffer = []
+    for row in rows:
+        buffer.append(json_dumps(serialize(row)))
+        if len(buffer) >= chunk_size:
+            yield b'\n'.join(buffer) + b'\n'
+            buffer = []
+    if buffer:
+        yield b'\n'.join(buffer) + b'\n'
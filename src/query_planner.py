@@ -0,0 +1,253 @@
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, or_, select
+
+from .models import NO_DUE_DATE, db, due_date_order, Task
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+
+# Due dates sort (and are ranged and paged) through ``due_date_order``, which
+# places tasks without a due date after every dated task.
+SORT_COLUMNS = {
+    'id': Task.id,
+    'due_date': due_date_order,
+    'created_at': Task.created_at,
+    'updated_at': Task.updated_at,
+}
+
+# query parameter -> (sort key of the column it restricts, comparison)
+RANGE_FILTERS = {
+    'due_after': ('due_date', '>='),
+    'due_before': ('due_date', '<'),
+    'created_after': ('created_at', '>='),
+    'created_before': ('created_at', '<'),
+    'updated_after': ('updated_at', '>='),
+    'updated_before': ('updated_at', '<'),
+}
+
+# When no explicit sort is requested, order by the first range-filtered column
+# so the range and the ORDER BY are served by the same index.
+DEFAULT_SORT_PRIORITY = ('due_date', 'created_at', 'updated_at')
+
+# (status filtered?, sort key) -> index that serves the plan
+PLAN_INDEXES = {
+    (True, 'id'): 'ix_tasks_status_id',
+    (True, 'due_date'): 'ix_tasks_status_due_order',
+    (True, 'created_at'): 'ix_tasks_status_created_at',
+    (True, 'updated_at'): 'ix_tasks_status_updated_at',
+    (False, 'id'): None,  # primary key
+    (False, 'due_date'): 'ix_tasks_due_order',
+    (False, 'created_at'): 'ix_tasks_created_at',
+    (False, 'updated_at'): 'ix_tasks_updated_at',
+}
+
+TaskListPlan = namedtuple('TaskListPlan', ['status', 'ranges', 'sort_key', 'descending', 'index_name'])
+
+
+def _parse_timestamp(name, raw):
+    try:
+        value = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Invalid {name} format. Use ISO 8601.")
+    if value.tzinfo is not None:
+        # Timestamps are stored as naive UTC.
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def plan_task_list(args, valid_statuses):
+    """
+    Turns the list endpoint's query parameters into an index-backed plan.
+
+    Args:
+        args (Mapping): The request query parameters.
+        valid_statuses (set): The statuses accepted by the ``status`` filter.
+
+    Returns:
+        TaskListPlan: The filters, sort order and the index expected to serve them.
+
+    Raises:
+        ValueError: If a filter or the sort parameter is invalid.
+    """
+    status = args.get('status') or None
+    if status is not None and status not in valid_statuses:
+        raise ValueError(f"Invalid status filter. Allowed: {', '.join(valid_statuses)}")
+
+    ranges = []
+    for name, (sort_key, op) in RANGE_FILTERS.items():
+        if args.get(name):
+            ranges.append((sort_key, op, _parse_timestamp(name, args[name])))
+
+    sort = args.get('sort')
+    if sort:
+        descending = sort.startswith('-')
+        sort_key = sort.lstrip('-')
+        if sort_key not in SORT_COLUMNS:
+            allowed = ', '.join(f"{key}, -{key}" for key in SORT_COLUMNS)
+            raise ValueError(f"Invalid sort. Allowed: {allowed}")
+    else:
+        descending = False
+        filtered = {key for key, _, _ in ranges}
+        sort_key = next((key for key in DEFAULT_SORT_PRIORITY if key in filtered), 'id')
+
+    return TaskListPlan(status, ranges, sort_key, descending, PLAN_INDEXES[(status is not None, sort_key)])
+
+
+def task_list_criteria(plan, after=None):
+    """
+    Returns the WHERE clauses and ORDER BY columns of a plan.
+
+    Sorting never filters: by ``due_date``, tasks without a due date come last
+    (first with ``-due_date``, the exact reverse), ordered by id. Only the
+    ``due_after`` / ``due_before`` ranges leave them out.
+
+    Args:
+        plan (TaskListPlan): The plan returned by :func:`plan_task_list`.
+        after (list, optional): Keyset values decoded from the client's cursor.
+
+    Returns:
+        tuple: The list of filter clauses and the list of ORDER BY columns.
+
+    Raises:
+        InvalidCursor: If ``after`` does not match the plan's sort order.
+    """
+    filters = []
+    if plan.status is not None:
+        filters.append(Task.status == plan.status)
+    for sort_key, op, value in plan.ranges:
+        column = SORT_COLUMNS[sort_key]
+        filters.append(column >= value if op == '>=' else column < value)
+        if sort_key == 'due_date' and op == '>=':
+            # A missing due date sorts after every date but is not one.
+            filters.append(Task.due_date.isnot(None))
+
+    sort_column = SORT_COLUMNS[plan.sort_key]
+
+    if after is not None:
+        filters.append(_keyset_condition(plan, after))
+
+    if plan.sort_key == 'id':
+        order = [Task.id.desc() if plan.descending else Task.id]
+    elif plan.descending:
+        order = [sort_column.desc(), Task.id.desc()]
+    else:
+        order = [sort_column, Task.id]
+    return filters, order
+
+
+def build_task_query(plan, after=None, columns=None):
+    """
+    Builds the ordered query for a plan, optionally starting after a cursor.
+
+    Args:
+        plan (TaskListPlan): The plan returned by :func:`plan_task_list`.
+        after (list, optional): Keyset values decoded from the client's cursor.
+        columns (list, optional): Entities to select instead of full Task rows.
+
+    Returns:
+        Query: The filtered and ordered query.
+
+    Raises:
+        InvalidCursor: If ``after`` does not match the plan's sort order.
+    """
+    filters, order = task_list_criteria(plan, after)
+    query = db.session.query(*columns) if columns else Task.query
+    return query.filter(*filters).order_by(*order)
+
+
+def build_task_select(plan, after=None, columns=None):
+    """
+    Builds the same statement as :func:`build_task_query` as a Core ``select``,
+    for sessions that are not the app's scoped session (e.g. async sessions).
+
+    Args:
+        plan (TaskListPlan): The plan returned by :func:`plan_task_list`.
+        after (list, optional): Keyset values decoded from the client's cursor.
+        columns (list, optional): Entities to select instead of full Task rows.
+
+    Returns:
+        Select: The filtered and ordered statement.
+
+    Raises:
+        InvalidCursor: If ``after`` does not match the plan's sort order.
+    """
+    filters, order = task_list_criteria(plan, after)
+    return select(*(columns or (Task,))).where(*filters).order_by(*order)
+
+
+def _keyset_condition(plan, after):
+    if plan.sort_key == 'id':
+        if len(after) != 1 or not isinstance(after[0], int):
+            raise InvalidCursor("Cursor does not match the sort order.")
+        return Task.id < after[0] if plan.descending else Task.id > after[0]
+
+    if len(after) != 2 or not isinstance(after[1], int):
+        raise InvalidCursor("Cursor does not match the sort order.")
+    if after[0] is None and plan.sort_key == 'due_date':
+        value = NO_DUE_DATE
+    elif isinstance(after[0], str):
+        try:
+            value = datetime.fromisoformat(after[0])
+        except ValueError:
+            raise InvalidCursor("Cursor does not match the sort order.")
+    else:
+        raise InvalidCursor("Cursor does not match the sort order.")
+    column = SORT_COLUMNS[plan.sort_key]
+    # The leading inequality lets the database seek straight to the cursor.
+    if plan.descending:
+        return and_(column <= value, or_(column < value, Task.id < after[1]))
+    return and_(column >= value, or_(column > value, Task.id > after[1]))
+
+
+def decode_plan_cursor(cursor):
+    """
+    Decodes the ``after`` parameter of the list endpoint.
+
+    Args:
+        cursor (str or None): The raw cursor.
+
+    Returns:
+        list or None: The keyset values, or None when no cursor was sent.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    return decode_cursor(cursor)
+
+
+def cursor_for(plan, row):
+    """
+    Builds the cursor pointing just past ``row`` in the plan's order.
+
+    Args:
+        plan (TaskListPlan): The plan the row was fetched with.
+        row: A Task (or row with the sort column and ``id``).
+
+    Returns:
+        str: The opaque cursor.
+    """
+    if plan.sort_key == 'id':
+        return encode_cursor([row.id])
+    value = getattr(row, plan.sort_key)
+    if value is None:
+        # Only due_date is nullable; the cursor continues among the undated tasks.
+        return encode_cursor([None, row.id])
+    return encode_cursor([value.replace(tzinfo=None).isoformat(), row.id])
+
+
+def explain_query_plan(query):
+    """
+    Returns SQLite's EXPLAIN QUERY PLAN output for a query.
+
+    Args:
+        query (Query or Select): The query to explain.
+
+    Returns:
+        list: The ``detail`` column of each plan step.
+    """
+    statement = getattr(query, 'statement', query)
+    sql = statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True})
+    result = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+    return [row[-1] for row in result]
@@ -0,0 +1,443 @@
+import heapq
+import json
+import logging
+import os
+import threading
+import urllib.request
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+from itertools import islice
+
+from flask import current_app, has_app_context
+from sqlalchemy import or_, select
+
+from .changes import ExpiredToken, decode_token, fetch_changes, is_change_feed_available, latest_change_sequence
+from .models import db, Task
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = 'completed'
+OPEN_STATUSES = tuple(sorted(Task.ALLOWED_STATUSES - {COMPLETED}))
+
+DueTask = namedtuple('DueTask', ['id', 'due_date'])
+
+
+def _utc_now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class DueTaskScheduler:
+    """
+    Keeps the soonest-due open tasks in a min-heap and fires handlers as they come due.
+
+    Only a window of at most ``max_pending`` tasks is held: the heap is
+    complete up to ``loaded_through`` (a ``(due_date, id)`` key), and the
+    next window is read from ``loader`` once it runs low, continuing after
+    that key. Changes apply incrementally through :meth:`task_changed`;
+    superseded heap entries are skipped when popped and compacted away, so
+    memory stays proportional to ``max_pending`` however many tasks exist.
+
+    Tasks that were already due when the scheduler started, or that are
+    moved into the past, are not fired.
+
+    Args:
+        loader (callable): ``loader(after, limit)`` yielding ``(task_id, due_date)``
+            for open tasks with ``(due_date, id) > after``, in that order, at most ``limit``.
+        handlers (iterable): Callables invoked with the list of :class:`DueTask`
+            that came due in one tick.
+        clock (callable): Returns the current naive UTC datetime.
+        max_pending (int): Most tasks held in memory.
+    """
+
+    def __init__(self, loader, handlers=(), clock=_utc_now, max_pending=10000):
+        if max_pending < 2:
+            raise ValueError("max_pending must be at least 2")
+        self.loader = loader
+        self.handlers = list(handlers)
+        self.clock = clock
+        self.max_pending = max_pending
+        self._lock = threading.RLock()
+        self._heap = []
+        self._due = {}  # task id -> due date of its live heap entry
+        self._loaded_through = None
+        self._exhausted = False
+        self._fired_through = None
+        self.fired = 0
+        self.loads = 0
+
+    def __len__(self):
+        return len(self._due)
+
+    @property
+    def heap_size(self):
+        """Heap entries, including superseded ones not yet compacted away."""
+        return len(self._heap)
+
+    def reload(self):
+        """Drops the in-memory window and reloads it from the current time."""
+        with self._lock:
+            now = self.clock()
+            self._heap = []
+            self._due = {}
+            self._fired_through = now
+            # Ids are positive, so (now, 0) sorts before every task due at `now`.
+            self._loaded_through = (now, 0)
+            self._exhausted = False
+            self._fill()
+
+    def task_changed(self, task_id, due_date, status):
+        """
+        Applies a created or updated task.
+
+        Args:
+            task_id (int): The task.
+            due_date (datetime or None): Its naive UTC due date.
+            status (str): Its status.
+        """
+        with self._lock:
+            if self._loaded_through is None:
+                return  # not loaded yet; reload() will read it
+            current = self._due.get(task_id)
+            if current is not None and current == due_date and status != COMPLETED:
+                return
+            if current is not None:
+                del self._due[task_id]
+            if status == COMPLETED or due_date is None or due_date <= self._fired_through:
+                self._compact_if_sparse()
+                return
+            # Beyond the loaded window the loader reads it when it gets there.
+            if self._exhausted or (due_date, task_id) <= self._loaded_through:
+                self._push(task_id, due_date)
+                if len(self._due) > self.max_pending:
+                    self._trim()
+            self._compact_if_sparse()
+
+    def task_deleted(self, task_id):
+        """Forgets a deleted task."""
+        with self._lock:
+            if self._due.pop(task_id, None) is not None:
+                self._compact_if_sparse()
+
+    def next_due(self):
+        """Returns the earliest pending due date, or None when nothing is scheduled."""
+        with self._lock:
+            self._drop_stale_head()
+            return self._heap[0][0] if self._heap else None
+
+    def tick(self, now=None):
+        """
+        Fires every task due at or before ``now`` and refills the window if it ran low.
+
+        Args:
+            now (datetime, optional): Naive UTC time; defaults to the clock.
+
+        Returns:
+            list: The :class:`DueTask` entries fired, in due order.
+        """
+        with self._lock:
+            if self._loaded_through is None:
+                self.reload()
+            now = self.clock() if now is None else now
+            due = []
+            while True:
+                while self._heap and self._heap[0][0] <= now:
+                    due_date, task_id = heapq.heappop(self._heap)
+                    if self._due.get(task_id) == due_date:
+                        del self._due[task_id]
+                        due.append(DueTask(task_id, due_date))
+                if self._exhausted or (len(self._due) > self.max_pending // 2 and self._loaded_through[0] > now):
+                    break
+                if not self._fill():
+                    break
+            self._fired_through = max(self._fired_through, now)
+            self.fired += len(due)
+        if due:
+            self._dispatch(due)
+        return due
+
+    def _push(self, task_id, due_date):
+        self._due[task_id] = due_date
+        heapq.heappush(self._heap, (due_date, task_id))
+
+    def _fill(self):
+        """Loads the next window; returns False if there was nothing to load."""
+        limit = self.max_pending - len(self._due)
+        if self._exhausted or limit <= 0:
+            return False
+        self.loads += 1
+        loaded = 0
+        for task_id, due_date in islice(self.loader(self._loaded_through, limit), limit):
+            loaded += 1
+            self._loaded_through = (due_date, task_id)
+            if task_id not in self._due:
+                self._push(task_id, due_date)
+        self._exhausted = loaded < limit
+        return loaded > 0
+
+    def _trim(self):
+        # Keep the soonest three quarters so a run of inserts does not trim on every one.
+        keep = heapq.nsmallest(self.max_pending * 3 // 4, self._due.items(), key=lambda item: (item[1], item[0]))
+        self._due = dict(keep)
+        self._heap = [(due_date, task_id) for task_id, due_date in keep]
+        heapq.heapify(self._heap)
+        last_id, last_due = keep[-1]
+        self._loaded_through = (last_due, last_id)
+        self._exhausted = False
+
+    def _compact_if_sparse(self):
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(due_date, task_id) for task_id, due_date in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def _drop_stale_head(self):
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _dispatch(self, due):
+        for handler in self.handlers:
+            try:
+                handler(due)
+            except Exception:
+                logger.exception("Reminder handler %r failed", handler)
+
+
+class LogSink:
+    """Logs one line per task that comes due."""
+
+    def __init__(self, log=None, level=logging.INFO):
+        self.log = log or logger
+        self.level = level
+
+    def __call__(self, due):
+        for task in due:
+            self.log.log(self.level, "Task %s is due (%s UTC)", task.id, task.due_date.isoformat())
+
+
+class WebhookStub:
+    """
+    Minimal webhook: one JSON POST per tick to ``url``, for a local receiver.
+
+    There are no retries or signatures. Payloads are also kept in
+    ``deliveries`` (most recent ``keep``), so it works without a receiver too.
+
+    Args:
+        url (str, optional): Where to POST; None only records the payloads.
+        timeout (float): Seconds to wait for the receiver.
+        keep (int): Payloads kept in ``deliveries``.
+    """
+
+    def __init__(self, url=None, timeout=2.0, keep=100):
+        self.url = url
+        self.timeout = timeout
+        self.deliveries = deque(maxlen=keep)
+
+    def __call__(self, due):
+        payload = {
+            'event': 'tasks.due',
+            'tasks': [{'id': task.id, 'due_date': task.due_date.isoformat()} for task in due],
+        }
+        self.deliveries.append(payload)
+        if self.url:
+            request = urllib.request.Request(self.url, data=json.dumps(payload).encode('utf-8'),
+                                             headers={'Content-Type': 'application/json'}, method='POST')
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+
+
+def pending_due_query(status, after, limit):
+    """
+    Selects open tasks of one status due after a ``(due_date, id)`` key.
+
+    A range scan on ``ix_tasks_status_due_date`` in index order.
+
+    Args:
+        status (str): The status.
+        after (tuple): The ``(due_date, id)`` key to continue after.
+        limit (int): Maximum rows.
+
+    Returns:
+        Select: ``(id, due_date)`` rows ordered by due date and id.
+    """
+    due_date, task_id = after
+    return (select(Task.id, Task.due_date)
+            .where(Task.status == status, Task.due_date >= due_date,
+                   or_(Task.due_date > due_date, Task.id > task_id))
+            .order_by(Task.due_date, Task.id)
+            .limit(limit))
+
+
+def load_pending_due(after, limit):
+    """
+    Loader for :class:`DueTaskScheduler` backed by the tasks table.
+
+    One indexed range query per open status, merged in due order, so
+    completed tasks are never read.
+    """
+    streams = [db.session.execute(pending_due_query(status, after, limit)).all() for status in OPEN_STATUSES]
+    return ((row.id, row.due_date) for row in heapq.merge(*streams, key=lambda row: (row.due_date, row.id)))
+
+
+def build_handlers(config):
+    """
+    Builds the handlers named in ``REMINDER_HANDLERS``.
+
+    Args:
+        config (dict): The app config.
+
+    Returns:
+        list: The handlers.
+
+    Raises:
+        ValueError: If a handler name is unknown.
+    """
+    handlers = []
+    for name in filter(None, (part.strip() for part in config.get('REMINDER_HANDLERS', 'log').split(','))):
+        if name == 'log':
+            handlers.append(LogSink())
+        elif name == 'webhook':
+            handlers.append(WebhookStub(config.get('REMINDER_WEBHOOK_URL'),
+                                        timeout=config.get('REMINDER_WEBHOOK_TIMEOUT', 2.0)))
+        else:
+            raise ValueError(f"Unknown reminder handler: {name}")
+    return handlers
+
+
+class ReminderService:
+    """
+    Runs a :class:`DueTaskScheduler` for an app on a background thread.
+
+    With the change feed (SQLite) the thread follows ``task_changes`` to apply
+    every write, bulk statements and other processes included; a commit in
+    this process wakes it immediately. Elsewhere the window is reloaded every
+    poll interval.
+
+    Args:
+        app (Flask): The application.
+        scheduler (DueTaskScheduler): The scheduler to drive.
+        poll_interval (float): Longest sleep between checks, in seconds.
+    """
+
+    def __init__(self, app, scheduler, poll_interval=30.0):
+        self.app = app
+        self.scheduler = scheduler
+        self.poll_interval = poll_interval
+        self._since = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Starts the thread unless it already runs in this process; a forked child starts its own."""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='task-reminders', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout=5.0):
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        self._pid = None
+        self._stop.set()
+        notifier = self.app.extensions.get('task_changes')
+        if notifier is not None:
+            notifier.notify()
+        thread.join(timeout)
+
+    def reload(self):
+        """Reloads the window and restarts change tracking from the newest change."""
+        if is_change_feed_available():
+            self._since = latest_change_sequence()
+        self.scheduler.reload()
+
+    def sync(self):
+        """Applies the changes recorded since the last sync, or reloads without a change feed."""
+        if self._since is None or not is_change_feed_available():
+            self.reload()
+            return
+        try:
+            while True:
+                result = fetch_changes(self._since, 1000)
+                for task in result['tasks']:
+                    due_date = datetime.fromisoformat(task['due_date']) if task['due_date'] else None
+                    self.scheduler.task_changed(task['id'], due_date, task['status'])
+                for task_id in result['deleted']:
+                    self.scheduler.task_deleted(task_id)
+                self._since = decode_token(result['next_token'])
+                if not result['has_more']:
+                    break
+        except ExpiredToken:
+            self.reload()
+
+    def run_once(self):
+        """Syncs and fires due tasks; returns the seconds until the next check."""
+        with self.app.app_context():
+            try:
+                self.sync()
+                self.scheduler.tick()
+            finally:
+                db.session.remove()
+        next_due = self.scheduler.next_due()
+        wait = self.poll_interval
+        if next_due is not None:
+            wait = min(wait, max((next_due - self.scheduler.clock()).total_seconds(), 0.0))
+        return wait
+
+    def _run(self):
+        notifier = self.app.extensions.get('task_changes')
+        while not self._stop.is_set():
+            generation = notifier.generation if notifier is not None else None
+            try:
+                wait = self.run_once()
+            except Exception:
+                logger.exception("Reminder scheduler pass failed")
+                wait = self.poll_interval
+            if notifier is not None:
+                notifier.wait(generation, wait)
+            else:
+                self._stop.wait(wait)
+
+
+def init_reminders(app):
+    """
+    Sets up the due-date reminder scheduler when ``REMINDERS_ENABLED`` is set.
+
+    The thread starts on the first request a process serves, so a pre-fork
+    parent (``gunicorn --preload``) that only builds the app runs none and the
+    worker serving requests runs its own. Every process that enables it fires
+    its own reminders, so enable it in one process only.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        ReminderService or None: The service, or None when disabled.
+
+    Raises:
+        ValueError: If tasks are sharded; the scheduler reads a single database.
+    """
+    if not app.config.get('REMINDERS_ENABLED'):
+        app.extensions['reminders'] = None
+        return None
+    if app.config.get('TASK_SHARDS'):
+        raise ValueError("Reminders are not available with sharded task storage (TASK_SHARDS)")
+    scheduler = DueTaskScheduler(load_pending_due, build_handlers(app.config),
+                                 max_pending=app.config.get('REMINDER_MAX_PENDING', 10000))
+    service = ReminderService(app, scheduler, poll_interval=app.config.get('REMINDER_POLL_INTERVAL', 30.0))
+    app.extensions['reminders'] = service
+    app.before_request(service.start)
+    return service
+
+
+def get_reminder_service():
+    """Returns the current app's reminder service, or None outside an app or when disabled."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('reminders')
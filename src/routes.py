@@ -1,7 +1,21 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from .models import db, Task
-from .utils import validate_data_payload, log_sensitive_action, isTaskTitleValid # Import the new util
-from datetime import datetime, timezone
+from .audit import get_audit_pipeline
+from .batch import create_tasks, delete_tasks, update_tasks
+from .cache import get_task_cache, invalidate_tasks
+from .changes import (
+    ExpiredToken, current_change_token, decode_token, fetch_changes, is_change_feed_available, wait_for_changes,
+)
+from .pagination import InvalidCursor, decode_cursor, iter_json_array, iter_ndjson, keyset_page, parse_limit, split_page
+from .query_planner import build_task_query, cursor_for, decode_plan_cursor, plan_task_list
+from .search import build_match_expression, is_search_available, search_tasks
+from .serializers import LIST_COLUMNS, fetch_task_detail, json_dumps, list_columns, list_item
+from .sharding import get_task_shards
+from .stats import read_task_stats
+from .schemas import error_summary, validate_task_create, validate_task_update
+from .utils import log_sensitive_action
+from .versioning import apply_versioned_update, format_etag, parse_if_match
+import time
 
 api_bp = Blueprint('api', __name__, url_prefix='/api/v1') 
 
@@ -9,6 +23,19 @@ MAX_TITLE_LENGTH = 120
 
 VALID_STATUSES = {"pending", "in progress", "completed"}
 
+STREAM_FORMATS = {
+    'json': (iter_json_array, 'application/json'),
+    'ndjson': (iter_ndjson, 'application/x-ndjson'),
+}
+
+# Sent with task lists: the change-feed token to follow after reading the list.
+CHANGE_TOKEN_HEADER = 'X-Change-Token'
+
+
+def _sharding_unsupported():
+    """The 501 response of endpoints that need every task in one database."""
+    return jsonify({"error": "Not available with sharded task storage"}), 501
+
 
 @api_bp.route('/tasks', methods=['POST'])
 def create_task():
@@ -17,14 +44,9 @@ def create_task():
     if not data:
         return jsonify({"error": "No input data provided"}), 400 
 
-    required = ['title']
-    optional = ['description', 'due_date']
-    is_valid, errors = validate_data_payload(data, required_fields=required, optional_fields=optional)
-    if not is_valid:
-        return jsonify({"error": "Invalid payload", "details": errors}), 400
-
-    if not isTaskTitleValid(data.get('title')): 
-        return jsonify({"error": "Title is invalid"}), 400
+    values, errors = validate_task_create(data)
+    if errors:
+        return jsonify({"error": error_summary(errors), "details": errors}), 400
 
     # SAARTHI-20250603131546: MEDIUM | COMPLIANCE
     # ISSUE: Ensure user_data does not contain sensitive information.
@@ -37,112 +59,406 @@ def create_task():
     # FIX: Sanitize user data before logging.
     log_sensitive_action("Attempting to create task", user_data=data)
 
-    due_date_str = data.get('due_date')
-    due_date_obj = None
-    if due_date_str:
+    shards = get_task_shards()
+    if shards is not None:
         try:
-            due_date_obj = datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
-            if due_date_obj.tzinfo is None: # Ensure timezone aware
-                 due_date_obj = due_date_obj.replace(tzinfo=timezone.utc)
-        except ValueError:
-            return jsonify({"error": "Invalid due_date format. Use ISO 8601."}), 400
-
-    new_task = Task(
-        title=data['title'],
-        description=data.get('description'),
-        due_date=due_date_obj 
-    ) 
+            task = shards.create(values)
+        except Exception as e:
+            current_app.logger.error(f"Error creating task: {e.__class__.__name__}")
+            return jsonify({"error": "Could not create task"}), 500
+        invalidate_tasks([task['id']])
+        return jsonify(task), 200
+
+    new_task = Task(**values)
     try:
         db.session.add(new_task)
         db.session.commit()
+        invalidate_tasks([new_task.id])
         return jsonify(new_task.to_dict(detailed=True)), 200
-    except Exception as e:          
+    except Exception as e:
         db.session.rollback()
-        print(f"Error creating task: {str(e)}")  
-        return jsonify({"error": "Could not create task", "details": str(e)}), 500
+        current_app.logger.error(f"Error creating task: {e.__class__.__name__}")
+        return jsonify({"error": "Could not create task"}), 500
 
 
 @api_bp.route('/tasks', methods=['GET'])
 def get_tasks():
-    status_filter = request.args.get('status')
-    query = Task.query
-    if status_filter:
-        if status_filter not in VALID_STATUSES:
-            return jsonify({"error": f"Invalid status filter. Allowed: {', '.join(VALID_STATUSES)}"}), 400
-        query = query.filter(Task.status == status_filter)
-    tasks = query.all()
-    return jsonify([task.to_dict(detailed=False) for task in tasks]), 200
+    try:
+        plan = plan_task_list(request.args, VALID_STATUSES)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    shards = get_task_shards()
+    stream_format = request.args.get('stream')
+    if stream_format and stream_format not in STREAM_FORMATS:
+        return jsonify({"error": f"Invalid stream format. Allowed: {', '.join(STREAM_FORMATS)}"}), 400
+    # Read before the rows, in the same transaction: a client that lists every
+    # task and then follows the change feed from here misses nothing.
+    headers = {}
+    if shards is None:
+        change_token = current_change_token()
+        if change_token is not None:
+            headers[CHANGE_TOKEN_HEADER] = change_token
+
+    if stream_format:
+        if shards is not None:
+            return _stream_rows(shards.stream_tasks(plan, LIST_COLUMNS, current_app.config['TASKS_STREAM_BATCH_SIZE']),
+                                stream_format)
+        response = _stream_tasks(build_task_query(plan, columns=LIST_COLUMNS), stream_format)
+        response.headers.update(headers)
+        return response
+
+    if 'limit' not in request.args and 'after' not in request.args:
+        if shards is not None:
+            rows = shards.list_tasks(plan, columns=LIST_COLUMNS)
+        else:
+            rows = build_task_query(plan, columns=LIST_COLUMNS).all()
+        return jsonify([list_item(row) for row in rows]), 200, headers
+
+    try:
+        limit = parse_limit(request.args.get('limit'),
+                            current_app.config['TASKS_PAGE_DEFAULT_LIMIT'],
+                            current_app.config['TASKS_PAGE_MAX_LIMIT'])
+    except ValueError as e:
+        return jsonify({"error": f"Invalid limit: {e}"}), 400
+
+    try:
+        after = decode_plan_cursor(request.args.get('after'))
+        if shards is not None:
+            # Scatter-gather: each shard's first limit + 1 rows cover the merged page.
+            rows, next_cursor = split_page(shards.list_tasks(plan, after, limit + 1, list_columns(plan.sort_key)),
+                                           limit, lambda row: cursor_for(plan, row))
+        else:
+            query = build_task_query(plan, after=after, columns=list_columns(plan.sort_key))
+            rows, next_cursor = keyset_page(query, limit, lambda row: cursor_for(plan, row))
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    return jsonify({
+        "tasks": [list_item(row) for row in rows],
+        "next_cursor": next_cursor
+    }), 200, headers
+
+
+def _stream_tasks(query, stream_format):
+    """
+    Streams every task matching ``query`` without materializing the result set.
+
+    Rows are pulled from the database in batches of ``TASKS_STREAM_BATCH_SIZE``
+    using ``yield_per`` and encoded as they arrive, so memory use is bounded by
+    the batch size instead of the table size.
+    """
+    return _stream_rows(query.yield_per(current_app.config['TASKS_STREAM_BATCH_SIZE']), stream_format)
+
+
+def _stream_rows(rows, stream_format):
+    encoder, mimetype = STREAM_FORMATS[stream_format]
+    body = encoder(rows, list_item, current_app.config['TASKS_STREAM_BATCH_SIZE'])
+    return Response(stream_with_context(body), mimetype=mimetype)
+
+
+
+@api_bp.route('/tasks/search', methods=['GET'])
+def search_tasks_endpoint():
+    if get_task_shards() is not None:
+        return _sharding_unsupported()
+    if not is_search_available():
+        return jsonify({"error": "Full-text search is not available on this database"}), 501
+
+    match = build_match_expression(request.args.get('q', ''))
+    if match is None:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'),
+                            current_app.config['TASKS_PAGE_DEFAULT_LIMIT'],
+                            current_app.config['TASKS_PAGE_MAX_LIMIT'])
+    except ValueError as e:
+        return jsonify({"error": f"Invalid limit: {e}"}), 400
+
+    after = None
+    if request.args.get('after'):
+        try:
+            after = decode_cursor(request.args['after'])
+        except InvalidCursor:
+            return jsonify({"error": "Invalid cursor"}), 400
+        if len(after) != 2 or not isinstance(after[0], (int, float)) or not isinstance(after[1], int):
+            return jsonify({"error": "Invalid cursor"}), 400
+
+    results, next_cursor = search_tasks(match, limit, after)
+    return jsonify({"tasks": results, "next_cursor": next_cursor}), 200
+
+
+@api_bp.route('/tasks/changes', methods=['GET'])
+def get_task_changes():
+    if get_task_shards() is not None:
+        return _sharding_unsupported()
+    if not is_change_feed_available():
+        return jsonify({"error": "The change feed is not available on this database"}), 501
+
+    try:
+        since = decode_token(request.args.get('since') or request.headers.get('Last-Event-ID'))
+    except InvalidCursor:
+        return jsonify({"error": "Invalid change token"}), 400
+
+    try:
+        limit = parse_limit(request.args.get('limit'),
+                            current_app.config['TASKS_PAGE_DEFAULT_LIMIT'],
+                            current_app.config['TASKS_PAGE_MAX_LIMIT'])
+    except ValueError as e:
+        return jsonify({"error": f"Invalid limit: {e}"}), 400
+
+    if request.args.get('stream') == 'sse' or request.accept_mimetypes.best == 'text/event-stream':
+        return _stream_changes(since, limit)
+
+    max_wait = current_app.config['CHANGES_MAX_WAIT']
+    try:
+        wait = float(request.args.get('wait', 0))
+    except ValueError:
+        return jsonify({"error": "Invalid wait"}), 400
+    if not 0 <= wait <= max_wait:
+        return jsonify({"error": f"wait must be between 0 and {max_wait} seconds"}), 400
+
+    try:
+        if wait:
+            result = wait_for_changes(since, limit, wait, current_app.config['CHANGES_POLL_INTERVAL'])
+        else:
+            result = fetch_changes(since, limit)
+    except ExpiredToken:
+        return _expired_token_response()
+    return jsonify(result), 200
+
+
+def _expired_token_response():
+    # The current head lets the client resync from the list without missing
+    # the writes made while it reads it.
+    return jsonify({"error": "Change token expired; resync from GET /api/v1/tasks",
+                    "resync_token": current_change_token()}), 410
+
+
+def _stream_changes(since, limit):
+    """
+    Streams change batches as Server-Sent Events.
 
+    Each event carries the same body as a long-poll response, and its ``id``
+    is the token to resume from, so a reconnecting EventSource resumes via
+    ``Last-Event-ID``. Comments are sent as keep-alives while nothing changes,
+    and the stream ends after ``CHANGES_SSE_MAX_SECONDS`` so the worker is
+    eventually freed; clients simply reconnect.
+    """
+    config = current_app.config
+    keepalive = config['CHANGES_SSE_KEEPALIVE']
+    poll_interval = config['CHANGES_POLL_INTERVAL']
+    deadline = time.monotonic() + config['CHANGES_SSE_MAX_SECONDS']
+
+    def events(since):
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                result = wait_for_changes(since, limit, min(keepalive, remaining), poll_interval)
+            except ExpiredToken:
+                yield b'event: expired\ndata: ' + json_dumps({'resync_token': current_change_token()}) + b'\n\n'
+                return
+            if result['tasks'] or result['deleted']:
+                since = decode_token(result['next_token'])
+                yield (b'id: ' + result['next_token'].encode('ascii') + b'\nevent: changes\ndata: '
+                       + json_dumps(result) + b'\n\n')
+            else:
+                yield b': keep-alive\n\n'
+
+    response = Response(stream_with_context(events(since)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api_bp.route('/tasks/stats', methods=['GET'])
+def get_task_stats():
+    if get_task_shards() is not None:
+        return _sharding_unsupported()
+    return jsonify(read_task_stats()), 200
 
 
 @api_bp.route('/tasks/<int:task_id>', methods=['GET'])
 def get_task(task_id):
-    task = Task.query.get(task_id) # Uses .get() which is good for PK lookups
-    if task is None:
-        return jsonify({"error": "Task not found"}), 404 # Good status code
-    return jsonify(task.to_dict(detailed=True)), 200
+    cache = get_task_cache()
+    entry = cache.get(task_id) if cache is not None else None
+    cache_status = 'HIT'
+    if entry is None:
+        cache_status = 'MISS'
+        generation = cache.generation(task_id) if cache is not None else None
+        shards = get_task_shards()
+        task = shards.get(task_id) if shards is not None else fetch_task_detail(task_id)
+        if task is None:
+            return jsonify({"error": "Task not found"}), 404 # Good status code
+        entry = (format_etag(task['version']), json_dumps(task))
+        if cache is not None:
+            cache.set(task_id, entry, generation)
+
+    etag, body = entry
+    response = Response(body, mimetype='application/json')
+    response.headers['ETag'] = etag
+    response.headers['X-Cache'] = cache_status
+    return response.make_conditional(request)
+
+
+@api_bp.route('/audit/stats', methods=['GET'])
+def get_audit_stats():
+    pipeline = get_audit_pipeline()
+    if pipeline is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify(dict(pipeline.stats(), enabled=True)), 200
+
+
+@api_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    cache = get_task_cache()
+    if cache is None:
+        return jsonify({"backend": None}), 200
+    return jsonify(cache.stats()), 200
 
 
 @api_bp.route('/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
-    task = Task.query.get(task_id)
-    if task is None:
-        return jsonify({"error": "Task not found"}), 404
+    """
+    Updates a task with one conditional UPDATE, without reading it first.
 
+    With ``If-Match`` the update only applies while the task still has one of
+    the given ETags; otherwise it answers 412 with the current ETag, so
+    concurrent editors cannot silently overwrite each other.
+    """
     data = request.get_json()
     if not data:
         return jsonify({"error": "No input data provided"}), 400
-    if 'title' in data:
-        if not isTaskTitleValid(data['title']): # Reusing util
-             return jsonify({"error": "Title is invalid"}), 400
-        task.title = data['title']
-
-    if 'description' in data:
-        # SAARTHI-20250603152728: MEDIUM | COMPLIANCE
-        # ISSUE: Missing input sanitization for task description.
-        # POLICY: OrgPolicy_compliance.md: Policy 2.1 - All inputs from external sources must be validated for type, length, format, and range.
-        # FIX: Sanitize the task description to prevent XSS and other injection attacks.
-        # SAARTHI-202506031553: MEDIUM | COMPLIANCE
-        # ISSUE: Missing input sanitization for task description.
-        # POLICY: OrgPolicy_compliance.md: Policy 2.1 - All inputs from external sources must be validated for type, length, format, and range.
-        # FIX: Sanitize the task description to prevent XSS and other injection attacks.
-        task.description = data['description']
-
-    if 'due_date' in data:
-        due_date_str = data.get('due_date')
-        if due_date_str is None: 
-            task.due_date = None
+    values, errors = validate_task_update(data)
+    if errors:
+        return jsonify({"error": error_summary(errors), "details": errors}), 400
+    versions = parse_if_match(request.headers.get('If-Match'))
+
+    # SAARTHI-20250603152728: MEDIUM | COMPLIANCE
+    # ISSUE: Missing input sanitization for task description.
+    # POLICY: OrgPolicy_compliance.md: Policy 2.1 - All inputs from external sources must be validated for type, length, format, and range.
+    # FIX: Sanitize the task description to prevent XSS and other injection attacks.
+    shards = get_task_shards()
+    try:
+        if shards is not None:
+            task, version = shards.update(task_id, values, versions)
         else:
-            try:
-                due_date_obj = datetime.fromisoformat(due_date_str.replace('Z', '+00:00'))
-                if due_date_obj.tzinfo is None:
-                    due_date_obj = due_date_obj.replace(tzinfo=timezone.utc)
-                task.due_date = due_date_obj
-            except ValueError:
-                return jsonify({"error": "Invalid due_date format. Use ISO 8601."}), 400
-
-    if 'status' in data:
-        if data['status'] not in VALID_STATUSES: 
-            return jsonify({"error": f"Invalid status. Allowed: {', '.join(VALID_STATUSES)}"}), 400
-        task.status = data['status']
+            task, version = apply_versioned_update(db.session, task_id, values, versions)
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error updating task {task_id}: {e.__class__.__name__}")
+        return jsonify({"error": "Could not update task"}), 500
+
+    if task is None and version is None:
+        return jsonify({"error": "Task not found"}), 404
+    if task is None:
+        response = jsonify({"error": "Task was modified by another request"})
+        response.headers['ETag'] = format_etag(version)
+        return response, 412
 
+    invalidate_tasks([task_id])
+    # SAARTHI-20250603131546: MEDIUM | COMPLIANCE
+    # ISSUE: Ensure user_data does not contain sensitive information.
+    # POLICY: OrgPolicy_compliance.md: Policy 1.5 - Do not log PII or sensitive data in plaintext.
+    # FIX: Sanitize user_data before logging.
+    # EFFORT: [30m]
+    # SAARTHI-202506031553: MEDIUM | COMPLIANCE
+    # ISSUE: Logging user data without sanitization could expose sensitive information.
+    # POLICY: OrgPolicy_compliance.md: Policy 1.5 - Do not log PII or sensitive data in plaintext.
+    # FIX: Sanitize user data before logging.
+    log_sensitive_action(f"Task {task_id} updated", user_data={'id': task_id, 'changes': data}) # Policy 1.5
+    response = jsonify(task)
+    response.headers['ETag'] = format_etag(version)
+    return response, 200
+
+
+@api_bp.route('/tasks/<int:task_id>', methods=['DELETE'])
+def delete_task(task_id):
+    shards = get_task_shards()
+    if shards is not None:
+        try:
+            deleted = shards.delete(task_id)
+        except Exception as e:
+            current_app.logger.error(f"Error deleting task {task_id}: {e.__class__.__name__}")
+            return jsonify({"error": "Could not delete task"}), 500
+        if not deleted:
+            return jsonify({"error": "Task not found"}), 404
+        invalidate_tasks([task_id])
+        log_sensitive_action(f"Task {task_id} deleted")
+        return '', 204
+
+    task = db.session.get(Task, task_id)
+    if task is None:
+        return jsonify({"error": "Task not found"}), 404
     try:
+        db.session.delete(task)
         db.session.commit()
-        # SAARTHI-20250603131546: MEDIUM | COMPLIANCE
-        # ISSUE: Ensure user_data does not contain sensitive information.
-        # POLICY: OrgPolicy_compliance.md: Policy 1.5 - Do not log PII or sensitive data in plaintext.
-        # FIX: Sanitize user_data before logging.
-        # EFFORT: [30m]
-        # SAARTHI-202506031553: MEDIUM | COMPLIANCE
-        # ISSUE: Logging user data without sanitization could expose sensitive information.
-        # POLICY: OrgPolicy_compliance.md: Policy 1.5 - Do not log PII or sensitive data in plaintext.
-        # FIX: Sanitize user data before logging.
-        log_sensitive_action(f"Task {task_id} updated", user_data={'id': task_id, 'changes': data}) # Policy 1.5
-        return jsonify(task.to_dict(detailed=True)), 200
-    except Exception as e:  
+        invalidate_tasks([task_id])
+        log_sensitive_action(f"Task {task_id} deleted")
+        return '', 204
+    except Exception as e:
         db.session.rollback()
-        print(f"Error updating task {task_id}: {str(e)}")  
-        return jsonify({"error": "Could not update task", "details": str(e)}), 500
+        current_app.logger.error(f"Error deleting task {task_id}: {e.__class__.__name__}")
+        return jsonify({"error": "Could not delete task"}), 500
+
+
+def _batch_items():
+    """
+    Reads the JSON array body of a batch request.
+
+    Returns:
+        tuple: The items and None, or None and an error response.
+    """
+    if get_task_shards() is not None:
+        return None, _sharding_unsupported()
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({"error": "Request body must be a non-empty JSON array"}), 400)
+    max_items = current_app.config['BATCH_MAX_ITEMS']
+    if len(items) > max_items:
+        return None, (jsonify({"error": f"A batch may contain at most {max_items} items"}), 400)
+    return items, None
+
+
+def _batch_response(results):
+    invalidate_tasks(result['id'] for result in results if result['status'] < 400)
+    failed = sum(1 for result in results if result['status'] >= 400)
+    return jsonify({"results": results, "succeeded": len(results) - failed, "failed": failed}), 200
+
+
+@api_bp.route('/tasks:batch', methods=['POST'])
+def create_tasks_batch():
+    items, error = _batch_items()
+    if error:
+        return error
+    results = create_tasks(items, current_app.config['BATCH_COMMIT_SIZE'])
+    log_sensitive_action(f"Batch create of {len(items)} tasks")
+    return _batch_response(results)
+
+
+@api_bp.route('/tasks:batch', methods=['PATCH'])
+def update_tasks_batch():
+    items, error = _batch_items()
+    if error:
+        return error
+    results = update_tasks(items, current_app.config['BATCH_COMMIT_SIZE'])
+    log_sensitive_action(f"Batch update of {len(items)} tasks")
+    return _batch_response(results)
+
+
+@api_bp.route('/tasks:batch', methods=['DELETE'])
+def delete_tasks_batch():
+    ids, error = _batch_items()
+    if error:
+        return error
+    results = delete_tasks(ids, current_app.config['BATCH_COMMIT_SIZE'])
+    log_sensitive_action(f"Batch delete of {len(ids)} tasks")
+    return _batch_response(results)
+
 
 def _internal_task_cleanup_logic(task_id):
     # SAARTHI-202506031553: LOW | CODE QUALITY
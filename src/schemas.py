@@ -0,0 +1,217 @@
+import sys
+from collections import namedtuple
+from datetime import datetime
+
+from .models import Task
+
+# Returned by a field check in place of a value the field rejects.
+INVALID = object()
+
+# Key of the error reported when the payload is not a JSON object at all.
+PAYLOAD_ERROR_KEY = 'payload'
+
+MAX_TITLE_LENGTH = Task.__table__.c.title.type.length
+
+_UNKNOWN_FIELD = "Field '{}' is not allowed."
+_MISSING_FIELD = "{} is required."
+
+Field = namedtuple('Field', ['name', 'check', 'message', 'required'])
+
+
+def string_field(name, required=False, nullable=False, max_length=None, message=None):
+    """
+    Declares a string field.
+
+    Args:
+        name (str): The payload key.
+        required (bool): Whether the key must be present.
+        nullable (bool): Whether ``null`` is accepted.
+        max_length (int, optional): Maximum length; a required field must also be non-empty.
+        message (str, optional): The error reported for a rejected value.
+
+    Returns:
+        Field: The field declaration.
+    """
+    # Pick the narrowest check for the options, so a plain string field costs
+    # one type test per request.
+    if max_length is None and not required:
+        def check(value):
+            if type(value) is str:
+                return value
+            return None if value is None and nullable else INVALID
+    else:
+        min_length = 1 if required else 0
+        limit = max_length if max_length is not None else sys.maxsize
+
+        def check(value):
+            if type(value) is str and min_length <= len(value) <= limit:
+                return value
+            return None if value is None and nullable else INVALID
+
+    return Field(name, check, message or f"{name} must be a string.", required)
+
+
+def datetime_field(name, required=False, nullable=True, message=None):
+    """
+    Declares an ISO 8601 timestamp field, normalized to naive UTC as stored.
+
+    ``null`` and the empty string clear the value when the field is nullable;
+    naive input is taken to be UTC.
+
+    Args:
+        name (str): The payload key.
+        required (bool): Whether the key must be present.
+        nullable (bool): Whether ``null`` and the empty string are accepted.
+        message (str, optional): The error reported for a rejected value.
+
+    Returns:
+        Field: The field declaration.
+    """
+    def check(value):
+        if type(value) is not str or not value:
+            return None if nullable and (value is None or value == '') else INVALID
+        try:
+            if value[-1] == 'Z':
+                # Already UTC: parse the naive part and skip the (slow)
+                # tzinfo round trip.
+                return datetime.fromisoformat(value[:-1])
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return INVALID
+        offset = parsed.utcoffset()
+        if offset is None:
+            return parsed
+        return datetime(parsed.year, parsed.month, parsed.day, parsed.hour, parsed.minute, parsed.second,
+                        parsed.microsecond) - offset
+
+    return Field(name, check, message or f"Invalid {name} format. Use ISO 8601.", required)
+
+
+def choice_field(name, choices, required=False):
+    """
+    Declares a field restricted to a fixed set of strings.
+
+    Args:
+        name (str): The payload key.
+        choices (iterable): The accepted values.
+        required (bool): Whether the key must be present.
+
+    Returns:
+        Field: The field declaration.
+    """
+    allowed = frozenset(choices)
+
+    def check(value):
+        return value if type(value) is str and value in allowed else INVALID
+
+    return Field(name, check, f"Invalid {name}. Allowed: {', '.join(sorted(allowed))}", required)
+
+
+def id_field(name, required=True):
+    """
+    Declares a positive integer identifier field (booleans are rejected).
+
+    Args:
+        name (str): The payload key.
+        required (bool): Whether the key must be present.
+
+    Returns:
+        Field: The field declaration.
+    """
+    def check(value):
+        return value if type(value) is int and value > 0 else INVALID
+
+    return Field(name, check, f"{name} must be a positive integer", required)
+
+
+def compile_schema(*fields):
+    """
+    Compiles field declarations into a validator closure.
+
+    Everything that does not depend on the payload (the lookup table, the
+    required keys, the error messages) is built here, once, so validating a
+    request is a single pass over its keys.
+
+    Args:
+        *fields (Field): The accepted fields.
+
+    Returns:
+        callable: ``validate(data)`` returning ``(values, None)`` with the
+        checked and normalized values of the keys present, or
+        ``(None, errors)`` with a message for every rejected, unknown or
+        missing key.
+    """
+    checks = {field.name: field.check for field in fields}
+    messages = {field.name: field.message for field in fields}
+    required = frozenset(field.name for field in fields if field.required)
+
+    def validate(data):
+        if type(data) is not dict:
+            return None, {PAYLOAD_ERROR_KEY: "Payload must be a JSON object."}
+        values = {}
+        errors = None
+        for key, value in data.items():
+            check = checks.get(key)
+            if check is None:
+                if errors is None:
+                    errors = {}
+                errors[key] = _UNKNOWN_FIELD.format(key)
+            elif (value := check(value)) is INVALID:
+                if errors is None:
+                    errors = {}
+                errors[key] = messages[key]
+            else:
+                values[key] = value
+        if not required <= data.keys():
+            if errors is None:
+                errors = {}
+            for name in required - data.keys():
+                errors[name] = _MISSING_FIELD.format(name)
+        if errors is not None:
+            return None, errors
+        return values, None
+
+    return validate
+
+
+def error_summary(errors):
+    """
+    Picks the top-level message for a validator's errors.
+
+    A single field error keeps its own message; anything else is reported as
+    an invalid payload, with every error in the details.
+
+    Args:
+        errors (dict): The errors returned by a validator.
+
+    Returns:
+        str: The message for the response's ``error`` key.
+    """
+    if len(errors) == 1:
+        (key, message), = errors.items()
+        if message not in (_UNKNOWN_FIELD.format(key), _MISSING_FIELD.format(key)):
+            return message
+    return "Invalid payload"
+
+
+_TITLE = string_field('title', required=True, max_length=MAX_TITLE_LENGTH, message="Title is invalid")
+_DESCRIPTION = string_field('description', nullable=True)
+_DUE_DATE = datetime_field('due_date')
+_STATUS = choice_field('status', Task.ALLOWED_STATUSES)
+
+# POST /tasks and each item of POST /tasks:batch.
+validate_task_create = compile_schema(_TITLE, _DESCRIPTION, _DUE_DATE)
+
+# PUT /tasks/<id>; the title may be omitted but not emptied.
+validate_task_update = compile_schema(_TITLE._replace(required=False), _DESCRIPTION, _DUE_DATE, _STATUS)
+
+# Each item of PATCH /tasks:batch.
+validate_batch_update = compile_schema(id_field('id'), _TITLE._replace(required=False), _DESCRIPTION, _DUE_DATE,
+                                       _STATUS)
+
+# Each record of a `flask tasks import` file: a whole row, as exported. Files
+# written before tasks had a version import at version 1.
+validate_task_import = compile_schema(id_field('id'), _TITLE, _DESCRIPTION, _DUE_DATE, _STATUS._replace(required=True),
+                                      datetime_field('created_at', required=True, nullable=False),
+                                      datetime_field('updated_at', required=True, nullable=False),
+                                      id_field('version', required=False))
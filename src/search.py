@@ -0,0 +1,143 @@
+from sqlalchemy import DDL, event, text
+
+from .models import db, Task
+from .pagination import encode_cursor
+
+FTS_TABLE = 'tasks_fts'
+
+# External-content FTS5 index over tasks.title/description. The index stores
+# only the tokenized terms; the text itself is read back from `tasks`. The
+# triggers keep it in step with every write, including bulk statements that
+# bypass the ORM.
+FTS_CREATE_STATEMENTS = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); "
+    "END",
+)
+
+FTS_DROP_STATEMENTS = (
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+
+for _statement in FTS_CREATE_STATEMENTS:
+    event.listen(Task.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in FTS_DROP_STATEMENTS:
+    event.listen(Task.__table__, 'before_drop', DDL(_statement).execute_if(dialect='sqlite'))
+
+# Title matches weigh more than description matches in the bm25 score. The
+# page is ranked and limited on rowids first; snippet(), which reads the
+# text back from tasks, then runs only for the rows returned.
+SEARCH_SQL = f"""
+WITH ranked AS MATERIALIZED (
+    SELECT id, score FROM (
+        SELECT rowid AS id, bm25({FTS_TABLE}, 10.0, 1.0) AS score
+        FROM {FTS_TABLE}
+        WHERE {FTS_TABLE} MATCH :match
+    )
+    {{keyset}}
+    ORDER BY score, id
+    LIMIT :limit
+)
+SELECT ranked.id AS id, tasks.title AS title, tasks.status AS status,
+       snippet({FTS_TABLE}, -1, '[', ']', '...', 12) AS snippet, ranked.score AS score
+FROM ranked
+CROSS JOIN {FTS_TABLE} ON {FTS_TABLE}.rowid = ranked.id
+CROSS JOIN tasks ON tasks.id = ranked.id
+WHERE {FTS_TABLE} MATCH :match
+ORDER BY ranked.score, ranked.id
+"""
+
+
+def include_schema_name(name, type_, parent_names):
+    """
+    Alembic ``include_name`` hook that hides the FTS5 table and its shadow
+    tables from autogenerate, which would otherwise try to drop them.
+    """
+    if type_ == 'table' and name and name.startswith(FTS_TABLE):
+        return False
+    return True
+
+
+def is_search_available():
+    """Returns True when the bound database supports the FTS5 index."""
+    return db.engine.dialect.name == 'sqlite'
+
+
+def build_match_expression(query):
+    """
+    Turns free text into an FTS5 MATCH expression.
+
+    Every whitespace-separated term is quoted so user input can never be parsed
+    as FTS5 query syntax; a trailing ``*`` is kept as a prefix search.
+
+    Args:
+        query (str): The text typed by the user.
+
+    Returns:
+        str or None: The MATCH expression, or None if the query has no terms.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith('*')
+        term = term.rstrip('*')
+        if not term:
+            continue
+        quoted = '"' + term.replace('"', '""') + '"'
+        terms.append(quoted + '*' if prefix else quoted)
+    return ' '.join(terms) or None
+
+
+def search_tasks(match, limit, after=None):
+    """
+    Runs a ranked full-text search.
+
+    Args:
+        match (str): An expression from :func:`build_match_expression`.
+        limit (int): The page size.
+        after (list, optional): ``[score, id]`` of the last result of the previous page.
+
+    Returns:
+        tuple: A list of result dicts and the cursor of the next page (or None).
+    """
+    params = {'match': match, 'limit': limit + 1}
+    keyset = ''
+    if after is not None:
+        keyset = 'WHERE score > :score OR (score = :score AND id > :last_id)'
+        params.update(score=after[0], last_id=after[1])
+    rows = db.session.execute(text(SEARCH_SQL.format(keyset=keyset)), params).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].score, rows[-1].id])
+    results = [{'id': row.id, 'title': row.title, 'status': row.status,
+                'snippet': row.snippet, 'score': row.score} for row in rows]
+    return results, next_cursor
+
+
+def rebuild_search_index():
+    """
+    Creates the FTS5 index if it is missing and rebuilds it from the tasks table.
+
+    Returns:
+        int: The number of tasks indexed.
+    """
+    with db.engine.begin() as connection:
+        for statement in FTS_CREATE_STATEMENTS:
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        return connection.exec_driver_sql("SELECT COUNT(*) FROM tasks").scalar()
@@ -0,0 +1,201 @@
+import json
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import String, select, type_coerce
+
+from .models import db, Task
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+JSON_BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Columns of the list view (PRD FR-002), fetched as plain tuples.
+LIST_COLUMNS = (Task.id, Task.title, Task.status)
+
+# Detail columns with the timestamps read back as the strings SQLite stores,
+# so they never round-trip through datetime objects. Other drivers still
+# return datetimes; detail_item accepts both.
+DETAIL_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    type_coerce(Task.due_date, String).label('due_date'),
+    Task.status,
+    type_coerce(Task.created_at, String).label('created_at'),
+    type_coerce(Task.updated_at, String).label('updated_at'),
+    Task.version,
+)
+
+
+def detail_columns(dialect_name):
+    """
+    Returns the columns to select for :func:`detail_item` on a database.
+
+    SQLite gets :data:`DETAIL_COLUMNS`, which read the stored timestamp
+    strings as they are; other databases select the table's own columns, so
+    their drivers return ``datetime`` objects through the DateTime type.
+
+    Args:
+        dialect_name (str): The SQLAlchemy dialect name, e.g. ``sqlite``.
+
+    Returns:
+        tuple: Columns in the order :func:`detail_item` expects.
+    """
+    if dialect_name == 'sqlite':
+        return DETAIL_COLUMNS
+    return tuple(Task.__table__.c)
+
+
+def _default(obj):
+    # orjson handles datetime, date, UUID and dataclasses natively; anything
+    # else goes through Flask's rules (Decimal, __html__, ...).
+    return DefaultJSONProvider.default(obj)
+
+
+def json_dumps(obj):
+    """
+    Encodes an object to compact JSON bytes with the fastest available backend.
+
+    Args:
+        obj: A JSON-serializable object.
+
+    Returns:
+        bytes: The encoded document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def json_loads(data):
+    """
+    Decodes a JSON document with the fastest available backend.
+
+    Args:
+        data (bytes or str): The document.
+
+    Returns:
+        The decoded object.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes with orjson when it is installed.
+
+    Keys are emitted in insertion order rather than sorted, which is part of
+    what makes the encoding cheap. Debug mode keeps the stdlib's indented output.
+    """
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if orjson is None or self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(json_dumps(obj), mimetype=self.mimetype)
+
+
+def format_db_datetime(value):
+    """
+    Formats a stored timestamp the way ``datetime.isoformat`` would.
+
+    SQLAlchemy stores DateTime values in SQLite as ``YYYY-MM-DD HH:MM:SS.ffffff``;
+    turning that string into ISO 8601 is a couple of string operations instead
+    of a parse plus a format. Other databases' drivers return ``datetime``
+    objects even through :data:`DETAIL_COLUMNS`, and those are formatted as is.
+
+    Args:
+        value (str, datetime or None): The stored timestamp.
+
+    Returns:
+        str or None: The ISO 8601 representation.
+    """
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        return value.isoformat()
+    if value.endswith('.000000'):
+        value = value[:-7]
+    return value.replace(' ', 'T', 1)
+
+
+def list_item(row):
+    """
+    Serializes an ``(id, title, status)`` row for the list view.
+
+    Args:
+        row (tuple): A row selected with :data:`LIST_COLUMNS`.
+
+    Returns:
+        dict: The list view representation.
+    """
+    return {'id': row[0], 'title': row[1], 'status': row[2]}
+
+
+def list_columns(sort_key='id'):
+    """
+    Returns the columns to select for a list view ordered by ``sort_key``.
+
+    The sort column is added when it is not already selected so that keyset
+    cursors can be built from the tuple rows.
+    """
+    if sort_key == 'id':
+        return LIST_COLUMNS
+    return LIST_COLUMNS + (getattr(Task, sort_key),)
+
+
+def fetch_task_detail(task_id):
+    """
+    Loads one task as a detail dict without hydrating an ORM object.
+
+    Args:
+        task_id (int): The task ID.
+
+    Returns:
+        dict or None: The same shape as ``Task.to_dict(detailed=True)``, or None if missing.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        task = db.session.get(Task, task_id)
+        return task.to_dict(detailed=True) if task is not None else None
+    row = db.session.execute(select(*DETAIL_COLUMNS).where(Task.id == task_id)).first()
+    if row is None:
+        return None
+    return detail_item(row)
+
+
+def detail_item(row):
+    """
+    Serializes a row selected with :data:`DETAIL_COLUMNS` for the detail view.
+
+    Args:
+        row (tuple): The task's detail columns.
+
+    Returns:
+        dict: The same shape as ``Task.to_dict(detailed=True)``.
+    """
+    return {
+        'id': row[0],
+        'title': row[1],
+        'description': row[2],
+        'due_date': format_db_datetime(row[3]),
+        'status': row[4],
+        'created_at': format_db_datetime(row[5]),
+        'updated_at': format_db_datetime(row[6]),
+        'version': row[7],
+    }
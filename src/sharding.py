@@ -0,0 +1,247 @@
+import heapq
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import count, islice
+
+from flask import current_app, has_app_context
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.engine import make_url
+
+from .engine import tune_engine
+from .models import NO_DUE_DATE, db, Task
+from .query_planner import build_task_select
+from .serializers import DETAIL_COLUMNS, detail_item
+from .versioning import apply_versioned_update
+
+
+def shard_for(task_id, shard_count):
+    """
+    Returns the index of the shard that owns a task.
+
+    Shard ``k`` hands out the ids ``k + 1``, ``k + 1 + n``, ``k + 1 + 2n``...,
+    so this is where the allocator put the task.
+
+    Args:
+        task_id (int): The task ID.
+        shard_count (int): Number of shards.
+
+    Returns:
+        int: The shard index.
+    """
+    return (task_id - 1) % shard_count
+
+
+def _sort_key(plan):
+    if plan.sort_key == 'id':
+        return lambda row: row.id
+    if plan.sort_key == 'due_date':
+        # Same order as models.due_date_order: undated tasks last.
+        return lambda row: (row.due_date or NO_DUE_DATE, row.id)
+    return lambda row: (getattr(row, plan.sort_key), row.id)
+
+
+class TaskShards:
+    """
+    Task storage spread over several databases by task ID.
+
+    Every shard holds the full schema (tasks with its triggers and derived
+    tables) for the tasks it owns. A new task goes to the next shard in turn,
+    which allocates an id it owns inside the INSERT itself, so shards never
+    coordinate and each has its own write lock. Reads and writes of one task
+    go straight to its shard; lists query every shard in parallel and merge
+    the ordered results.
+
+    The shard count is fixed once data exists: changing it moves the owner of
+    almost every id.
+
+    Args:
+        uris (list): Database URIs, one per shard, in a fixed order.
+        engine_options (dict, optional): Keyword arguments for ``create_engine``.
+
+    Raises:
+        ValueError: If no URI is given or a URI is an in-memory SQLite database.
+    """
+
+    def __init__(self, uris, engine_options=None):
+        if not uris:
+            raise ValueError("At least one shard URI is required")
+        self.engines = []
+        for uri in uris:
+            url = make_url(uri)
+            if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+                raise ValueError("Shards must be database files, not in-memory SQLite")
+            self.engines.append(create_engine(url, **(engine_options or {})))
+        self._next_shard = count(random.randrange(len(self.engines)))
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.engines)
+
+    def engine_for(self, task_id):
+        """Returns the engine of the shard that owns ``task_id``."""
+        return self.engines[shard_for(task_id, len(self.engines))]
+
+    def create_all(self):
+        """Creates the schema on every shard."""
+        for engine in self.engines:
+            db.metadata.create_all(engine)
+
+    def drop_all(self):
+        """Drops the schema on every shard."""
+        for engine in self.engines:
+            db.metadata.drop_all(engine)
+
+    def create(self, values):
+        """
+        Inserts a task on the next shard in turn.
+
+        Args:
+            values (dict): Validated column values.
+
+        Returns:
+            dict: The new task, shaped like ``Task.to_dict(detailed=True)``.
+        """
+        index = next(self._next_shard) % len(self.engines)
+        shard_count = len(self.engines)
+        # The highest id on this shard plus the shard count is the next id it
+        # owns; evaluated under the shard's write lock, so it cannot race.
+        next_id = select(func.coalesce(func.max(Task.id), index + 1 - shard_count) + shard_count).scalar_subquery()
+        statement = insert(Task.__table__).values(id=next_id, **values).returning(*DETAIL_COLUMNS)
+        with self.engines[index].begin() as connection:
+            return detail_item(connection.execute(statement).one())
+
+    def get(self, task_id):
+        """Returns a task's detail dict, or None if it does not exist."""
+        with self.engine_for(task_id).connect() as connection:
+            row = connection.execute(select(*DETAIL_COLUMNS).where(Task.id == task_id)).first()
+        return detail_item(row) if row is not None else None
+
+    def update(self, task_id, values, versions=None):
+        """
+        Updates a task in one conditional UPDATE ... RETURNING on its shard.
+
+        Args:
+            task_id (int): The task ID.
+            values (dict): Validated column values to set.
+            versions (frozenset, optional): Versions the client expects; see
+                :func:`versioning.parse_if_match`.
+
+        Returns:
+            tuple: ``(task, version)`` as returned by ``apply_versioned_update``.
+        """
+        with self.engine_for(task_id).begin() as connection:
+            return apply_versioned_update(connection, task_id, values, versions)
+
+    def delete(self, task_id):
+        """Deletes a task; returns False if it did not exist."""
+        with self.engine_for(task_id).begin() as connection:
+            return connection.execute(delete(Task.__table__).where(Task.id == task_id)).rowcount > 0
+
+    def list_tasks(self, plan, after=None, limit=None, columns=None):
+        """
+        Lists tasks from every shard in the plan's order (scatter-gather).
+
+        Each shard runs the same index-backed query, limited to ``limit`` rows,
+        on a worker thread; the sorted results are merged and cut to ``limit``.
+
+        Args:
+            plan (TaskListPlan): The plan returned by ``plan_task_list``.
+            after (list, optional): Keyset values decoded from the client's cursor.
+            limit (int, optional): Most rows to return; None returns them all.
+            columns (list, optional): Columns to select.
+
+        Returns:
+            list: The rows.
+
+        Raises:
+            InvalidCursor: If ``after`` does not match the plan's sort order.
+        """
+        statement = build_task_select(plan, after, columns)
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        def fetch(engine):
+            with engine.connect() as connection:
+                return connection.execute(statement).all()
+
+        results = list(self._pool().map(fetch, self.engines))
+        merged = heapq.merge(*results, key=_sort_key(plan), reverse=plan.descending)
+        return list(islice(merged, limit))
+
+    def stream_tasks(self, plan, columns=None, batch_size=1000):
+        """
+        Yields every task matching a plan in order, merging one cursor per shard.
+
+        Each shard's rows are read with ``yield_per``, so memory is bounded by
+        ``batch_size`` rows per shard.
+
+        Args:
+            plan (TaskListPlan): The plan returned by ``plan_task_list``.
+            columns (list, optional): Columns to select.
+            batch_size (int): Rows fetched from each shard at a time.
+
+        Yields:
+            Row: The merged rows.
+        """
+        statement = build_task_select(plan, columns=columns)
+        with ExitStack() as stack:
+            streams = [stack.enter_context(engine.connect()).execution_options(yield_per=batch_size)
+                       .execute(statement) for engine in self.engines]
+            yield from heapq.merge(*streams, key=_sort_key(plan), reverse=plan.descending)
+
+    def _pool(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(self.engines),
+                                                    thread_name_prefix='task-shards')
+            return self._executor
+
+    def reset_after_fork(self):
+        """Drops connections and worker threads inherited from the parent process."""
+        for engine in self.engines:
+            engine.dispose(close=False)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def dispose(self):
+        """Closes every shard's connections and stops the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        for engine in self.engines:
+            engine.dispose()
+
+
+def init_task_shards(app):
+    """
+    Sets up sharded task storage when ``TASK_SHARDS`` lists shard URIs.
+
+    Shard engines are built with the app database's ``SQLALCHEMY_ENGINE_OPTIONS``
+    (pool sizing, recycling, pre-ping) and get the same ``SQLITE_PRAGMAS``
+    hook; :func:`~.metrics.init_metrics` instruments them too.
+
+    Args:
+        app (Flask): The application.
+
+    Returns:
+        TaskShards or None: The shards, or None when tasks live in the app's database.
+    """
+    uris = app.config.get('TASK_SHARDS')
+    if not uris:
+        app.extensions['task_shards'] = None
+        return None
+    shards = TaskShards(uris, engine_options=app.config.get('SQLALCHEMY_ENGINE_OPTIONS'))
+    for engine in shards.engines:
+        tune_engine(app, engine)
+    app.extensions['task_shards'] = shards
+    return shards
+
+
+def get_task_shards():
+    """Returns the current app's shards, or None outside an app or when sharding is off."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('task_shards')
@@ -0,0 +1,167 @@
+from datetime import datetime, time, timezone
+
+from sqlalchemy import DDL, event, func, insert, select
+
+from .models import db, Task, TaskStat
+
+STATS_TABLE = TaskStat.__tablename__
+COMPLETED = 'completed'
+
+_NEW_DAY = "COALESCE(date(new.due_date), '')"
+_OLD_DAY = "COALESCE(date(old.due_date), '')"
+
+
+def _increment(status, day):
+    return (f"INSERT INTO {STATS_TABLE}(status, due_day, count) VALUES ({status}, {day}, 1) "
+            "ON CONFLICT(status, due_day) DO UPDATE SET count = count + 1; ")
+
+
+def _decrement(status, day):
+    return (f"UPDATE {STATS_TABLE} SET count = count - 1 WHERE status = {status} AND due_day = {day}; "
+            f"DELETE FROM {STATS_TABLE} WHERE status = {status} AND due_day = {day} AND count <= 0; ")
+
+
+# The counters move inside the writing transaction, so they commit or roll
+# back together with the task rows, bulk statements included.
+STATS_CREATE_STATEMENTS = (
+    f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_ai AFTER INSERT ON tasks BEGIN "
+    + _increment('new.status', _NEW_DAY) + "END",
+    f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_ad AFTER DELETE ON tasks BEGIN "
+    + _decrement('old.status', _OLD_DAY) + "END",
+    f"CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_au AFTER UPDATE OF status, due_date ON tasks "
+    f"WHEN old.status IS NOT new.status OR {_OLD_DAY} IS NOT {_NEW_DAY} BEGIN "
+    + _decrement('old.status', _OLD_DAY) + _increment('new.status', _NEW_DAY) + "END",
+)
+
+STATS_DROP_STATEMENTS = (
+    f"DROP TRIGGER IF EXISTS {STATS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {STATS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {STATS_TABLE}_ai",
+)
+
+for _statement in STATS_CREATE_STATEMENTS:
+    event.listen(db.metadata, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+for _statement in STATS_DROP_STATEMENTS:
+    event.listen(db.metadata, 'before_drop', DDL(_statement).execute_if(dialect='sqlite'))
+
+
+def is_stats_table_maintained():
+    """Returns True when triggers keep ``task_stats`` current (SQLite only)."""
+    return db.engine.dialect.name == 'sqlite'
+
+
+def _due_day_expression():
+    return func.coalesce(func.date(Task.due_date), '')
+
+
+def compute_stat_rows():
+    """
+    Counts tasks per status and due day straight from the tasks table.
+
+    Returns:
+        dict: ``(status, due_day)`` mapped to the number of tasks.
+    """
+    due_day = _due_day_expression()
+    rows = db.session.execute(select(Task.status, due_day, func.count()).group_by(Task.status, due_day))
+    return {(status, day): count for status, day, count in rows}
+
+
+def load_stat_rows():
+    """
+    Returns the per-status, per-day counters.
+
+    Read from ``task_stats`` where triggers maintain it, otherwise aggregated
+    from the tasks table.
+
+    Returns:
+        dict: ``(status, due_day)`` mapped to the number of tasks.
+    """
+    if not is_stats_table_maintained():
+        return compute_stat_rows()
+    rows = db.session.execute(select(TaskStat.status, TaskStat.due_day, TaskStat.count))
+    return {(status, day): count for status, day, count in rows if count}
+
+
+def read_task_stats(now=None):
+    """
+    Builds the dashboard aggregates from the counters.
+
+    Open tasks (not completed) are split by due date into ``overdue``,
+    ``today`` (due later today), ``upcoming`` and ``none``. The counters are
+    per day, so only today's bucket needs a look at the tasks table, through
+    the status/due-date index, to split it at the current time.
+
+    Args:
+        now (datetime, optional): Naive UTC time to evaluate against; defaults to now.
+
+    Returns:
+        dict: ``total``, ``by_status``, ``open_by_due`` and ``as_of``.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+    today = now.date().isoformat()
+
+    by_status = {status: 0 for status in sorted(Task.ALLOWED_STATUSES)}
+    open_by_due = {'overdue': 0, 'today': 0, 'upcoming': 0, 'none': 0}
+    for (status, day), count in load_stat_rows().items():
+        by_status[status] = by_status.get(status, 0) + count
+        if status == COMPLETED:
+            continue
+        if not day:
+            open_by_due['none'] += count
+        elif day < today:
+            open_by_due['overdue'] += count
+        elif day == today:
+            open_by_due['today'] += count
+        else:
+            open_by_due['upcoming'] += count
+
+    if open_by_due['today']:
+        start_of_day = datetime.combine(now.date(), time.min)
+        past_due_today = db.session.execute(
+            select(func.count()).select_from(Task).where(
+                Task.status.in_(Task.ALLOWED_STATUSES - {COMPLETED}),
+                Task.due_date >= start_of_day,
+                Task.due_date < now,
+            )
+        ).scalar()
+        open_by_due['today'] -= past_due_today
+        open_by_due['overdue'] += past_due_today
+
+    return {
+        'total': sum(by_status.values()),
+        'by_status': by_status,
+        'open_by_due': open_by_due,
+        'as_of': now.isoformat(),
+    }
+
+
+def check_task_stats():
+    """
+    Compares the stored counters with a fresh count of the tasks table.
+
+    Returns:
+        list: ``(status, due_day, stored, actual)`` for every counter that differs.
+    """
+    stored = load_stat_rows()
+    actual = compute_stat_rows()
+    return sorted((status, day, stored.get((status, day), 0), actual.get((status, day), 0))
+                  for status, day in set(stored) | set(actual)
+                  if stored.get((status, day), 0) != actual.get((status, day), 0))
+
+
+def rebuild_task_stats():
+    """
+    Replaces the counters with a fresh count of the tasks table, in one transaction.
+
+    Returns:
+        int: The number of counter rows written.
+    """
+    actual = compute_stat_rows()
+    db.session.execute(db.delete(TaskStat))
+    if actual:
+        db.session.execute(insert(TaskStat), [
+            {'status': status, 'due_day': day, 'count': count} for (status, day), count in actual.items()
+        ])
+    db.session.commit()
+    return len(actual)
@@ -0,0 +1,275 @@
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from itertools import islice
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from .models import db, Task
+from .schemas import error_summary, validate_task_import
+from .serializers import detail_columns, detail_item, json_dumps, json_loads
+
+FORMATS = ('ndjson', 'csv')
+
+# Column order of CSV files; NDJSON records carry the same keys.
+FIELDS = ('id', 'title', 'description', 'due_date', 'status', 'created_at', 'updated_at', 'version')
+
+# Fields read back from CSV cells as integers.
+_INTEGER_FIELDS = ('id', 'version')
+
+# Fields a CSV file writes as an empty cell when they are null.
+_NULLABLE_FIELDS = ('description', 'due_date')
+
+
+class TransferError(Exception):
+    """An import that cannot continue; batches committed before it stay committed."""
+
+
+def detect_format(path, format=None):
+    """
+    Works out the format and compression of an export file from its name.
+
+    Args:
+        path (str): The file path; a ``.gz`` suffix means gzip.
+        format (str, optional): 'ndjson' or 'csv'; by default ``.csv`` files
+            are CSV and anything else is NDJSON.
+
+    Returns:
+        tuple: ``(format, compressed)``.
+    """
+    compressed = path.endswith('.gz')
+    if format is None:
+        name = path[:-3] if compressed else path
+        format = 'csv' if name.endswith('.csv') else 'ndjson'
+    return format, compressed
+
+
+def _open(path, mode, compressed):
+    if compressed:
+        return gzip.open(path, mode, compresslevel=6)
+    return open(path, mode)
+
+
+def _batches(items, size):
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def iter_task_records(batch_size):
+    """
+    Streams every task as a detail dict, in id order.
+
+    The rows come from a single SELECT read with ``yield_per``, so at most
+    ``batch_size`` of them are held at a time and the whole export sees one
+    snapshot of the table.
+
+    Args:
+        batch_size (int): Rows fetched from the cursor at a time.
+
+    Yields:
+        dict: The same shape as ``Task.to_dict(detailed=True)``.
+    """
+    columns = detail_columns(db.engine.dialect.name)
+    result = db.session.execute(select(*columns).order_by(Task.id).execution_options(yield_per=batch_size))
+    for row in result:
+        yield detail_item(row)
+
+
+def _encode_ndjson(records):
+    return b''.join([json_dumps(record) + b'\n' for record in records])
+
+
+def _encode_csv(records):
+    buffer = io.StringIO(newline='')
+    csv.writer(buffer).writerows(['' if record[field] is None else record[field] for field in FIELDS]
+                                 for record in records)
+    return buffer.getvalue().encode('utf-8')
+
+
+def export_tasks(path, format=None, batch_size=5000, progress=None):
+    """
+    Writes every task to an NDJSON or CSV file, optionally gzipped.
+
+    The file is written under a ``.part`` name and renamed once complete, so
+    an interrupted export never leaves a truncated file behind.
+
+    Args:
+        path (str): Destination file; see :func:`detect_format`.
+        format (str, optional): 'ndjson' or 'csv'.
+        batch_size (int): Rows fetched and encoded at a time.
+        progress (callable, optional): Called as ``progress(rows, seconds)``
+            after each batch is written.
+
+    Returns:
+        int: The number of tasks exported.
+    """
+    format, compressed = detect_format(path, format)
+    encode = _encode_csv if format == 'csv' else _encode_ndjson
+    partial = path + '.part'
+    count = 0
+    started = time.perf_counter()
+    with _open(partial, 'wb', compressed) as out:
+        if format == 'csv':
+            out.write((','.join(FIELDS) + '\r\n').encode('utf-8'))
+        for batch in _batches(iter_task_records(batch_size), batch_size):
+            out.write(encode(batch))
+            count += len(batch)
+            if progress is not None:
+                progress(count, time.perf_counter() - started)
+    os.replace(partial, path)
+    return count
+
+
+def _from_csv(row):
+    record = dict(row)
+    for field in _INTEGER_FIELDS:
+        value = record.get(field)
+        if value is not None and value.isdigit():
+            record[field] = int(value)
+    for field in _NULLABLE_FIELDS:
+        if record.get(field) == '':
+            record[field] = None
+    return record
+
+
+def read_records(path, format=None):
+    """
+    Streams the records of an export file, one at a time and unvalidated.
+
+    Args:
+        path (str): The file; see :func:`detect_format`.
+        format (str, optional): 'ndjson' or 'csv'.
+
+    Yields:
+        dict: Each record, with CSV cells converted to the NDJSON types.
+
+    Raises:
+        TransferError: If an NDJSON line is not valid JSON.
+    """
+    format, compressed = detect_format(path, format)
+    with _open(path, 'rb', compressed) as f:
+        if format == 'csv':
+            for row in csv.DictReader(io.TextIOWrapper(f, encoding='utf-8', newline='')):
+                yield _from_csv(row)
+            return
+        number = 0
+        for line in f:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                yield json_loads(line)
+            except ValueError:
+                raise TransferError(f"Record {number} is not valid JSON.") from None
+
+
+def _read_checkpoint(path):
+    with open(path) as f:
+        state = json.load(f)
+    return state['rows'], state['last_id']
+
+
+def _write_checkpoint(path, rows, last_id):
+    partial = path + '.part'
+    with open(partial, 'w') as f:
+        json.dump({'rows': rows, 'last_id': last_id}, f)
+    os.replace(partial, path)
+
+
+def _existing_ids(ids):
+    return set(db.session.scalars(select(Task.id).where(Task.id.in_(ids))))
+
+
+def _sync_id_sequence():
+    # SQLite hands out ids above the largest one by itself; a PostgreSQL
+    # serial sequence has to be moved past the imported ids.
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(text("SELECT setval(pg_get_serial_sequence('tasks', 'id'), (SELECT max(id) FROM tasks))"))
+        db.session.commit()
+
+
+def import_tasks(path, format=None, batch_size=1000, checkpoint=None, resume=False, progress=None):
+    """
+    Inserts the tasks of an export file, keeping their ids and timestamps.
+
+    Records are validated and inserted with executemany in batches of
+    ``batch_size``, each committed on its own, so only one batch is held in
+    memory. After every commit the number of records done is saved to
+    ``checkpoint``; with ``resume`` those records are skipped. If the process
+    died between a commit and its checkpoint, the replayed records that are
+    already in the table are skipped too; ids are checked until a batch finds
+    none, so resuming with a smaller ``batch_size`` is safe. The checkpoint is
+    removed once the import completes.
+
+    Args:
+        path (str): The file; see :func:`detect_format`.
+        format (str, optional): 'ndjson' or 'csv'.
+        batch_size (int): Records per insert and commit.
+        checkpoint (str, optional): Where to keep the resume point.
+        resume (bool): Continue from ``checkpoint`` instead of starting over.
+        progress (callable, optional): Called as ``progress(rows, seconds)``
+            after each batch is committed.
+
+    Returns:
+        int: The number of tasks inserted by this run.
+
+    Raises:
+        TransferError: On an invalid record, a rejected batch, or a checkpoint
+            that does not fit the file. Earlier batches stay committed.
+    """
+    done, last_id = 0, None
+    if checkpoint and os.path.exists(checkpoint):
+        if not resume:
+            raise TransferError(f"A checkpoint from an earlier import exists ({checkpoint}); "
+                                "resume it or delete it.")
+        done, last_id = _read_checkpoint(checkpoint)
+
+    records = enumerate(read_records(path, format), 1)
+    if done:
+        skipped = None
+        for _, skipped in islice(records, done):
+            pass
+        if skipped is None or skipped.get('id') != last_id:
+            raise TransferError(f"The checkpoint does not match {path}.")
+
+    imported = 0
+    replaying = done > 0
+    started = time.perf_counter()
+    for batch in _batches(records, batch_size):
+        values = []
+        for number, record in batch:
+            row, errors = validate_task_import(record)
+            if errors:
+                raise TransferError(f"Record {number}: {error_summary(errors)}")
+            row.setdefault('description', None)
+            row.setdefault('due_date', None)
+            row.setdefault('version', 1)
+            values.append(row)
+        if replaying:
+            existing = _existing_ids([row['id'] for row in values])
+            values = [row for row in values if row['id'] not in existing]
+            # The lost commit may span several batches of a smaller size.
+            replaying = bool(existing)
+        try:
+            if values:
+                db.session.execute(insert(Task.__table__), values)
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise TransferError(f"Records {batch[0][0]}-{batch[-1][0]} could not be inserted: "
+                                f"{e.__class__.__name__}") from e
+        imported += len(values)
+        if checkpoint:
+            _write_checkpoint(checkpoint, batch[-1][0], batch[-1][1]['id'])
+        if progress is not None:
+            progress(imported, time.perf_counter() - started)
+
+    _sync_id_sequence()
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return imported
@@ -1,87 +1,41 @@
+import time
 from datetime import datetime, timezone
 
+from .audit import format_event, get_audit_pipeline
+
+DEFAULT_REDACT_FIELDS = frozenset({'description'})
+
 def get_current_utc_time():
     return datetime.now(timezone.utc)
 
-# SAARTHI-20250603131546: MEDIUM | CODE_QUALITY
-# ISSUE: validate_data_payload lacks specific type checks or format checks.
-# POLICY: N/A
-# FIX: Add specific type checks and format checks to the validate_data_payload function.
-# EFFORT: [2h]
-def validate_data_payload(data, required_fields, optional_fields=None):
+def chunked(items, size):
     """
-    Validates the data payload against required and optional fields.
+    Splits a list into consecutive slices of at most ``size`` items.
 
     Args:
-        data (dict): The data payload to validate.
-        required_fields (list): A list of required fields.
-        optional_fields (list, optional): A list of optional fields. Defaults to None.
+        items (list): The items to split.
+        size (int): The maximum slice length.
 
-    Returns:
-        tuple: A tuple containing a boolean indicating whether the payload is valid and a dictionary of errors, if any.
+    Yields:
+        list: Successive slices of ``items``.
     """
-    if not isinstance(data, dict):
-        return False, "Payload must be a JSON object."
-
-    errors = {}
-    for field in required_fields:
-        if field not in data or not data[field]: 
-            errors[field] = f"{field} is required and cannot be empty."
-
-    allowed_fields = set(required_fields)
-    if optional_fields:
-        allowed_fields.update(optional_fields)
-
-    for key in data.keys():
-        if key not in allowed_fields:
-            errors[key] = f"Field '{key}' is not allowed."
-
-    if errors:
-        return False, errors 
-
-    return True, None
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 def log_sensitive_action(action_description, user_data=None):
     """
-    Logs an action. If user_data is provided, it's logged too.
-    This could be a compliance issue if user_data contains PII.
-    """
-    timestamp = get_current_utc_time().isoformat()
-    log_message = f"[{timestamp}] Action: {action_description}"
-    if user_data:
-        log_message += f" | Data: {str(user_data)}"
-    # SAARTHI-202506031226: HIGH | Compliance
-        # ISSUE: Logging user_data directly could expose PII, violating GDPR-Lite.
-        # POLICY: Policy 1.5: Do not log PII or sensitive data in plaintext.
-        # FIX: Sanitize or redact user_data before logging. Use app.logger.warning instead of print.
-        # EFFORT: [4h]
-        # SAARTHI-202506031554: HIGH | COMPLIANCE
-        # ISSUE: Logging user_data directly could expose PII, violating GDPR-Lite.
-        # POLICY: OrgPolicy_compliance.md: Policy 1.5 - Do not log PII or sensitive data in plaintext.
-        # FIX: Sanitize or redact user_data before logging. Use app.logger.warning instead of print.
-        print(log_message)
-
-# SAARTHI-20250603131546: LOW | Code Quality
-# ISSUE: Unreachable code.
-        # POLICY: Policy 3.3: Avoid unnecessary code.
-        # FIX: Remove the unreachable code block.
-        # EFFORT: [5m]
-        # SAARTHI-202506031554: LOW | CODE QUALITY
-        # ISSUE: Unreachable code.
-        # POLICY: N/A
-        # FIX: Remove the unreachable code block.
-        if False:
-            print("This will never be printed.")
+    Records an audit event.
 
+    The event is handed to the app's asynchronous audit pipeline, which redacts
+    sensitive fields and writes it off the request thread. Outside an app (or
+    with ``AUDIT_LOG_PATH`` set empty) the redacted event is printed.
 
-# SAARTHI-202506031554: LOW | LINTING
-# ISSUE: Function name does not follow the snake_case naming convention.
-# POLICY: OrgPolicy_compliance.md: Policy 3.1 - Python: `snake_case` for functions, variables, and modules.
-# FIX: Rename the function to is_task_title_valid.
-# EFFORT: [5m]
-def is_task_title_valid(title: str) -> bool:
-    if not title:
-        return False
-    if len(title) > 120: 
-        return False
-    return True
+    Args:
+        action_description (str): What happened.
+        user_data (optional): Payload to record alongside the action.
+    """
+    pipeline = get_audit_pipeline()
+    if pipeline is not None:
+        pipeline.submit(action_description, user_data)
+        return
+    print(format_event(time.time(), action_description, user_data, DEFAULT_REDACT_FIELDS))
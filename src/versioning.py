@@ -0,0 +1,101 @@
+from sqlalchemy import select, update
+from sqlalchemy.engine import Connection
+
+from .models import Task
+from .serializers import DETAIL_COLUMNS, detail_columns, detail_item
+
+
+def format_etag(version):
+    """
+    Formats a task version as a strong entity tag.
+
+    Args:
+        version (int): The task's version.
+
+    Returns:
+        str: The quoted tag, e.g. ``"3"``.
+    """
+    return f'"{version}"'
+
+
+def parse_if_match(header):
+    """
+    Parses an ``If-Match`` request header into the versions it accepts.
+
+    Only strong tags written by :func:`format_etag` can match; weak tags and
+    tags this server never issued are ignored, so a header made of nothing
+    else fails the precondition.
+
+    Args:
+        header (str or None): The raw header value.
+
+    Returns:
+        frozenset or None: The acceptable versions, or None when the header is
+        absent or ``*`` and any current version may be overwritten.
+    """
+    if header is None or not header.strip():
+        return None
+    versions = set()
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return None
+        if len(tag) > 2 and tag[0] == '"' and tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.add(int(tag[1:-1]))
+    return frozenset(versions)
+
+
+def versioned_update(task_id, values, versions=None, columns=DETAIL_COLUMNS):
+    """
+    Builds the single conditional UPDATE behind PUT /tasks/<id>.
+
+    ``version`` is bumped in the same statement, so concurrent writers cannot
+    both succeed against the same version. No row comes back when the task is
+    missing or its version is not one of ``versions``.
+
+    Args:
+        task_id (int): The task ID.
+        values (dict): Validated column values to set.
+        versions (frozenset, optional): Versions the client expects, as
+            returned by :func:`parse_if_match`; None skips the check.
+        columns (tuple, optional): The columns to return, as picked by
+            :func:`~.serializers.detail_columns` for the database.
+
+    Returns:
+        Update: An UPDATE ... RETURNING of ``columns``.
+    """
+    statement = update(Task.__table__).where(Task.id == task_id)
+    if versions is not None:
+        statement = statement.where(Task.version.in_(versions))
+    return statement.values(**values, version=Task.version + 1).returning(*columns)
+
+
+def current_version(connection, task_id):
+    """Returns a task's version, or None if it does not exist."""
+    return connection.execute(select(Task.version).where(Task.id == task_id)).scalar()
+
+
+def apply_versioned_update(connection, task_id, values, versions=None):
+    """
+    Runs :func:`versioned_update` and tells a conflict from a missing task.
+
+    The task is only read again when the UPDATE matched no row, to choose
+    between 404 and 412; a successful update is a single statement.
+
+    Args:
+        connection (Connection or Session): Where to run the statements; the
+            caller commits.
+        task_id (int): The task ID.
+        values (dict): Validated column values to set.
+        versions (frozenset, optional): As for :func:`versioned_update`.
+
+    Returns:
+        tuple: ``(task, version)``; ``task`` is the updated detail dict, or
+        None with ``version`` the current version (None if the task is missing).
+    """
+    bind = connection if isinstance(connection, Connection) else connection.get_bind()
+    columns = detail_columns(bind.dialect.name)
+    row = connection.execute(versioned_update(task_id, values, versions, columns)).first()
+    if row is not None:
+        return detail_item(row), row.version
+    return None, current_version(connection, task_id)
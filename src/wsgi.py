@@ -0,0 +1,36 @@
+"""
+WSGI entry point for production servers.
+
+The app is created in serving mode (no migration tooling or CLI commands, and
+metrics and reminders only when enabled) when this module is imported.
+Pre-forking servers can import it once in the parent so every worker starts
+with the code and config already loaded::
+
+    gunicorn --preload --workers 4 simple_task_manager.src.wsgi:app
+
+Building the app starts no threads, so the parent holds nothing a worker
+cannot inherit: the audit writer starts in each worker on its first event,
+the reminder scheduler on its first request, and pooled database connections
+are dropped in the child right after the fork.
+"""
+import os
+
+from .app import create_app
+from .models import db
+from .sharding import get_task_shards
+
+app = create_app(serving=True)
+
+
+def _reset_after_fork():
+    # close=False leaves the parent's connections alone; the child just stops
+    # using them and opens its own.
+    with app.app_context():
+        db.engine.dispose(close=False)
+        shards = get_task_shards()
+        if shards is not None:
+            shards.reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,195 @@
+import unittest
+import asyncio
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from simple_task_manager.src.config import TestingConfig
+from simple_task_manager.src.models import db, Task
+
+ASYNC_DRIVER_AVAILABLE = all(importlib.util.find_spec(name) for name in ('aiosqlite', 'greenlet'))
+
+
+@unittest.skipUnless(ASYNC_DRIVER_AVAILABLE, "aiosqlite and greenlet are required for the ASGI mode")
+class AsgiTestCase(unittest.TestCase):
+    """Tests for the async ASGI entry point"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        from simple_task_manager.src.asgi import create_asgi_app
+
+        self.tmp = tempfile.TemporaryDirectory()
+        # In-memory SQLite is private to each connection, so the sync and async
+        # engines need a file to share.
+        patcher = mock.patch.object(TestingConfig, 'SQLALCHEMY_DATABASE_URI',
+                                    'sqlite:///' + os.path.join(self.tmp.name, 'tasks.db'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.asgi = create_asgi_app('test')
+        self.app = self.asgi.flask_app
+        with self.app.app_context():
+            db.create_all()
+            db.session.add_all([Task(title=f'Task {i}', status='completed' if i % 2 else 'pending')
+                                for i in range(1, 6)])
+            db.session.commit()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        """Executed after each test"""
+        self.loop.run_until_complete(self.asgi.engine.dispose())
+        self.loop.close()
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+        self.tmp.cleanup()
+
+    async def call(self, method, path, body=None, headers=()):
+        """Runs one request; returns the sent messages, each with its arrival time."""
+        query = b''
+        if '?' in path:
+            path, query = path.split('?', 1)
+            query = query.encode()
+        payload = json.dumps(body).encode() if body is not None else b''
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query,
+                 'headers': [(b'content-type', b'application/json')] + list(headers)}
+        messages = [{'type': 'http.request', 'body': payload, 'more_body': False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(dict(message, at=time.monotonic()))
+
+        await self.asgi(scope, receive, send)
+        return sent
+
+    def request(self, method, path, body=None, headers=()):
+        sent = self.loop.run_until_complete(self.call(method, path, body, headers))
+        response_headers = {name.decode(): value.decode() for name, value in sent[0]['headers']}
+        data = b''.join(message.get('body', b'') for message in sent[1:])
+        return sent[0]['status'], response_headers, data
+
+    def test_create_and_get_task(self):
+        status, _, data = self.request('POST', '/api/v1/tasks',
+                                       {'title': 'Async task', 'due_date': '2030-01-02T03:04:05Z'})
+        self.assertEqual(status, 200)
+        created = json.loads(data)
+        self.assertEqual(created['id'], 6)
+        self.assertEqual(created['due_date'], '2030-01-02T03:04:05')
+
+        status, headers, data = self.request('GET', '/api/v1/tasks/6')
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(data), created)
+        self.assertEqual(headers['x-cache'], 'MISS')
+
+        status, headers, _ = self.request('GET', '/api/v1/tasks/6',
+                                          headers=[(b'if-none-match', headers['etag'].encode())])
+        self.assertEqual(status, 304)
+        self.assertEqual(headers['x-cache'], 'HIT')
+
+    def test_responses_match_wsgi(self):
+        client = self.app.test_client()
+        for path in ('/api/v1/tasks', '/api/v1/tasks?status=pending&limit=1', '/api/v1/tasks/3'):
+            _, headers, data = self.request('GET', path)
+            expected = client.get(path)
+            self.assertEqual(json.loads(data), expected.get_json(), path)
+            self.assertEqual(headers.get('x-change-token'), expected.headers.get('X-Change-Token'), path)
+        _, headers, _ = self.request('GET', '/api/v1/tasks?stream=ndjson')
+        self.assertEqual(headers['x-change-token'], client.get('/api/v1/tasks').headers['X-Change-Token'])
+
+    def test_validation_is_shared(self):
+        status, _, data = self.request('POST', '/api/v1/tasks', {'title': 'x', 'owner': 'me'})
+        self.assertEqual(status, 400)
+        self.assertIn('owner', json.loads(data)['details'])
+        status, _, data = self.request('PUT', '/api/v1/tasks/1', {'status': 'archived'})
+        self.assertEqual(status, 400)
+        status, _, _ = self.request('PUT', '/api/v1/tasks/99', {'status': 'pending'})
+        self.assertEqual(status, 404)
+        status, _, _ = self.request('GET', '/api/v1/tasks?after=%%%')
+        self.assertEqual(status, 400)
+
+    def test_update_invalidates_cache_and_delete(self):
+        self.request('GET', '/api/v1/tasks/2')
+        status, _, data = self.request('PUT', '/api/v1/tasks/2', {'title': 'Renamed'})
+        self.assertEqual(status, 200)
+        _, headers, data = self.request('GET', '/api/v1/tasks/2')
+        self.assertEqual(headers['x-cache'], 'MISS')
+        self.assertEqual(json.loads(data)['title'], 'Renamed')
+
+        status, _, _ = self.request('DELETE', '/api/v1/tasks/2')
+        self.assertEqual(status, 204)
+        status, _, _ = self.request('GET', '/api/v1/tasks/2')
+        self.assertEqual(status, 404)
+
+    def test_if_match(self):
+        _, headers, _ = self.request('GET', '/api/v1/tasks/3')
+        status, headers, data = self.request('PUT', '/api/v1/tasks/3', {'title': 'First'},
+                                             headers=[(b'if-match', headers['etag'].encode())])
+        self.assertEqual((status, headers['etag'], json.loads(data)['version']), (200, '"2"', 2))
+        status, headers, _ = self.request('PUT', '/api/v1/tasks/3', {'title': 'Second'},
+                                          headers=[(b'if-match', b'"1"')])
+        self.assertEqual((status, headers['etag']), (412, '"2"'))
+        _, _, data = self.request('GET', '/api/v1/tasks/3')
+        self.assertEqual(json.loads(data)['title'], 'First')
+
+    def test_update_on_other_databases(self):
+        # Other drivers return datetime objects; take that branch on SQLite.
+        with mock.patch.object(self.asgi.engine.dialect, 'name', 'postgresql'):
+            status, headers, data = self.request('PUT', '/api/v1/tasks/4', {'due_date': '2030-01-02T09:30:00Z'})
+        self.assertEqual((status, headers['etag']), (200, '"2"'))
+        with self.app.app_context():
+            self.assertEqual(json.loads(data), db.session.get(Task, 4).to_dict(detailed=True))
+
+    def test_stream(self):
+        status, headers, data = self.request('GET', '/api/v1/tasks?stream=ndjson')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-type'], 'application/x-ndjson')
+        self.assertEqual([json.loads(line)['id'] for line in data.splitlines()], [1, 2, 3, 4, 5])
+        _, _, data = self.request('GET', '/api/v1/tasks?stream=json')
+        self.assertEqual(len(json.loads(data)), 5)
+
+    def test_other_routes_fall_back_to_flask(self):
+        status, _, data = self.request('POST', '/api/v1/tasks:batch', [{'title': 'Batched'}])
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(data)['succeeded'], 1)
+        status, _, data = self.request('GET', '/health')
+        self.assertEqual(json.loads(data)['status'], 'healthy')
+
+
+    def test_server_sent_events_are_relayed_as_they_are_written(self):
+        self.app.config['CHANGES_SSE_MAX_SECONDS'] = 0.6
+        self.app.config['CHANGES_SSE_KEEPALIVE'] = 0.1
+        sent = self.loop.run_until_complete(self.call('GET', '/api/v1/tasks/changes?stream=sse'))
+        self.assertEqual(dict(sent[0]['headers'])[b'content-type'], b'text/event-stream; charset=utf-8')
+        bodies = sent[1:]
+        self.assertTrue(bodies[0]['body'].startswith(b'id: '))
+        self.assertTrue(all(message['more_body'] for message in bodies[:-1]))
+        self.assertFalse(bodies[-1].get('more_body', False))
+        # The first event left long before the stream ended.
+        self.assertGreater(bodies[-1]['at'] - bodies[0]['at'], 0.4)
+
+    def test_long_polls_do_not_hold_up_other_routes(self):
+        self.asgi.passthrough_pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(self.asgi.passthrough_pool.shutdown)
+        _, _, data = self.request('GET', '/api/v1/tasks/changes')
+        token = json.loads(data)['next_token']
+
+        async def both():
+            poll = asyncio.ensure_future(self.call('GET', f'/api/v1/tasks/changes?since={token}&wait=1'))
+            await asyncio.sleep(0.1)
+            health = await self.call('GET', '/health')
+            return health, await poll
+
+        health, poll = self.loop.run_until_complete(both())
+        self.assertLess(health[-1]['at'], poll[-1]['at'] - 0.5)
+        self.assertEqual(poll[0]['status'], 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
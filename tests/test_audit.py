@@ -0,0 +1,161 @@
+import unittest
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.audit import AuditPipeline, redact
+from simple_task_manager.src.models import db
+
+
+def read_events(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class AuditPipelineTestCase(unittest.TestCase):
+    """Tests for the asynchronous audit log pipeline"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'audit.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_redaction_is_recursive(self):
+        data = {'id': 1, 'changes': {'title': 't', 'description': 'secret'}, 'items': [{'description': 'x'}]}
+        self.assertEqual(redact(data, frozenset({'description'})),
+                         {'id': 1, 'changes': {'title': 't', 'description': '[REDACTED]'},
+                          'items': [{'description': '[REDACTED]'}]})
+
+    def test_events_are_flushed_on_close(self):
+        pipeline = AuditPipeline(self.path, batch_size=2)
+        pipeline.start()
+        for i in range(5):
+            self.assertTrue(pipeline.submit(f'action {i}', {'description': 'secret', 'n': i}))
+        pipeline.close()
+        events = read_events(self.path)
+        self.assertEqual([event['action'] for event in events], [f'action {i}' for i in range(5)])
+        self.assertEqual(events[0]['data'], {'description': '[REDACTED]', 'n': 0})
+        self.assertEqual(pipeline.stats()['written'], 5)
+
+    def test_drop_policy_counts_dropped_events(self):
+        pipeline = AuditPipeline(self.path, max_queue=3, policy='drop')  # not started: nothing drains
+        results = [pipeline.submit('a') for _ in range(5)]
+        self.assertEqual(results, [True, True, True, False, False])
+        stats = pipeline.stats()
+        self.assertEqual((stats['queue_depth'], stats['dropped']), (3, 2))
+
+    def test_sample_policy_sheds_load_above_high_water(self):
+        pipeline = AuditPipeline(self.path, max_queue=10, policy='sample', sample_rate=0.0)
+        accepted = sum(pipeline.submit('a') for _ in range(10))
+        self.assertEqual(accepted, 5)
+        self.assertEqual(pipeline.stats()['sampled_out'], 5)
+
+    def test_autostart_waits_for_the_first_event(self):
+        pipeline = AuditPipeline(self.path, autostart=True)
+        self.assertIsNone(pipeline._thread)
+        pipeline.submit('first')
+        self.assertTrue(pipeline._thread.is_alive())
+        pipeline.close()
+        self.assertEqual([event['action'] for event in read_events(self.path)], ['first'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires fork")
+    def test_autostart_restarts_the_writer_in_a_forked_child(self):
+        pipeline = AuditPipeline(self.path, autostart=True)
+        pipeline.submit('parent')
+        pid = os.fork()
+        if pid == 0:
+            pipeline.submit('child')
+            pipeline.close()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        pipeline.close()
+        self.assertEqual(sorted(event['action'] for event in read_events(self.path)), ['child', 'parent'])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires fork")
+    def test_concurrent_first_events_in_a_child_share_one_writer(self):
+        pipeline = AuditPipeline(self.path, autostart=True)
+        pipeline.submit('parent')
+        pid = os.fork()
+        if pid == 0:
+            barrier = threading.Barrier(8)
+
+            def submit(i):
+                barrier.wait()
+                pipeline.submit(f'child {i}')
+
+            threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            pipeline.close()
+            os._exit(0)
+        os.waitpid(pid, 0)
+        pipeline.close()
+        actions = sorted(event['action'] for event in read_events(self.path))
+        self.assertEqual(actions, sorted([f'child {i}' for i in range(8)] + ['parent']))
+
+    def test_stderr_is_the_default_destination(self):
+        app = create_app('test')
+        pipeline = app.extensions['audit']
+        self.assertEqual(pipeline.path, '-')
+        with mock.patch('sys.stderr', new=open(self.path, 'w')) as stderr:
+            pipeline.submit('to stderr', {'description': 'secret'})
+            pipeline.close()
+            stderr.close()
+        events = read_events(self.path)
+        self.assertEqual(events, [{'ts': events[0]['ts'], 'action': 'to stderr',
+                                   'data': {'description': '[REDACTED]'}}])
+
+    def test_rotation(self):
+        pipeline = AuditPipeline(self.path, batch_size=1, max_bytes=100, backup_count=2)
+        pipeline.start()
+        for i in range(10):
+            pipeline.submit(f'rotating action number {i}')
+        pipeline.close()
+        self.assertTrue(os.path.exists(self.path + '.1'))
+        self.assertTrue(os.path.exists(self.path + '.2'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+        self.assertGreater(pipeline.stats()['rotations'], 2)
+
+
+class AuditApiTestCase(unittest.TestCase):
+    """Tests for audit events emitted by the API"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'audit.jsonl')
+        self.app = create_app('test')
+        self.app.config['AUDIT_LOG_PATH'] = self.path
+        from simple_task_manager.src.audit import init_audit
+        self.pipeline = init_audit(self.app)
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Executed after each test"""
+        self.pipeline.close()
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        self.tmp.cleanup()
+
+    def test_create_is_audited_without_description(self):
+        self.client.post('/api/v1/tasks', json={'title': 'Audited', 'description': 'private notes'})
+        stats = json.loads(self.client.get('/api/v1/audit/stats').data)
+        self.assertTrue(stats['enabled'])
+        self.pipeline.close()
+        events = read_events(self.path)
+        self.assertEqual(events[0]['action'], 'Attempting to create task')
+        self.assertEqual(events[0]['data']['description'], '[REDACTED]')
+
+
+if __name__ == "__main__":
+    unittest.main()
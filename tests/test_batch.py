@@ -0,0 +1,116 @@
+import unittest
+import json
+import time
+from sqlalchemy import event
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task
+
+
+class TaskBatchTestCase(unittest.TestCase):
+    """Tests for the bulk create/update/delete endpoints"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def batch(self, method, payload):
+        res = self.client.open('/api/v1/tasks:batch', method=method, json=payload)
+        return res.status_code, json.loads(res.data)
+
+    def test_create_reports_per_item_results(self):
+        status, body = self.batch('POST', [
+            {'title': 'First', 'due_date': '2025-03-01T10:00:00Z'},
+            {'title': ''},
+            {'title': 'Third', 'description': 'desc'},
+            {'title': 'Bad date', 'due_date': 'soon'},
+        ])
+        self.assertEqual(status, 200)
+        self.assertEqual([r['status'] for r in body['results']], [201, 400, 201, 400])
+        self.assertEqual((body['succeeded'], body['failed']), (2, 2))
+        with self.app.app_context():
+            task = db.session.get(Task, body['results'][0]['id'])
+            self.assertEqual(task.title, 'First')
+            self.assertEqual(task.status, 'pending')
+            self.assertEqual(Task.query.count(), 2)
+
+    def test_update_and_delete(self):
+        _, created = self.batch('POST', [{'title': f'Task {i}'} for i in range(3)])
+        ids = [r['id'] for r in created['results']]
+
+        _, body = self.batch('PATCH', [
+            {'id': ids[0], 'status': 'completed'},
+            {'id': ids[1], 'status': 'archived'},
+            {'id': 999, 'title': 'Missing'},
+            {'id': ids[2], 'title': 'Renamed', 'due_date': None},
+        ])
+        self.assertEqual([r['status'] for r in body['results']], [200, 400, 404, 200])
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Task, ids[0]).status, 'completed')
+            self.assertEqual(db.session.get(Task, ids[2]).title, 'Renamed')
+
+        _, body = self.batch('DELETE', [ids[0], 999, 'x'])
+        self.assertEqual([r['status'] for r in body['results']], [204, 404, 400])
+        with self.app.app_context():
+            self.assertEqual(Task.query.count(), 2)
+
+    def test_sub_batches_commit_independently(self):
+        self.app.config['BATCH_COMMIT_SIZE'] = 3
+        with self.app.app_context():
+            # Rejects the second sub-batch (items 3-5) inside the database.
+            db.session.execute(db.text("CREATE TEMP TRIGGER reject_task BEFORE INSERT ON tasks "
+                                       "WHEN new.title = 'Task 4' BEGIN SELECT RAISE(ABORT, 'rejected'); END"))
+            db.session.commit()
+        _, body = self.batch('POST', [{'title': f'Task {i}'} for i in range(10)])
+        self.assertEqual([r['status'] for r in body['results']], [201] * 3 + [500] * 3 + [201] * 4)
+        self.assertEqual(body['succeeded'], 7)
+        with self.app.app_context():
+            titles = db.session.scalars(db.select(Task.title).order_by(Task.id)).all()
+        self.assertEqual(titles, [f'Task {i}' for i in (0, 1, 2, 6, 7, 8, 9)])
+
+    def test_batch_limits(self):
+        self.app.config['BATCH_MAX_ITEMS'] = 2
+        status, _ = self.batch('POST', [{'title': 'a'}, {'title': 'b'}, {'title': 'c'}])
+        self.assertEqual(status, 400)
+        status, _ = self.batch('POST', {'title': 'not a list'})
+        self.assertEqual(status, 400)
+
+    def test_single_delete(self):
+        _, created = self.batch('POST', [{'title': 'Doomed'}])
+        task_id = created['results'][0]['id']
+        self.assertEqual(self.client.delete(f'/api/v1/tasks/{task_id}').status_code, 204)
+        self.assertEqual(self.client.delete(f'/api/v1/tasks/{task_id}').status_code, 404)
+
+    def test_ten_thousand_tasks_in_one_request(self):
+        inserts = []
+        with self.app.app_context():
+            event.listen(db.engine, 'before_cursor_execute',
+                         lambda conn, cursor, statement, *args: inserts.append(statement)
+                         if statement.startswith('INSERT INTO tasks ') else None)
+        start = time.perf_counter()
+        _, body = self.batch('POST', [{'title': f'Imported {i}'} for i in range(10000)])
+        elapsed = time.perf_counter() - start
+        self.assertEqual(body['succeeded'], 10000)
+        # One multi-row INSERT per page of rows, not one per task.
+        self.assertLessEqual(len(inserts), 10000 // 1000)
+        # About 0.5 s here; the per-row fallback took three times as long.
+        self.assertLess(elapsed, 1.25)
+
+        ids = [result['id'] for result in body['results']]
+        self.assertEqual(ids, sorted(ids))
+        with self.app.app_context():
+            for index in (0, 4321, 9999):
+                self.assertEqual(db.session.get(Task, ids[index]).title, f'Imported {index}')
+
+
+if __name__ == "__main__":
+    unittest.main()
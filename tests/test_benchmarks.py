@@ -0,0 +1,43 @@
+import unittest
+from simple_task_manager.benchmarks.run import compare
+
+
+def scenario(p95_ms, throughput_rps):
+    return {'p95_ms': p95_ms, 'throughput_rps': throughput_rps}
+
+
+class CompareTestCase(unittest.TestCase):
+    """Tests for the benchmark baseline comparison"""
+
+    def setUp(self):
+        self.baseline = {'results': {'10000': {'client': {'get_task': scenario(2.0, 500.0)},
+                                               'server': {'get_task': scenario(20.0, 300.0)}}}}
+
+    def test_within_tolerance(self):
+        results = {'10000': {'client': {'get_task': scenario(2.4, 420.0)},
+                             'server': {'get_task': scenario(20.0, 300.0)}}}
+        self.assertEqual(compare(results, self.baseline, 0.25), [])
+
+    def test_slower_or_fewer_requests(self):
+        results = {'10000': {'client': {'get_task': scenario(2.6, 500.0)},
+                             'server': {'get_task': scenario(20.0, 200.0)}}}
+        self.assertEqual(len(compare(results, self.baseline, 0.25)), 2)
+
+    def test_sizes_and_scenarios_without_a_baseline_fail(self):
+        results = {'10000': {'client': {'get_task': scenario(2.0, 500.0), 'search': scenario(1.0, 900.0)},
+                             'server': {}},
+                   '100000': {'client': {'get_task': scenario(2.0, 500.0)}, 'server': {}}}
+        self.assertEqual(sorted(compare(results, self.baseline, 0.25)), [
+            '10000/client/search: not in the baseline',
+            '10000/server/get_task: in the baseline but not measured',
+            '100000: not in the baseline (re-record it with make bench-baseline)',
+        ])
+
+    def test_baseline_sizes_that_were_not_run_are_ignored(self):
+        self.baseline['results']['100000'] = self.baseline['results']['10000']
+        results = {'10000': self.baseline['results']['10000']}
+        self.assertEqual(compare(results, self.baseline, 0.25), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
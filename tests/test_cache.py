@@ -0,0 +1,130 @@
+import unittest
+import json
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.cache import CacheBackend, KeyValueCache, LocalKeyValueStore, LRUCache
+from simple_task_manager.src.models import db
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    """Tests for the in-process LRU backend"""
+
+    def test_eviction_and_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(max_entries=2, ttl=10, clock=clock)
+        cache.set(1, b'one')
+        cache.set(2, b'two')
+        self.assertEqual(cache.get(1), b'one')
+        cache.set(3, b'three')  # evicts 2, the least recently used
+        self.assertIsNone(cache.get(2))
+        clock.now = 11
+        self.assertIsNone(cache.get(1))
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions'], stats['expirations']), (1, 2, 1, 1))
+
+    def test_key_value_backend(self):
+        clock = FakeClock()
+        cache = KeyValueCache(LocalKeyValueStore(clock=clock), ttl=5)
+        cache.set(7, ('"1"', b'seven'))
+        self.assertEqual(cache.get(7), ('"1"', b'seven'))
+        cache.delete(7)
+        self.assertIsNone(cache.get(7))
+        cache.set(8, ('"1"', b'eight'))
+        clock.now = 6
+        self.assertIsNone(cache.get(8))
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_fill_loaded_before_a_write_is_dropped(self):
+        for cache in (LRUCache(max_entries=10, ttl=0), KeyValueCache(LocalKeyValueStore(), ttl=0)):
+            generation = cache.generation(1)  # a reader starts loading task 1
+            cache.delete(1)                   # a writer commits and invalidates
+            cache.set(1, ('"1"', b'stale'), generation)
+            self.assertIsNone(cache.get(1), cache)
+            cache.set(1, ('"2"', b'fresh'), cache.generation(1))
+            self.assertEqual(cache.get(1), ('"2"', b'fresh'), cache)
+
+    def test_key_value_clear_keeps_other_keys_in_the_store(self):
+        store = LocalKeyValueStore()
+        store.set('session:1', b'kept')
+        cache = KeyValueCache(store, ttl=0)
+        for task_id in range(1, 1201):
+            cache.set(task_id, ('"1"', b'body'))
+        generation = cache.generation(1)
+        cache.delete(1)
+        cache.clear()
+        self.assertEqual([cache.get(task_id) for task_id in (2, 600, 1200)], [None, None, None])
+        self.assertEqual(store.get('session:1'), b'kept')
+        cache.set(1, ('"1"', b'stale'), generation)
+        self.assertIsNone(cache.get(1))
+
+    def test_incomplete_backend_fails_on_creation(self):
+        class GetOnly(CacheBackend):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+
+class TaskCacheApiTestCase(unittest.TestCase):
+    """Tests for the cached GET /tasks/<id> endpoint"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+        res = self.client.post('/api/v1/tasks', json={'title': 'Cached task'})
+        self.task_id = json.loads(res.data)['id']
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_hit_after_miss_and_conditional_get(self):
+        first = self.client.get(f'/api/v1/tasks/{self.task_id}')
+        self.assertEqual(first.headers['X-Cache'], 'MISS')
+        second = self.client.get(f'/api/v1/tasks/{self.task_id}')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(first.data, second.data)
+
+        etag = second.headers['ETag']
+        res = self.client.get(f'/api/v1/tasks/{self.task_id}', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.data, b'')
+
+    def test_writes_invalidate(self):
+        etag = self.client.get(f'/api/v1/tasks/{self.task_id}').headers['ETag']
+        self.client.put(f'/api/v1/tasks/{self.task_id}', json={'status': 'completed'})
+        res = self.client.get(f'/api/v1/tasks/{self.task_id}', headers={'If-None-Match': etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.headers['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(res.data)['status'], 'completed')
+
+        self.client.open('/api/v1/tasks:batch', method='PATCH', json=[{'id': self.task_id, 'title': 'Renamed'}])
+        self.assertEqual(json.loads(self.client.get(f'/api/v1/tasks/{self.task_id}').data)['title'], 'Renamed')
+
+        self.client.delete(f'/api/v1/tasks/{self.task_id}')
+        self.assertEqual(self.client.get(f'/api/v1/tasks/{self.task_id}').status_code, 404)
+
+    def test_stats_endpoint(self):
+        self.client.get(f'/api/v1/tasks/{self.task_id}')
+        self.client.get(f'/api/v1/tasks/{self.task_id}')
+        stats = json.loads(self.client.get('/api/v1/cache/stats').data)
+        self.assertEqual(stats['backend'], 'lru')
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
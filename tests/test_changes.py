@@ -0,0 +1,139 @@
+import unittest
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.changes import encode_token, prune_changes
+from simple_task_manager.src.models import db, Task
+
+
+class ChangeFeedTestCase(unittest.TestCase):
+    """Tests for the incremental sync endpoint"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.app.config['CHANGES_POLL_INTERVAL'] = 0.05
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            db.session.add_all([Task(title=f'Task {i}') for i in range(1, 4)])
+            db.session.commit()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def changes(self, query=''):
+        res = self.client.get(f'/api/v1/tasks/changes?{query}')
+        return res.status_code, json.loads(res.data)
+
+    def test_initial_sync_then_incremental(self):
+        status, body = self.changes()
+        self.assertEqual(status, 200)
+        self.assertEqual([task['id'] for task in body['tasks']], [1, 2, 3])
+        self.assertEqual(body['deleted'], [])
+        token = body['next_token']
+
+        _, body = self.changes(f'since={token}')
+        self.assertEqual((body['tasks'], body['deleted'], body['next_token']), ([], [], token))
+
+        self.client.put('/api/v1/tasks/2', json={'status': 'completed'})
+        self.client.delete('/api/v1/tasks/1')
+        self.client.post('/api/v1/tasks', json={'title': 'Task 4'})
+        _, body = self.changes(f'since={token}')
+        self.assertEqual([(task['id'], task['status']) for task in body['tasks']],
+                         [(2, 'completed'), (4, 'pending')])
+        self.assertEqual(body['deleted'], [1])
+
+    def test_changes_in_the_same_instant_are_not_lost(self):
+        _, body = self.changes()
+        token = body['next_token']
+        # Bulk updates share one timestamp; the sequence still orders them.
+        self.client.open('/api/v1/tasks:batch', method='PATCH',
+                         json=[{'id': 1, 'title': 'A'}, {'id': 2, 'title': 'B'}])
+        _, body = self.changes(f'since={token}&limit=1')
+        self.assertEqual([task['title'] for task in body['tasks']], ['A'])
+        self.assertTrue(body['has_more'])
+        _, body = self.changes(f"since={body['next_token']}&limit=1")
+        self.assertEqual([task['title'] for task in body['tasks']], ['B'])
+        self.assertFalse(body['has_more'])
+
+    def test_long_poll_wakes_on_commit(self):
+        _, body = self.changes()
+        token = body['next_token']
+
+        def write():
+            time.sleep(0.2)
+            self.app.test_client().post('/api/v1/tasks', json={'title': 'Late task'})
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        started = time.monotonic()
+        _, body = self.changes(f'since={token}&wait=5')
+        writer.join()
+        self.assertLess(time.monotonic() - started, 4)
+        self.assertEqual([task['title'] for task in body['tasks']], ['Late task'])
+
+        started = time.monotonic()
+        _, body = self.changes(f"since={body['next_token']}&wait=0.2")
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        self.assertEqual(body['tasks'], [])
+
+    def test_server_sent_events(self):
+        self.app.config['CHANGES_SSE_MAX_SECONDS'] = 0.3
+        self.app.config['CHANGES_SSE_KEEPALIVE'] = 0.1
+        res = self.client.get('/api/v1/tasks/changes', headers={'Accept': 'text/event-stream'})
+        self.assertEqual(res.mimetype, 'text/event-stream')
+        events = res.get_data(as_text=True).split('\n\n')
+        self.assertTrue(events[0].startswith('id: '))
+        self.assertIn('event: changes', events[0])
+        data = json.loads(events[0].split('data: ', 1)[1])
+        self.assertEqual(len(data['tasks']), 3)
+        self.assertIn(': keep-alive', events)
+
+    def test_invalid_and_expired_tokens(self):
+        status, _ = self.changes('since=not-a-token')
+        self.assertEqual(status, 400)
+        status, _ = self.changes(f'since={encode_token(99)}')
+        self.assertEqual(status, 410)
+
+        with self.app.app_context():
+            pruned = prune_changes(datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=1))
+        self.assertEqual(pruned, 3)
+        status, _ = self.changes(f'since={encode_token(1)}')
+        self.assertEqual(status, 410)
+        status, body = self.changes(f'since={encode_token(3)}')
+        self.assertEqual((status, body['tasks']), (200, []))
+
+    def test_sync_from_scratch_after_a_prune(self):
+        with self.app.app_context():
+            prune_changes(datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=1))
+        # The feed alone can no longer rebuild the full state...
+        status, body = self.changes()
+        self.assertEqual(status, 410)
+        resync_token = body['resync_token']
+
+        # ...so the client lists every task and follows the feed from the list's token.
+        res = self.client.get('/api/v1/tasks?limit=2')
+        token = res.headers['X-Change-Token']
+        self.assertEqual(token, resync_token)
+        tasks = json.loads(res.data)['tasks']
+        res = self.client.get(f"/api/v1/tasks?limit=2&after={json.loads(res.data)['next_cursor']}")
+        tasks += json.loads(res.data)['tasks']
+        self.assertEqual([task['id'] for task in tasks], [1, 2, 3])
+
+        self.client.put('/api/v1/tasks/3', json={'status': 'completed'})
+        status, body = self.changes(f'since={token}')
+        self.assertEqual(status, 200)
+        self.assertEqual([(task['id'], task['status']) for task in body['tasks']], [(3, 'completed')])
+        self.assertEqual(self.client.get('/api/v1/tasks?stream=ndjson').headers['X-Change-Token'],
+                         body['next_token'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.config import build_engine_options
+from simple_task_manager.src.engine import apply_sqlite_pragmas
+from simple_task_manager.src.models import db
+
+
+class EngineTuningTestCase(unittest.TestCase):
+    """Tests for engine pool profiles and SQLite connection pragmas"""
+
+    def test_engine_options(self):
+        self.assertEqual(build_engine_options('sqlite:///:memory:', 5, 5, 60), {})
+        self.assertEqual(build_engine_options(None, 5, 5, 60), {})
+        self.assertEqual(build_engine_options('postgresql://db/tasks', 10, 20, 1800),
+                         {'pool_size': 10, 'max_overflow': 20, 'pool_recycle': 1800, 'pool_pre_ping': True})
+
+    def test_pragmas_switch_file_database_to_wal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            connection = sqlite3.connect(os.path.join(tmp, 'tasks.db'))
+            apply_sqlite_pragmas(connection, {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 2500})
+            self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            self.assertEqual(connection.execute('PRAGMA synchronous').fetchone()[0], 1)
+            self.assertEqual(connection.execute('PRAGMA busy_timeout').fetchone()[0], 2500)
+            connection.close()
+
+    def test_app_connections_get_configured_pragmas(self):
+        app = create_app('test')
+        with app.app_context():
+            connection = db.session.connection()
+            self.assertEqual(connection.exec_driver_sql('PRAGMA busy_timeout').scalar(),
+                             app.config['SQLITE_PRAGMAS']['busy_timeout'])
+            self.assertEqual(connection.exec_driver_sql('PRAGMA cache_size').scalar(),
+                             app.config['SQLITE_PRAGMAS']['cache_size'])
+            db.session.remove()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import tempfile
+from sqlalchemy.exc import OperationalError
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.metrics import SLOW_LOG_MAX_STATEMENTS, Histogram
+from simple_task_manager.src.models import db
+
+
+class MetricsTestCase(unittest.TestCase):
+    """Tests for request/SQL instrumentation and the /metrics endpoint"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram((1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+        self.assertEqual(histogram.snapshot(), ([2, 3, 4], 14.5, 4))
+
+    def test_route_latency_and_statement_counts(self):
+        self.client.post('/api/v1/tasks', json={'title': 'Measured'})
+        self.client.get('/api/v1/tasks/1')
+        body = self.client.get('/metrics').data.decode()
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/api/v1/tasks/<int:task_id>",'
+                      'status="200"} 1', body)
+        # One SELECT on a cache miss
+        self.assertIn('http_request_db_statements_sum{method="GET",route="/api/v1/tasks/<int:task_id>"} 1', body)
+        self.assertIn('http_request_db_statements_count{method="POST",route="/api/v1/tasks"} 1', body)
+        self.assertIn('task_cache_misses_total 1', body)
+
+    def test_slow_request_log(self):
+        self.app.config['METRICS_SLOW_REQUEST_MS'] = 0.000001
+        with self.assertLogs(self.app.logger, level='WARNING') as logs:
+            self.client.get('/api/v1/tasks?status=pending')
+        self.assertIn('Slow request GET /api/v1/tasks', logs.output[0])
+        self.assertIn('FROM tasks', logs.output[0])
+
+    def test_slow_request_log_is_bounded(self):
+        self.app.config.update(METRICS_SLOW_REQUEST_MS=0.000001, BATCH_COMMIT_SIZE=1)
+        with self.assertLogs(self.app.logger, level='WARNING') as logs:
+            self.client.post('/api/v1/tasks:batch', json=[{'title': f'Task {i}'} for i in range(50)])
+        message = logs.output[0]
+        self.assertIn('50x INSERT INTO tasks', message)
+        self.assertLessEqual(len(message.splitlines()), SLOW_LOG_MAX_STATEMENTS + 2)
+        self.assertLess(len(message), 20000)
+
+    def test_failed_statements_do_not_leak_timers(self):
+        with self.app.app_context():
+            with db.engine.connect() as connection:
+                with self.assertRaises(OperationalError):
+                    connection.exec_driver_sql('SELECT * FROM missing_table')
+                self.assertEqual(connection.info['metrics_query_start'], [])
+
+    def test_sampled_profiling(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.app.config.update(METRICS_PROFILE_SAMPLE_RATE=1.0, METRICS_PROFILE_DIR=tmp)
+            self.client.get('/api/v1/tasks')
+            self.assertEqual(len(os.listdir(tmp)), 1)
+        self.assertIn('http_profiles_written_total 1', self.client.get('/metrics').data.decode())
+
+
+if __name__ == "__main__":
+    unittest.main()
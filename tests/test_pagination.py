@@ -0,0 +1,87 @@
+import unittest
+import json
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task
+from simple_task_manager.src.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+class TaskPaginationTestCase(unittest.TestCase):
+    """Tests for keyset pagination and streaming of the task list"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            statuses = ['pending', 'completed']
+            db.session.add_all([Task(title=f'Task {i}', status=statuses[i % 2]) for i in range(25)])
+            db.session.commit()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor([42])), [42])
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('not-a-cursor!')
+
+    def test_unpaginated_list_is_unchanged(self):
+        res = self.client.get('/api/v1/tasks')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(json.loads(res.data)), 25)
+
+    def test_pages_follow_next_cursor(self):
+        seen = []
+        url = '/api/v1/tasks?limit=10'
+        while True:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            page = json.loads(res.data)
+            seen.extend(task['id'] for task in page['tasks'])
+            if page['next_cursor'] is None:
+                break
+            url = f"/api/v1/tasks?limit=10&after={page['next_cursor']}"
+        self.assertEqual(seen, list(range(1, 26)))
+
+    def test_pagination_respects_status_filter(self):
+        res = self.client.get('/api/v1/tasks?status=completed&limit=5')
+        page = json.loads(res.data)
+        self.assertEqual([task['id'] for task in page['tasks']], [2, 4, 6, 8, 10])
+        self.assertIsNotNone(page['next_cursor'])
+
+    def test_invalid_limit_and_cursor(self):
+        self.assertEqual(self.client.get('/api/v1/tasks?limit=0').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/tasks?limit=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/tasks?after=garbage').status_code, 400)
+
+    def test_stream_json_array(self):
+        self.app.config['TASKS_STREAM_BATCH_SIZE'] = 4
+        res = self.client.get('/api/v1/tasks?stream=json')
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.is_streamed)
+        tasks = json.loads(res.data)
+        self.assertEqual([task['id'] for task in tasks], list(range(1, 26)))
+
+    def test_stream_ndjson(self):
+        self.app.config['TASKS_STREAM_BATCH_SIZE'] = 4
+        res = self.client.get('/api/v1/tasks?stream=ndjson&status=pending')
+        self.assertEqual(res.mimetype, 'application/x-ndjson')
+        lines = res.data.decode().splitlines()
+        self.assertEqual(len(lines), 13)
+        self.assertEqual(json.loads(lines[0]), {'id': 1, 'title': 'Task 0', 'status': 'pending'})
+
+    def test_stream_empty_table(self):
+        with self.app.app_context():
+            Task.query.delete()
+            db.session.commit()
+        res = self.client.get('/api/v1/tasks?stream=json')
+        self.assertEqual(json.loads(res.data), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import json
+from datetime import datetime, timedelta, timezone
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task
+from simple_task_manager.src.query_planner import build_task_query, explain_query_plan, plan_task_list
+from simple_task_manager.src.routes import VALID_STATUSES
+
+
+class QueryPlannerTestCase(unittest.TestCase):
+    """Tests for the task list filters and their index-backed query plans"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+        self.base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        with self.app.app_context():
+            db.create_all()
+            statuses = ['pending', 'in progress', 'completed']
+            db.session.add_all([
+                Task(title=f'Task {i}',
+                     status=statuses[i % 3],
+                     due_date=self.base + timedelta(days=i) if i % 4 else None,
+                     created_at=self.base + timedelta(hours=i),
+                     updated_at=self.base + timedelta(hours=2 * i))
+                for i in range(1, 41)
+            ])
+            db.session.commit()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def assert_uses_index(self, args, index_name):
+        with self.app.app_context():
+            plan = plan_task_list(args, VALID_STATUSES)
+            self.assertEqual(plan.index_name, index_name)
+            details = ' '.join(explain_query_plan(build_task_query(plan)))
+        self.assertIn(f'USING INDEX {index_name}', details)
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', details)
+
+    def test_status_filter_uses_status_id_index(self):
+        self.assert_uses_index({'status': 'pending'}, 'ix_tasks_status_id')
+
+    def test_status_and_due_range_use_status_due_date_index(self):
+        self.assert_uses_index({'status': 'pending', 'due_after': '2025-01-05T00:00:00Z',
+                                'due_before': '2025-01-20T00:00:00Z'}, 'ix_tasks_status_due_order')
+
+    def test_status_with_due_sort_uses_status_due_date_index(self):
+        self.assert_uses_index({'status': 'completed', 'sort': '-due_date'}, 'ix_tasks_status_due_order')
+
+    def test_status_and_created_window_use_status_created_at_index(self):
+        self.assert_uses_index({'status': 'in progress', 'created_after': '2025-01-01T05:00:00Z'},
+                               'ix_tasks_status_created_at')
+
+    def test_status_and_updated_window_use_status_updated_at_index(self):
+        self.assert_uses_index({'status': 'pending', 'updated_before': '2025-01-02T00:00:00Z'},
+                               'ix_tasks_status_updated_at')
+
+    def test_due_range_uses_due_date_index(self):
+        self.assert_uses_index({'due_after': '2025-01-10T00:00:00Z'}, 'ix_tasks_due_order')
+
+    def test_due_sort_cursors_seek_the_due_order_index(self):
+        for after in (['2025-01-10T00:00:00', 9], [None, 8]):
+            for args in ({'sort': 'due_date'}, {'status': 'pending', 'sort': '-due_date'}):
+                with self.app.app_context():
+                    plan = plan_task_list(args, VALID_STATUSES)
+                    details = ' '.join(explain_query_plan(build_task_query(plan, after=after)))
+                self.assertIn(f'SEARCH tasks USING INDEX {plan.index_name}', details)
+                self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', details)
+
+    def test_created_window_uses_created_at_index(self):
+        self.assert_uses_index({'created_after': '2025-01-01T03:00:00Z',
+                                'created_before': '2025-01-02T00:00:00Z'}, 'ix_tasks_created_at')
+
+    def test_updated_sort_uses_updated_at_index(self):
+        self.assert_uses_index({'sort': '-updated_at'}, 'ix_tasks_updated_at')
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/v1/tasks?sort=title').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/tasks?due_after=tomorrow').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/tasks?status=unknown').status_code, 400)
+
+    def test_due_range_filter_and_order(self):
+        res = self.client.get('/api/v1/tasks?due_after=2025-01-10T00:00:00Z&due_before=2025-01-15T00:00:00Z')
+        self.assertEqual([task['id'] for task in json.loads(res.data)], [9, 10, 11, 13])
+
+    def test_descending_due_date_pages(self):
+        seen = []
+        url = '/api/v1/tasks?status=pending&sort=-due_date&limit=3'
+        while url:
+            page = json.loads(self.client.get(url).data)
+            seen.extend(task['id'] for task in page['tasks'])
+            url = page['next_cursor'] and f"/api/v1/tasks?status=pending&sort=-due_date&limit=3&after={page['next_cursor']}"
+        undated = [i for i in range(40, 0, -1) if i % 3 == 0 and i % 4 == 0]
+        self.assertEqual(seen, undated + [i for i in range(40, 0, -1) if i % 3 == 0 and i % 4])
+
+    def test_due_date_sort_keeps_undated_tasks_last(self):
+        expected = [i for i in range(1, 41) if i % 4] + [i for i in range(1, 41) if i % 4 == 0]
+        res = self.client.get('/api/v1/tasks?sort=due_date')
+        self.assertEqual([task['id'] for task in json.loads(res.data)], expected)
+        res = self.client.get('/api/v1/tasks?sort=-due_date')
+        self.assertEqual([task['id'] for task in json.loads(res.data)], expected[::-1])
+
+    def test_due_date_pages_cross_into_undated_tasks(self):
+        seen = []
+        url = '/api/v1/tasks?sort=due_date&limit=7'
+        while url:
+            page = json.loads(self.client.get(url).data)
+            seen.extend(task['id'] for task in page['tasks'])
+            url = page['next_cursor'] and f"/api/v1/tasks?sort=due_date&limit=7&after={page['next_cursor']}"
+        self.assertEqual(seen, [i for i in range(1, 41) if i % 4] + [i for i in range(1, 41) if i % 4 == 0])
+
+    def test_due_range_excludes_undated_tasks(self):
+        res = self.client.get('/api/v1/tasks?due_after=2025-02-01T00:00:00Z')
+        self.assertEqual([task['id'] for task in json.loads(res.data)], [31, 33, 34, 35, 37, 38, 39])
+
+    def test_cursor_from_another_sort_is_rejected(self):
+        page = json.loads(self.client.get('/api/v1/tasks?limit=2').data)
+        res = self.client.get(f"/api/v1/tasks?sort=created_at&limit=2&after={page['next_cursor']}")
+        self.assertEqual(res.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
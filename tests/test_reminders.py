@@ -0,0 +1,260 @@
+import unittest
+import json
+import os
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task
+from simple_task_manager.src.query_planner import explain_query_plan
+from simple_task_manager.src.reminders import (
+    DueTask, DueTaskScheduler, ReminderService, WebhookStub, init_reminders, load_pending_due, pending_due_query,
+)
+
+START = datetime(2030, 1, 1)
+
+
+class FakeClock:
+    def __init__(self, now=START):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+        return self.now
+
+
+def synthetic_loader(count, completed=(), start=START, step=timedelta(seconds=1)):
+    """Open tasks 1..count due every ``step`` after ``start``, generated on demand."""
+    def loader(after, limit):
+        due_date, task_id = after
+        # Task i is due at start + i * step, so its key is (due(i), i).
+        first = max(1, int((due_date - start) / step))
+        while first <= count and (start + first * step, first) <= (due_date, task_id):
+            first += 1
+        for i in range(first, count + 1):
+            if i not in completed:
+                yield i, start + i * step
+    return loader
+
+
+def list_loader(tasks):
+    """Loader over a list of (id, due_date), re-sorted on every call like a query."""
+    def loader(after, limit):
+        rows = sorted(tasks, key=lambda task: (task[1], task[0]))
+        index = bisect_right([(due, task_id) for task_id, due in rows], after)
+        return iter(rows[index:index + limit])
+    return loader
+
+
+class DueTaskSchedulerTestCase(unittest.TestCase):
+    """Tests for the due-date min-heap scheduler"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.fired = []
+
+    def scheduler(self, loader, max_pending=100):
+        return DueTaskScheduler(loader, [self.fired.extend], clock=self.clock, max_pending=max_pending)
+
+    def test_fires_in_due_order_and_never_early(self):
+        tasks = [(1, START + timedelta(minutes=5)), (2, START + timedelta(minutes=1)),
+                 (3, START - timedelta(minutes=1)), (4, START + timedelta(minutes=1))]
+        scheduler = self.scheduler(list_loader(tasks))
+        scheduler.reload()
+        self.assertEqual(scheduler.tick(), [])  # task 3 was already due at start
+
+        scheduler.tick(self.clock.advance(seconds=59))
+        self.assertEqual(self.fired, [])
+        scheduler.tick(self.clock.advance(seconds=1))
+        self.assertEqual([task.id for task in self.fired], [2, 4])
+        self.assertEqual(scheduler.next_due(), START + timedelta(minutes=5))
+        scheduler.tick(self.clock.advance(hours=1))
+        self.assertEqual([task.id for task in self.fired], [2, 4, 1])
+        self.assertIsNone(scheduler.next_due())
+
+    def test_incremental_changes(self):
+        tasks = [(1, START + timedelta(minutes=1)), (2, START + timedelta(minutes=2))]
+        scheduler = self.scheduler(list_loader(tasks))
+        scheduler.reload()
+        scheduler.task_changed(1, START + timedelta(minutes=3), 'pending')  # rescheduled
+        scheduler.task_changed(2, START + timedelta(minutes=2), 'completed')
+        scheduler.task_changed(5, START + timedelta(seconds=30), 'in progress')  # created
+        scheduler.task_changed(6, START - timedelta(seconds=30), 'pending')  # already overdue
+        scheduler.task_changed(7, START + timedelta(minutes=4), 'pending')
+        scheduler.task_deleted(7)
+
+        scheduler.tick(self.clock.advance(minutes=10))
+        self.assertEqual(self.fired, [DueTask(5, START + timedelta(seconds=30)),
+                                      DueTask(1, START + timedelta(minutes=3))])
+
+    def test_changes_beyond_the_window_wait_for_the_loader(self):
+        tasks = [(i, START + timedelta(minutes=i)) for i in range(1, 11)]
+        scheduler = self.scheduler(list_loader(tasks), max_pending=4)
+        scheduler.reload()
+        self.assertEqual(len(scheduler), 4)
+        tasks.append((11, START + timedelta(minutes=8, seconds=30)))
+        scheduler.task_changed(11, START + timedelta(minutes=8, seconds=30), 'pending')
+        self.assertEqual(len(scheduler), 4)  # past the window: not held yet
+
+        scheduler.tick(self.clock.advance(minutes=20))
+        self.assertEqual([task.id for task in self.fired], [1, 2, 3, 4, 5, 6, 7, 8, 11, 9, 10])
+
+    def test_inserts_trim_the_window(self):
+        scheduler = self.scheduler(list_loader([]), max_pending=8)
+        scheduler.reload()
+        for i in range(1, 21):
+            scheduler.task_changed(i, START + timedelta(minutes=21 - i), 'pending')
+            self.assertLessEqual(len(scheduler), 8)
+        self.assertEqual(scheduler.next_due(), START + timedelta(minutes=1))
+
+    def test_handler_errors_do_not_stop_other_handlers(self):
+        def broken(due):
+            raise RuntimeError("receiver down")
+
+        stub = WebhookStub()
+        scheduler = DueTaskScheduler(list_loader([(1, START + timedelta(seconds=1))]), [broken, stub],
+                                     clock=self.clock)
+        scheduler.reload()
+        with self.assertLogs('simple_task_manager.src.reminders', level='ERROR'):
+            scheduler.tick(self.clock.advance(seconds=1))
+        self.assertEqual(list(stub.deliveries), [
+            {'event': 'tasks.due', 'tasks': [{'id': 1, 'due_date': '2030-01-01T00:00:01'}]}])
+
+    def test_million_pending_tasks_with_bounded_memory(self):
+        count, max_pending = 1_000_000, 10_000
+        completed = set()
+        scheduler = self.scheduler(synthetic_loader(count, completed), max_pending=max_pending)
+        fired = 0
+        last = None
+
+        def check_order(due):
+            nonlocal fired, last
+            fired += len(due)
+            self.assertGreater(due[0].due_date, last or START)
+            last = due[-1].due_date
+
+        scheduler.handlers = [check_order]
+        scheduler.reload()
+        peak_window = 0
+        for step in range(1, 101):
+            # Complete a task that is held and one that is not loaded yet.
+            for task_id in (step * 10_000 - 5_000, min(step * 10_000 + 15_000, count)):
+                completed.add(task_id)
+                scheduler.task_changed(task_id, None, 'completed')
+            scheduler.tick(self.clock.advance(seconds=10_000))
+            peak_window = max(peak_window, len(scheduler))
+            # Memory is the held window plus superseded entries awaiting compaction.
+            self.assertLessEqual(scheduler.heap_size, 2 * max_pending + 64)
+
+        self.assertLessEqual(peak_window, max_pending)
+        # Every task fired once, minus the ones completed during the run.
+        self.assertEqual(fired + len(scheduler), count - len(completed))
+        self.assertEqual(len(scheduler), 0)
+        self.assertLess(scheduler.loads, 2 * count // max_pending + 10)
+
+
+class ReminderServiceTestCase(unittest.TestCase):
+    """Tests for the scheduler driven by the tasks table and the change feed"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+        self.clock = FakeClock()
+        self.stub = WebhookStub()
+
+        with self.app.app_context():
+            db.create_all()
+            db.session.add_all([
+                Task(title='Soon', due_date=START + timedelta(minutes=1)),
+                Task(title='Done', status='completed', due_date=START + timedelta(minutes=1)),
+                Task(title='Later', status='in progress', due_date=START + timedelta(minutes=5)),
+                Task(title='No due date'),
+            ])
+            db.session.commit()
+        scheduler = DueTaskScheduler(load_pending_due, [self.stub], clock=self.clock, max_pending=100)
+        self.service = ReminderService(self.app, scheduler)
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def fired_ids(self):
+        return [task['id'] for payload in self.stub.deliveries for task in payload['tasks']]
+
+    def test_loader_uses_the_status_due_date_index(self):
+        with self.app.app_context():
+            details = ' '.join(explain_query_plan(pending_due_query('pending', (START, 0), 100)))
+        self.assertIn('INDEX ix_tasks_status_due_date', details)
+        self.assertNotIn('SCAN', details)
+        self.assertNotIn('TEMP B-TREE', details)
+
+    def test_fires_open_tasks_and_follows_writes(self):
+        self.service.run_once()
+        self.assertEqual(self.service.scheduler.next_due(), START + timedelta(minutes=1))
+
+        self.client.post('/api/v1/tasks', json={'title': 'New', 'due_date': '2030-01-01T00:00:30Z'})
+        self.client.put('/api/v1/tasks/3', json={'status': 'completed'})
+        self.clock.advance(minutes=10)
+        wait = self.service.run_once()
+
+        self.assertEqual(self.fired_ids(), [5, 1])
+        self.assertEqual(wait, self.service.poll_interval)
+
+    def test_bulk_writes_are_seen_through_the_change_feed(self):
+        self.service.run_once()
+        self.client.open('/api/v1/tasks:batch', method='PATCH',
+                         json=[{'id': 1, 'due_date': '2030-01-01T00:02:00Z'}, {'id': 4, 'due_date': '2030-01-01T00:01:00Z'}])
+        self.clock.advance(minutes=1)
+        self.service.run_once()
+        self.assertEqual(self.fired_ids(), [4])
+        response = self.client.get('/api/v1/tasks/4')
+        self.assertEqual(json.loads(response.data)['status'], 'pending')
+
+    def test_background_service_is_woken_by_commits(self):
+        self.app.config.update(REMINDERS_ENABLED=True, REMINDER_HANDLERS='webhook')
+        service = init_reminders(self.app)
+        try:
+            # Building the app starts nothing; the first request does.
+            self.assertIsNone(service._thread)
+            stub = service.scheduler.handlers[0]
+            due = (datetime.now(timezone.utc) + timedelta(milliseconds=300)).isoformat()
+            response = self.client.post('/api/v1/tasks', json={'title': 'Ping', 'due_date': due})
+            task_id = json.loads(response.data)['id']
+            thread = service._thread
+            self.assertTrue(thread.is_alive())
+            self.client.get('/health')
+            self.assertIs(service._thread, thread)
+            deadline = time.monotonic() + 5
+            while not stub.deliveries and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertEqual([task['id'] for task in stub.deliveries[0]['tasks']], [task_id])
+        finally:
+            service.stop()
+        self.assertIsNone(service._thread)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires fork")
+    def test_a_forked_worker_starts_its_own_thread(self):
+        self.app.config.update(REMINDERS_ENABLED=True, REMINDER_HANDLERS='log')
+        service = init_reminders(self.app)
+        service.start()
+        try:
+            pid = os.fork()
+            if pid == 0:
+                inherited = service._thread
+                self.client.get('/health')
+                started = service._thread is not inherited and service._thread.is_alive()
+                os._exit(0 if started else 1)
+            _, status = os.waitpid(pid, 0)
+            self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        finally:
+            service.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import json
+from datetime import datetime
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task
+from simple_task_manager.src.schemas import (
+    error_summary, validate_batch_update, validate_task_create, validate_task_update,
+)
+
+
+class SchemaValidatorTestCase(unittest.TestCase):
+    """Tests for the compiled request validators"""
+
+    def test_create_normalizes_values(self):
+        values, errors = validate_task_create({'title': 'Write', 'due_date': '2030-01-02T03:00:00+02:00'})
+        self.assertIsNone(errors)
+        self.assertEqual(values, {'title': 'Write', 'due_date': datetime(2030, 1, 2, 1)})
+
+        values, _ = validate_task_create({'title': 'Write', 'due_date': '2030-01-02T03:00:00Z'})
+        self.assertEqual(values['due_date'], datetime(2030, 1, 2, 3))
+        values, _ = validate_task_create({'title': 'Write', 'due_date': ''})
+        self.assertIsNone(values['due_date'])
+
+    def test_collects_every_error(self):
+        values, errors = validate_task_create({'title': 'x' * 121, 'due_date': 'soon', 'description': 5, 'owner': 'me'})
+        self.assertIsNone(values)
+        self.assertEqual(set(errors), {'title', 'due_date', 'description', 'owner'})
+        self.assertEqual(error_summary(errors), 'Invalid payload')
+
+        _, errors = validate_task_create({})
+        self.assertEqual(errors, {'title': 'title is required.'})
+        self.assertEqual(error_summary(errors), 'Invalid payload')
+
+        _, errors = validate_task_create(['not', 'an', 'object'])
+        self.assertIn('payload', errors)
+
+    def test_single_error_keeps_its_message(self):
+        _, errors = validate_task_update({'status': 'done'})
+        self.assertEqual(error_summary(errors), 'Invalid status. Allowed: completed, in progress, pending')
+        _, errors = validate_task_update({'title': ''})
+        self.assertEqual(error_summary(errors), 'Title is invalid')
+
+    def test_batch_update_checks_ids(self):
+        for bad_id in (0, -1, True, '1'):
+            _, errors = validate_batch_update({'id': bad_id, 'title': 'A'})
+            self.assertEqual(errors, {'id': 'id must be a positive integer'})
+        values, errors = validate_batch_update({'id': 3, 'due_date': None})
+        self.assertEqual((values, errors), ({'id': 3, 'due_date': None}, None))
+
+
+class SchemaEndpointTestCase(unittest.TestCase):
+    """Tests for validation errors returned by the task endpoints"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            db.session.add(Task(title='Existing'))
+            db.session.commit()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_create_reports_all_errors(self):
+        res = self.client.post('/api/v1/tasks', json={'title': '', 'due_date': 'soon'})
+        self.assertEqual(res.status_code, 400)
+        body = json.loads(res.data)
+        self.assertEqual(body['error'], 'Invalid payload')
+        self.assertEqual(set(body['details']), {'title', 'due_date'})
+
+    def test_update_is_all_or_nothing(self):
+        res = self.client.put('/api/v1/tasks/1', json={'title': 'Renamed', 'status': 'done'})
+        self.assertEqual(res.status_code, 400)
+        with self.app.app_context():
+            self.assertEqual(db.session.get(Task, 1).title, 'Existing')
+
+        res = self.client.put('/api/v1/tasks/1', json={'due_date': '2030-01-02T03:00:00+02:00'})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(json.loads(res.data)['due_date'], '2030-01-02T01:00:00')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import json
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task
+from simple_task_manager.src.search import build_match_expression
+
+
+class TaskSearchTestCase(unittest.TestCase):
+    """Tests for full-text search over task titles and descriptions"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            db.session.add_all([
+                Task(title='Quarterly report', description='Draft the finance report for Q3'),
+                Task(title='Groceries', description='Milk, eggs and a report card folder'),
+                Task(title='Report bug', description='Crash when saving'),
+                Task(title='Plan offsite', description='Book venue'),
+            ])
+            db.session.commit()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def search(self, query):
+        res = self.client.get(f'/api/v1/tasks/search?{query}')
+        return res.status_code, json.loads(res.data)
+
+    def test_ranked_results_with_snippets(self):
+        status, body = self.search('q=report')
+        self.assertEqual(status, 200)
+        ids = [task['id'] for task in body['tasks']]
+        self.assertEqual(sorted(ids), [1, 2, 3])
+        self.assertEqual(ids[-1], 2)  # description-only match ranks last
+        self.assertIn('[report]', body['tasks'][-1]['snippet'])
+
+    def test_prefix_search_and_pagination(self):
+        _, first = self.search('q=rep*&limit=2')
+        self.assertEqual(len(first['tasks']), 2)
+        _, second = self.search(f"q=rep*&limit=2&after={first['next_cursor']}")
+        self.assertEqual(len(second['tasks']), 1)
+        self.assertIsNone(second['next_cursor'])
+        seen = [task['id'] for task in first['tasks'] + second['tasks']]
+        self.assertEqual(sorted(seen), [1, 2, 3])
+
+    def test_index_follows_writes(self):
+        self.client.put('/api/v1/tasks/4', json={'title': 'Plan report review'})
+        self.client.delete('/api/v1/tasks/3')
+        self.client.open('/api/v1/tasks:batch', method='POST', json=[{'title': 'Imported report'}])
+        _, body = self.search('q=report')
+        self.assertEqual(sorted(task['id'] for task in body['tasks']), [1, 2, 4, 5])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(build_match_expression('a "b" OR c*'), '"a" """b""" "OR" "c"*')
+        status, body = self.search('q=%22report%20OR')
+        self.assertEqual(status, 200)
+        self.assertEqual(body['tasks'], [])
+
+    def test_missing_query(self):
+        status, _ = self.search('q=%20')
+        self.assertEqual(status, 400)
+
+    def test_reindex_command(self):
+        with self.app.app_context():
+            db.session.execute(db.text("INSERT INTO tasks_fts(tasks_fts) VALUES ('delete-all')"))
+            db.session.commit()
+        self.assertEqual(self.search('q=report')[1]['tasks'], [])
+        result = self.app.test_cli_runner().invoke(args=['tasks', 'reindex'])
+        self.assertIn('Indexed 4 tasks', result.output)
+        self.assertEqual(len(self.search('q=report')[1]['tasks']), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
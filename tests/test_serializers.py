@@ -0,0 +1,65 @@
+import unittest
+import json
+from datetime import datetime, timezone
+from unittest import mock
+from simple_task_manager.src import serializers
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task
+
+
+class SerializerTestCase(unittest.TestCase):
+    """Tests for the fast serialization path"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+            db.session.add_all([
+                Task(title='With due date', description='d', due_date=datetime(2025, 5, 1, 9, 30, tzinfo=timezone.utc)),
+                Task(title='Without due date', created_at=datetime(2025, 1, 1, 0, 0, 0, 250, tzinfo=timezone.utc)),
+            ])
+            db.session.commit()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_detail_matches_to_dict(self):
+        with self.app.app_context():
+            for task in Task.query.all():
+                self.assertEqual(serializers.fetch_task_detail(task.id), task.to_dict(detailed=True))
+            self.assertIsNone(serializers.fetch_task_detail(99))
+
+    def test_format_db_datetime(self):
+        self.assertEqual(serializers.format_db_datetime('2025-05-01 09:30:00.000000'), '2025-05-01T09:30:00')
+        self.assertEqual(serializers.format_db_datetime('2025-05-01 09:30:00.000250'), '2025-05-01T09:30:00.000250')
+        self.assertIsNone(serializers.format_db_datetime(None))
+        self.assertEqual(serializers.format_db_datetime(datetime(2025, 5, 1, 9, 30)), '2025-05-01T09:30:00')
+
+    def test_detail_item_accepts_datetime_rows(self):
+        # Drivers other than sqlite3 return datetimes for DETAIL_COLUMNS.
+        with self.app.app_context():
+            for task in Task.query.all():
+                row = db.session.execute(db.select(*Task.__table__.c).where(Task.id == task.id)).one()
+                self.assertIsInstance(row.created_at, datetime)
+                self.assertEqual(serializers.detail_item(row), task.to_dict(detailed=True))
+
+    def test_stdlib_fallback(self):
+        with mock.patch.object(serializers, 'orjson', None):
+            self.assertEqual(serializers.json_dumps({'a': [1, 'b']}), b'{"a":[1,"b"]}')
+
+    def test_list_view_shape(self):
+        res = self.client.get('/api/v1/tasks')
+        self.assertEqual(json.loads(res.data), [
+            {'id': 1, 'title': 'With due date', 'status': 'pending'},
+            {'id': 2, 'title': 'Without due date', 'status': 'pending'},
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
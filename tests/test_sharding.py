@@ -0,0 +1,192 @@
+import unittest
+import json
+import os
+import tempfile
+import threading
+from unittest import mock
+from flask import Flask
+from sqlalchemy import text
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.config import TestingConfig
+from simple_task_manager.src.models import db
+from simple_task_manager.src.sharding import TaskShards, get_task_shards, init_task_shards, shard_for
+
+SHARD_COUNT = 3
+
+
+def shard_uris(directory, count):
+    return ['sqlite:///' + os.path.join(directory, f'shard{i}.db') for i in range(count)]
+
+
+class TaskShardsTestCase(unittest.TestCase):
+    """Tests for the shard-aware id allocator and routing"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.shards = TaskShards(shard_uris(self.tmp.name, SHARD_COUNT))
+        self.shards.create_all()
+
+    def tearDown(self):
+        self.shards.dispose()
+        self.tmp.cleanup()
+
+    def test_ids_are_allocated_by_their_owning_shard(self):
+        ids = [self.shards.create({'title': f'Task {i}'})['id'] for i in range(9)]
+        self.assertEqual(sorted(ids), list(range(1, 10)))
+        for task_id in ids:
+            with self.shards.engine_for(task_id).connect() as connection:
+                stored = connection.exec_driver_sql("SELECT id FROM tasks WHERE id = ?", (task_id,)).scalar()
+            self.assertEqual(stored, task_id)
+        self.assertEqual(shard_for(4, SHARD_COUNT), 0)
+
+    def test_concurrent_creates_never_collide(self):
+        ids = []
+
+        def create_many():
+            for i in range(30):
+                ids.append(self.shards.create({'title': 'Concurrent'})['id'])
+
+        threads = [threading.Thread(target=create_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(ids)), 120)
+        self.assertTrue(all(self.shards.get(task_id) is not None for task_id in ids))
+
+    def test_in_memory_shards_are_rejected(self):
+        with self.assertRaises(ValueError):
+            TaskShards(['sqlite://'])
+
+    def test_app_shards_use_the_engine_options_and_pragmas(self):
+        app = Flask(__name__)
+        app.config.update(TASK_SHARDS=shard_uris(self.tmp.name, 2), SQLITE_PRAGMAS={'busy_timeout': 1234},
+                          SQLALCHEMY_ENGINE_OPTIONS={'pool_size': 3, 'max_overflow': 1, 'pool_recycle': 60})
+        shards = init_task_shards(app)
+        try:
+            for engine in shards.engines:
+                self.assertEqual((engine.pool.size(), engine.pool._recycle), (3, 60))
+                with engine.connect() as connection:
+                    self.assertEqual(connection.execute(text('PRAGMA busy_timeout')).scalar(), 1234)
+        finally:
+            shards.dispose()
+
+
+class ShardedApiTestCase(unittest.TestCase):
+    """Tests for the API on sharded task storage"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(TestingConfig, 'TASK_SHARDS', shard_uris(self.tmp.name, SHARD_COUNT))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            get_task_shards().create_all()
+
+        # Later tasks are due earlier; every third one is completed.
+        self.ids = []
+        for i in range(1, 11):
+            response = self.client.post('/api/v1/tasks', json={'title': f'Task {i}',
+                                                               'due_date': f'2030-01-{11 - i:02d}T09:00:00Z'})
+            self.ids.append(json.loads(response.data)['id'])
+            if i % 3 == 0:
+                self.client.put(f'/api/v1/tasks/{self.ids[-1]}', json={'status': 'completed'})
+        self.ids.sort()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            get_task_shards().dispose()
+            db.session.remove()
+            db.drop_all()
+        self.tmp.cleanup()
+
+    def get_json(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return json.loads(response.data)
+
+    def test_tasks_are_spread_across_shards(self):
+        shards = self.app.extensions['task_shards']
+        counts = []
+        for engine in shards.engines:
+            with engine.connect() as connection:
+                counts.append(connection.exec_driver_sql("SELECT count(*) FROM tasks").scalar())
+        self.assertEqual(sum(counts), 10)
+        self.assertTrue(all(counts))
+        with self.app.app_context():
+            self.assertEqual(db.session.execute(db.text("SELECT count(*) FROM tasks")).scalar(), 0)
+
+    def test_ids_fit_the_shard_count(self):
+        # Round-robin over three shards that each hand out their own ids.
+        self.assertEqual(len(set(self.ids)), 10)
+        self.assertLessEqual(max(self.ids), 12)
+
+    def test_get_update_and_delete_are_routed(self):
+        task_id = self.ids[6]
+        task = self.get_json(f'/api/v1/tasks/{task_id}')
+        self.assertTrue(task['title'].startswith('Task '))
+
+        response = self.client.put(f'/api/v1/tasks/{task_id}', json={'title': 'Renamed'})
+        self.assertEqual(json.loads(response.data)['title'], 'Renamed')
+        self.assertEqual(response.headers['ETag'], f'"{task["version"] + 1}"')
+        self.assertEqual(self.get_json(f'/api/v1/tasks/{task_id}')['title'], 'Renamed')
+        self.assertEqual(self.client.put('/api/v1/tasks/99', json={'title': 'x'}).status_code, 404)
+        self.assertEqual(self.client.put(f'/api/v1/tasks/{task_id}', json={'title': ''}).status_code, 400)
+        stale = self.client.put(f'/api/v1/tasks/{task_id}', json={'title': 'Stale'},
+                                headers={'If-Match': f'"{task["version"]}"'})
+        self.assertEqual((stale.status_code, stale.headers['ETag']), (412, response.headers['ETag']))
+
+        self.assertEqual(self.client.delete(f'/api/v1/tasks/{task_id}').status_code, 204)
+        self.assertEqual(self.client.get(f'/api/v1/tasks/{task_id}').status_code, 404)
+        self.assertEqual(self.client.delete(f'/api/v1/tasks/{task_id}').status_code, 404)
+
+    def test_shard_statements_are_measured(self):
+        self.client.get(f'/api/v1/tasks/{self.ids[1]}')
+        body = self.client.get('/metrics').data.decode()
+        self.assertIn('http_request_db_statements_sum{method="GET",route="/api/v1/tasks/<int:task_id>"} 1', body)
+
+    def test_list_is_merged_in_id_order(self):
+        tasks = self.get_json('/api/v1/tasks')
+        self.assertEqual([task['id'] for task in tasks], self.ids)
+        completed = [task['id'] for task in tasks if task['status'] == 'completed']
+        self.assertEqual(len(completed), 3)
+        self.assertEqual([task['id'] for task in self.get_json('/api/v1/tasks?status=completed')], completed)
+
+    def test_pages_follow_the_merged_order(self):
+        by_due_date = sorted(self.ids, key=lambda task_id: self.get_json(f'/api/v1/tasks/{task_id}')['due_date'])
+        # Undated tasks, on different shards, sort after the dated ones.
+        undated = [json.loads(self.client.post('/api/v1/tasks', json={'title': f'Undated {i}'}).data)['id']
+                   for i in range(3)]
+        self.ids = sorted(self.ids + undated)
+        by_due_date += sorted(undated)
+        for sort, expected in (('id', self.ids), ('-id', self.ids[::-1]),
+                               ('due_date', by_due_date), ('-due_date', by_due_date[::-1])):
+            seen, cursor = [], None
+            while True:
+                url = f'/api/v1/tasks?limit=4&sort={sort}' + (f'&after={cursor}' if cursor else '')
+                page = self.get_json(url)
+                seen += [task['id'] for task in page['tasks']]
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+            self.assertEqual(seen, expected, sort)
+
+    def test_stream_merges_every_shard(self):
+        response = self.client.get('/api/v1/tasks?stream=ndjson&sort=-id')
+        ids = [json.loads(line)['id'] for line in response.data.splitlines()]
+        self.assertEqual(ids, self.ids[::-1])
+
+    def test_single_database_features_answer_501(self):
+        self.assertEqual(self.client.get('/api/v1/tasks/search?q=task').status_code, 501)
+        self.assertEqual(self.client.get('/api/v1/tasks/stats').status_code, 501)
+        self.assertEqual(self.client.get('/api/v1/tasks/changes').status_code, 501)
+        self.assertEqual(self.client.post('/api/v1/tasks:batch', json=[{'title': 'x'}]).status_code, 501)
+
+
+if __name__ == "__main__":
+    unittest.main()
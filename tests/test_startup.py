@@ -0,0 +1,33 @@
+import unittest
+import os
+import tempfile
+from simple_task_manager.benchmarks.bench_startup import (
+    DEFAULT_BUDGET_MS, ENTRY_POINTS, best_of, is_deferred, serving_env,
+)
+
+
+class StartupBudgetTestCase(unittest.TestCase):
+    """Tests for the serving-mode start-up budget"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.result = best_of(ENTRY_POINTS['serving'], repeat=3, env=serving_env(cls.tmp.name))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_serving_mode_defers_cli_and_disabled_subsystems(self):
+        imported = set(self.result['modules'])
+        self.assertIn('flask', imported)
+        self.assertIn('simple_task_manager.src.routes', imported)
+        self.assertEqual([module for module in imported if is_deferred(module)], [])
+
+    def test_start_up_is_within_budget(self):
+        budget = float(os.environ.get('STARTUP_BUDGET_MS', DEFAULT_BUDGET_MS))
+        self.assertLessEqual(self.result['total_ms'], budget)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import json
+from datetime import datetime
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task, TaskStat
+from simple_task_manager.src.stats import check_task_stats, read_task_stats
+
+
+class TaskStatsTestCase(unittest.TestCase):
+    """Tests for the materialized status counters"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+        self.runner = self.app.test_cli_runner()
+
+        with self.app.app_context():
+            db.create_all()
+            db.session.add_all([
+                Task(title='No due date'),
+                Task(title='Overdue', due_date=datetime(2030, 1, 1, 9)),
+                Task(title='Later today', due_date=datetime(2030, 1, 2, 18)),
+                Task(title='Done', status='completed', due_date=datetime(2030, 1, 1, 9)),
+                Task(title='Next week', status='in progress', due_date=datetime(2030, 1, 9)),
+            ])
+            db.session.commit()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def stats(self):
+        with self.app.app_context():
+            return read_task_stats(now=datetime(2030, 1, 2, 12))
+
+    def test_counters_split_by_status_and_due_date(self):
+        stats = self.stats()
+        self.assertEqual(stats['total'], 5)
+        self.assertEqual(stats['by_status'], {'completed': 1, 'in progress': 1, 'pending': 3})
+        self.assertEqual(stats['open_by_due'], {'overdue': 1, 'today': 1, 'upcoming': 1, 'none': 1})
+
+    def test_time_of_day_splits_today(self):
+        with self.app.app_context():
+            stats = read_task_stats(now=datetime(2030, 1, 2, 19))
+        self.assertEqual(stats['open_by_due']['overdue'], 2)
+        self.assertEqual(stats['open_by_due']['today'], 0)
+
+    def test_counters_follow_writes(self):
+        self.client.put('/api/v1/tasks/2', json={'status': 'completed'})
+        self.client.put('/api/v1/tasks/1', json={'due_date': '2030-01-01T00:00:00Z'})
+        self.client.delete('/api/v1/tasks/5')
+        self.client.post('/api/v1/tasks', json={'title': 'New'})
+        self.client.open('/api/v1/tasks:batch', method='PATCH', json=[{'id': 3, 'status': 'in progress'}])
+
+        stats = self.stats()
+        self.assertEqual(stats['by_status'], {'completed': 2, 'in progress': 1, 'pending': 2})
+        self.assertEqual(stats['open_by_due'], {'overdue': 1, 'today': 1, 'upcoming': 0, 'none': 1})
+        with self.app.app_context():
+            self.assertEqual(check_task_stats(), [])
+
+    def test_endpoint(self):
+        res = self.client.get('/api/v1/tasks/stats')
+        self.assertEqual(res.status_code, 200)
+        body = json.loads(res.data)
+        self.assertEqual(body['total'], 5)
+        self.assertIn('open_by_due', body)
+
+    def test_reconcile_repairs_drift(self):
+        with self.app.app_context():
+            db.session.execute(db.update(TaskStat).where(TaskStat.status == 'pending', TaskStat.due_day == '')
+                               .values(count=7))
+            db.session.commit()
+
+        result = self.runner.invoke(args=['tasks', 'reconcile-stats', '--check'])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("stored 7, actual 1", result.output)
+
+        result = self.runner.invoke(args=['tasks', 'reconcile-stats'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('counters match', result.output)
+        self.assertEqual(self.stats()['by_status']['pending'], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
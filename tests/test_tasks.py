@@ -34,6 +34,16 @@ class TaskApiTestCase(unittest.TestCase):
         data = json.loads(res.data)
         self.assertEqual(data['status'], 'healthy')
 
+    def test_failed_create_does_not_leak_the_error(self):
+        """A database error is logged, not returned to the client."""
+        with self.app.app_context():
+            db.session.execute(db.text('DROP TABLE tasks'))
+        with self.assertLogs(self.app.logger, 'ERROR') as logs:
+            res = self.client.post('/api/v1/tasks', json=self.task_payload)
+        self.assertEqual(res.status_code, 500)
+        self.assertEqual(json.loads(res.data), {'error': 'Could not create task'})
+        self.assertTrue(logs.output[0].endswith('Error creating task: OperationalError'))
+
 # SAARTHI-20250603131546: HIGH | COMPLETENESS
 # ISSUE: Test coverage is very low.
 # POLICY: Policy 4.1: Core business logic and utility functions must have unit tests. Policy 4.2: API endpoints should have integration tests covering common success and failure scenarios.
@@ -0,0 +1,224 @@
+import unittest
+import gzip
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+from itertools import zip_longest
+from unittest import mock
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.config import TestingConfig
+from simple_task_manager.src.models import db, Task
+from simple_task_manager.src.transfer import (
+    TransferError, export_tasks, import_tasks, iter_task_records, read_records,
+)
+
+# Rows in the full round trip; lower it for a quick run.
+ROUND_TRIP_ROWS = int(os.environ.get('TRANSFER_TEST_ROWS', 1_000_000))
+
+CREATED = datetime(2030, 1, 1, 12)
+
+
+def generated_record(task_id):
+    """The exported form of synthetic task ``task_id``."""
+    return {
+        'id': task_id,
+        'title': f'Task {task_id}',
+        'description': None if task_id % 3 == 0 else f'Line one\nline "two", task {task_id}',
+        'due_date': None if task_id % 5 == 0 else (CREATED + timedelta(hours=task_id)).isoformat(),
+        'status': ('pending', 'in progress', 'completed')[task_id % 3],
+        'created_at': CREATED.isoformat(),
+        'updated_at': (CREATED + timedelta(seconds=task_id, microseconds=task_id % 1000)).isoformat(),
+        'version': 1 + task_id % 4,
+    }
+
+
+def write_ndjson(path, records, opener=open):
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+class TransferTestCase(unittest.TestCase):
+    """Tests for the bulk export and import commands"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = create_app('test')
+        self.target = create_app('test')
+        for app in (self.source, self.target):
+            with app.app_context():
+                db.create_all()
+        with self.source.app_context():
+            db.session.add_all([
+                Task(title='Plain'),
+                Task(title='Ünïcode ✓', description='Commas, "quotes"\nand a newline', status='in progress',
+                     due_date=datetime(2030, 2, 1, 9, 30)),
+                Task(title='Done', description='x', status='completed', due_date=datetime(2030, 1, 1)),
+            ])
+            db.session.commit()
+            db.session.delete(db.session.get(Task, 1))  # ids with a gap
+            db.session.add(Task(title='After the gap'))
+            db.session.commit()
+
+    def tearDown(self):
+        """Executed after each test"""
+        for app in (self.source, self.target):
+            with app.app_context():
+                db.session.remove()
+                db.drop_all()
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def records(self, app):
+        with app.app_context():
+            return list(iter_task_records(2))
+
+    def test_ndjson_round_trip(self):
+        path = self.path('tasks.ndjson')
+        with self.source.app_context():
+            self.assertEqual(export_tasks(path, batch_size=2), 3)
+        self.assertFalse(os.path.exists(path + '.part'))
+        with self.target.app_context():
+            self.assertEqual(import_tasks(path, batch_size=2), 3)
+        self.assertEqual(self.records(self.target), self.records(self.source))
+        self.assertEqual([record['id'] for record in self.records(self.target)], [2, 3, 4])
+
+    def test_gzipped_csv_round_trip_through_the_cli(self):
+        path = self.path('tasks.csv.gz')
+        result = self.source.test_cli_runner().invoke(args=['tasks', 'export', path, '--batch-size', '2'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Exported 3 tasks', result.output)
+        self.assertIn('rows/s', result.output)
+        with gzip.open(path, 'rt', newline='') as f:
+            self.assertTrue(f.readline().startswith('id,title,description,due_date'))
+
+        result = self.target.test_cli_runner().invoke(args=['tasks', 'import', path])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Imported 3 tasks', result.output)
+        self.assertEqual(self.records(self.target), self.records(self.source))
+        self.assertFalse(os.path.exists(path + '.checkpoint'))
+
+        # New tasks continue after the imported ids.
+        response = self.target.test_client().post('/api/v1/tasks', json={'title': 'New'})
+        self.assertEqual(json.loads(response.data)['id'], 5)
+
+    def test_resume_after_an_invalid_record(self):
+        path, checkpoint = self.path('tasks.ndjson'), self.path('tasks.checkpoint')
+        records = [generated_record(i) for i in range(1, 2501)]
+        records[1699]['title'] = ''
+        write_ndjson(path, records)
+
+        with self.target.app_context():
+            with self.assertRaisesRegex(TransferError, 'Record 1700: Title is invalid'):
+                import_tasks(path, batch_size=500, checkpoint=checkpoint)
+            self.assertEqual(db.session.query(Task).count(), 1500)
+
+            records[1699]['title'] = 'Fixed'
+            write_ndjson(path, records)
+            with self.assertRaisesRegex(TransferError, 'checkpoint from an earlier import'):
+                import_tasks(path, batch_size=500, checkpoint=checkpoint)
+            self.assertEqual(import_tasks(path, batch_size=500, checkpoint=checkpoint, resume=True), 1000)
+            self.assertEqual(db.session.query(Task).count(), 2500)
+            self.assertEqual(db.session.get(Task, 1700).title, 'Fixed')
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_resume_skips_a_batch_committed_after_the_last_checkpoint(self):
+        path, checkpoint = self.path('tasks.ndjson'), self.path('tasks.checkpoint')
+        write_ndjson(path, [generated_record(i) for i in range(1, 11)])
+        with self.target.app_context():
+            with self.assertRaises(TransferError):
+                import_tasks(path, batch_size=4, checkpoint=checkpoint, progress=self.fail_after(2))
+            self.assertEqual(db.session.query(Task).count(), 8)
+            # As if the process died after committing the second batch but
+            # before saving its checkpoint.
+            with open(checkpoint, 'w') as f:
+                json.dump({'rows': 4, 'last_id': 4}, f)
+            self.assertEqual(import_tasks(path, batch_size=4, checkpoint=checkpoint, resume=True), 2)
+            self.assertEqual(db.session.query(Task).count(), 10)
+
+    def test_resume_with_a_smaller_batch_size(self):
+        path, checkpoint = self.path('tasks.ndjson'), self.path('tasks.checkpoint')
+        write_ndjson(path, [generated_record(i) for i in range(1, 13)])
+        with self.target.app_context():
+            with self.assertRaises(TransferError):
+                import_tasks(path, batch_size=6, checkpoint=checkpoint, progress=self.fail_after(2))
+            self.assertEqual(db.session.query(Task).count(), 12)
+            # The second batch of six was committed without its checkpoint;
+            # replaying it in batches of two meets existing ids three times.
+            with open(checkpoint, 'w') as f:
+                json.dump({'rows': 6, 'last_id': 6}, f)
+            self.assertEqual(import_tasks(path, batch_size=2, checkpoint=checkpoint, resume=True), 0)
+            self.assertEqual(db.session.query(Task).count(), 12)
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_records_without_a_version_start_at_one(self):
+        path = self.path('tasks.ndjson')
+        records = [generated_record(i) for i in range(1, 4)]
+        del records[0]['version']
+        write_ndjson(path, records)
+        with self.target.app_context():
+            self.assertEqual(import_tasks(path), 3)
+        self.assertEqual([record['version'] for record in self.records(self.target)], [1, 3, 4])
+
+    def test_checkpoint_must_match_the_file(self):
+        path, checkpoint = self.path('tasks.ndjson'), self.path('tasks.checkpoint')
+        write_ndjson(path, [generated_record(i) for i in range(1, 11)])
+        with open(checkpoint, 'w') as f:
+            json.dump({'rows': 4, 'last_id': 7}, f)
+        result = self.target.test_cli_runner().invoke(args=['tasks', 'import', path, '--resume',
+                                                           '--checkpoint', checkpoint])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn('does not match', result.output)
+
+    def fail_after(self, batches):
+        calls = []
+
+        def progress(rows, elapsed):
+            calls.append(rows)
+            if len(calls) == batches:
+                raise TransferError("interrupted")
+
+        return progress
+
+
+class RoundTripTestCase(unittest.TestCase):
+    """Round trip of a large table through a file, in constant memory"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(TestingConfig, 'SQLALCHEMY_DATABASE_URI',
+                                    'sqlite:///' + os.path.join(self.tmp.name, 'tasks.db'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = create_app('test')
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        source = os.path.join(self.tmp.name, 'source.ndjson.gz')
+        exported = os.path.join(self.tmp.name, 'exported.ndjson.gz')
+        write_ndjson(source, map(generated_record, range(1, ROUND_TRIP_ROWS + 1)), opener=gzip.open)
+
+        with self.app.app_context():
+            self.assertEqual(import_tasks(source, batch_size=5000), ROUND_TRIP_ROWS)
+            self.assertEqual(export_tasks(exported, batch_size=5000), ROUND_TRIP_ROWS)
+
+        expected = map(generated_record, range(1, ROUND_TRIP_ROWS + 1))
+        for actual, wanted in zip_longest(read_records(exported), expected):
+            self.assertEqual(actual, wanted)
+
+
+if __name__ == "__main__":
+    unittest.main()
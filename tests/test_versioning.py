@@ -0,0 +1,118 @@
+import unittest
+import json
+from datetime import datetime
+from unittest import mock
+from sqlalchemy import event
+from simple_task_manager.src import serializers
+from simple_task_manager.src.app import create_app
+from simple_task_manager.src.models import db, Task
+from simple_task_manager.src.versioning import format_etag, parse_if_match
+
+
+class ParseIfMatchTestCase(unittest.TestCase):
+    """Tests for the If-Match header parser"""
+
+    def test_absent_or_any(self):
+        self.assertIsNone(parse_if_match(None))
+        self.assertIsNone(parse_if_match('  '))
+        self.assertIsNone(parse_if_match('*'))
+
+    def test_strong_tags_only(self):
+        self.assertEqual(parse_if_match('"3", "5"'), {3, 5})
+        self.assertEqual(parse_if_match(format_etag(7)), {7})
+        # Weak or foreign tags can never match.
+        self.assertEqual(parse_if_match('W/"3", "abc", 3'), frozenset())
+
+
+class TaskVersioningApiTestCase(unittest.TestCase):
+    """Tests for optimistic concurrency on PUT /tasks/<id>"""
+
+    def setUp(self):
+        """Define test variables and initialize app."""
+        self.app = create_app('test')
+        self.client = self.app.test_client()
+
+        with self.app.app_context():
+            db.create_all()
+        res = self.client.post('/api/v1/tasks', json={'title': 'Versioned task'})
+        self.task_id = json.loads(res.data)['id']
+        self.url = f'/api/v1/tasks/{self.task_id}'
+
+    def tearDown(self):
+        """Executed after each test"""
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def put(self, payload, if_match=None):
+        headers = {'If-Match': if_match} if if_match is not None else {}
+        return self.client.put(self.url, json=payload, headers=headers)
+
+    def test_get_etag_is_the_version(self):
+        res = self.client.get(self.url)
+        self.assertEqual(json.loads(res.data)['version'], 1)
+        self.assertEqual(res.headers['ETag'], '"1"')
+        # Cache hits serve the same tag.
+        self.assertEqual(self.client.get(self.url).headers['ETag'], '"1"')
+
+    def test_update_with_current_etag(self):
+        etag = self.client.get(self.url).headers['ETag']
+        res = self.put({'title': 'Renamed'}, etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.headers['ETag'], '"2"')
+        self.assertEqual(json.loads(res.data)['version'], 2)
+        self.assertEqual(self.client.get(self.url).headers['ETag'], '"2"')
+
+    def test_stale_etag_is_rejected(self):
+        self.assertEqual(self.put({'title': 'First editor'}, '"1"').status_code, 200)
+        res = self.put({'title': 'Second editor'}, '"1"')
+        self.assertEqual(res.status_code, 412)
+        self.assertEqual(res.headers['ETag'], '"2"')
+        task = json.loads(self.client.get(self.url).data)
+        self.assertEqual((task['title'], task['version']), ('First editor', 2))
+
+        # Any tag in the list may match; weak tags never do.
+        self.assertEqual(self.put({'status': 'completed'}, '"1", "2"').status_code, 200)
+        self.assertEqual(self.put({'status': 'pending'}, 'W/"3"').status_code, 412)
+
+    def test_unconditional_updates_still_bump_the_version(self):
+        self.assertEqual(self.put({'status': 'in progress'}).headers['ETag'], '"2"')
+        self.assertEqual(self.put({'status': 'completed'}, '*').headers['ETag'], '"3"')
+        self.client.open('/api/v1/tasks:batch', method='PATCH', json=[{'id': self.task_id, 'title': 'Batched'}])
+        self.assertEqual(self.client.get(self.url).headers['ETag'], '"4"')
+
+    def test_missing_task_and_invalid_payload(self):
+        self.assertEqual(self.client.put('/api/v1/tasks/999', json={'title': 'x'},
+                                         headers={'If-Match': '"1"'}).status_code, 404)
+        self.assertEqual(self.put({'title': ''}, '"1"').status_code, 400)
+        self.assertEqual(self.client.get(self.url).headers['ETag'], '"1"')
+
+    def test_update_on_other_databases_serializes_datetimes(self):
+        # Other drivers return datetime objects; take that branch on SQLite.
+        with self.app.app_context():
+            dialect = db.engine.dialect
+        with mock.patch.object(dialect, 'name', 'postgresql'), \
+                mock.patch.object(serializers, 'format_db_datetime', wraps=serializers.format_db_datetime) as fmt:
+            res = self.put({'title': 'Elsewhere', 'due_date': '2030-01-02T09:30:00Z'}, '"1"')
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(fmt.call_args_list)
+        self.assertTrue(all(isinstance(call.args[0], datetime) for call in fmt.call_args_list))
+        with self.app.app_context():
+            expected = db.session.get(Task, self.task_id).to_dict(detailed=True)
+        self.assertEqual(json.loads(res.data), expected)
+        self.assertEqual(res.headers['ETag'], '"2"')
+
+    def test_update_is_one_statement(self):
+        statements = []
+        with self.app.app_context():
+            event.listen(db.engine, 'before_cursor_execute',
+                         lambda conn, cursor, statement, *args: statements.append(statement))
+            res = self.put({'title': 'One round trip'}, '"1"')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(statements), 1, statements)
+        self.assertTrue(statements[0].startswith('UPDATE tasks SET'))
+        self.assertIn('RETURNING', statements[0])
+
+
+if __name__ == "__main__":
+    unittest.main()